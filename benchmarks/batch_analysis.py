@@ -0,0 +1,54 @@
+"""
+Throughput of the batch analysis with the number of worker processes, and the memory the main
+process holds while streaming the positions
+
+Usage: python -m benchmarks.batch_analysis [--positions 200] [--depth 2] [--workers 1 2 4 8]
+"""
+import argparse
+import itertools
+import resource
+import time
+
+from loguru import logger
+
+from chess_engine.backend.ai import SearchLimits
+from chess_engine.backend.analysis import analyse, read_positions
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"{'workers':>7} {'positions/s':>11} {'speedup':>7} {'peak memory':>11}")
+    base_rate = None
+    for workers in args.workers:
+        lines = itertools.islice(itertools.cycle(FEN_REPRS), args.positions)
+        start = time.perf_counter()
+        for _ in analyse(
+            tasks=read_positions(lines),
+            limits=SearchLimits(depth=args.depth),
+            processes=workers,
+            backend="bitboard",
+        ):
+            pass
+        seconds = time.perf_counter() - start
+        # Kilobytes on Linux, the peak of the process so far, it stays flat as the input grows
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rate = args.positions / seconds
+        base_rate = base_rate or rate
+        print(f"{workers:>7} {rate:>11.1f} {rate / base_rate:>6.2f}x {peak / 1024:>9.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
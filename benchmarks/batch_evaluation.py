@@ -0,0 +1,75 @@
+"""
+Throughput of the batched NumPy evaluation against a Python loop over the same positions
+
+Usage: python -m benchmarks.batch_evaluation [--positions 10000]
+"""
+import argparse
+import random
+import time
+
+from chess_engine.backend.batch_evaluation import evaluate_planes, get_piece_planes
+from chess_engine.backend.evaluation import get_scores, get_tapered_value
+from chess_engine.backend.fen import EMPTY, parse_fen
+from chess_engine.backend.perft import create_board
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def get_random_mailboxes(count: int, plies: int = 20):
+    random_obj = random.Random(0)
+    mailboxes = []
+    while len(mailboxes) < count:
+        board = create_board(fen_repr=random_obj.choice(FEN_REPRS))
+        for _ in range(plies):
+            moves = board.get_all_possible_moves()
+            if not moves:
+                break
+            board.make_move(move=random_obj.choice(moves))
+            mailboxes.append(parse_fen(board.get_fen()).mailbox)
+    return mailboxes[:count]
+
+
+def evaluate_loop(mailboxes):
+    return [
+        get_tapered_value(
+            *get_scores(
+                pieces=[(piece, square) for square, piece in enumerate(mailbox) if piece != EMPTY]
+            )
+        )
+        for mailbox in mailboxes
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--positions", type=int, default=10000)
+    args = parser.parse_args()
+    mailboxes = get_random_mailboxes(count=args.positions)
+
+    start = time.perf_counter()
+    loop_values = evaluate_loop(mailboxes)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    planes = get_piece_planes(mailboxes)
+    pack_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    batch_values = evaluate_planes(planes)
+    batch_seconds = time.perf_counter() - start
+    assert batch_values.tolist() == loop_values
+
+    for name, seconds in (
+        ("python loop", loop_seconds),
+        ("numpy pack", pack_seconds),
+        ("numpy evaluate", batch_seconds),
+        ("numpy total", pack_seconds + batch_seconds),
+    ):
+        print(f"{name:>14}: {seconds * 1000:>8.1f}ms {args.positions / seconds:>11.0f} positions/s")
+
+
+if __name__ == "__main__":
+    main()
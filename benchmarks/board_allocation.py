@@ -0,0 +1,54 @@
+"""
+Memory and allocation time of Board.initialise_board
+
+Usage: python -m benchmarks.board_allocation [--boards N]
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from chess_engine.backend.board import Board
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def create_board(fen_repr: str) -> Board:
+    board = Board()
+    board.fen_repr = fen_repr
+    board.initialise_board()
+    return board
+
+
+def measure_board_size(fen_repr: str, board_count: int) -> float:
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    boards = [create_board(fen_repr=fen_repr) for _ in range(board_count)]
+    size = sum(
+        stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    )
+    tracemalloc.stop()
+    del boards
+    return size / board_count
+
+
+def measure_board_time(fen_repr: str, board_count: int) -> float:
+    timer = timeit.Timer(lambda: create_board(fen_repr=fen_repr))
+    return min(timer.repeat(repeat=5, number=board_count)) / board_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--boards", type=int, default=1000)
+    args = parser.parse_args()
+
+    for fen_repr in FEN_REPRS:
+        size = measure_board_size(fen_repr=fen_repr, board_count=args.boards)
+        seconds = measure_board_time(fen_repr=fen_repr, board_count=args.boards)
+        print(f"{fen_repr}\n  {size / 1024:.1f} KiB per board, {seconds * 1e6:.0f} us per initialise_board")
+
+
+if __name__ == "__main__":
+    main()
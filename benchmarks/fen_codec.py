@@ -0,0 +1,54 @@
+"""
+FEN parse and serialise throughput of both board backends
+
+Usage: python -m benchmarks.fen_codec [--positions N]
+"""
+import argparse
+import time
+
+from chess_engine.backend.ai import BOARD_BACKENDS
+from chess_engine.backend.fen import parse_fen
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def measure(function, count: int) -> float:
+    start = time.perf_counter()
+    for index in range(count):
+        function(FEN_REPRS[index % len(FEN_REPRS)])
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--positions", type=int, default=20000)
+    args = parser.parse_args()
+
+    positions_per_second = measure(function=parse_fen.__wrapped__, count=args.positions)
+    print(f"parse_fen uncached:        {positions_per_second:>9.0f} positions/s")
+    positions_per_second = measure(function=parse_fen, count=args.positions)
+    print(f"parse_fen cached:          {positions_per_second:>9.0f} positions/s")
+    for backend, board_type in BOARD_BACKENDS.items():
+        boards = {}
+
+        def load(fen_repr: str):
+            board = board_type()
+            board.fen_repr = fen_repr
+            board.initialise_board()
+            boards[fen_repr] = board
+
+        positions_per_second = measure(function=load, count=args.positions)
+        print(f"{backend:>8} initialise_board: {positions_per_second:>9.0f} positions/s")
+        positions_per_second = measure(
+            function=lambda fen_repr: boards[fen_repr].get_fen(), count=args.positions
+        )
+        print(f"{backend:>8} get_fen:          {positions_per_second:>9.0f} positions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Search tree size with and without move ordering
+
+Usage: python -m benchmarks.move_ordering [--backend bitboard]
+"""
+import argparse
+import time
+
+from loguru import logger
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS, SEARCH_DEPTH
+from chess_engine.backend.perft import create_board
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"{'ordering':>8} {'nodes':>9} {'EBF':>6} {'first cut':>9} {'time':>7}")
+    for fen_repr in FEN_REPRS:
+        print(fen_repr)
+        for move_ordering in (False, True):
+            ai = AI(backend=args.backend, move_ordering=move_ordering)
+            start = time.perf_counter()
+            ai.get_optimal_move(board=create_board(fen_repr=fen_repr, backend=args.backend))
+            seconds = time.perf_counter() - start
+            stats = ai.search_stats.get_stats(depth=SEARCH_DEPTH)
+            print(
+                f"{'on' if move_ordering else 'off':>8} {stats['nodes']:>9} "
+                f"{stats['effective_branching_factor']:>6.2f} "
+                f"{stats['first_move_cutoff_rate']:>9.1%} {seconds:>6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
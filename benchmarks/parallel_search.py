@@ -0,0 +1,53 @@
+"""
+Speedup of the root splitting search with the number of worker processes
+
+Usage: python -m benchmarks.parallel_search [--depth 5] [--workers 1 2 4 8] [--backend bitboard]
+"""
+import argparse
+import time
+
+from loguru import logger
+
+from chess_engine.backend.ai import BOARD_BACKENDS, SearchLimits
+from chess_engine.backend.parallel_search import ParallelAI
+from chess_engine.backend.perft import create_board
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"{'workers':>7} {'nodes':>9} {'time':>7} {'speedup':>7}")
+    for fen_repr in FEN_REPRS:
+        print(fen_repr)
+        base_seconds = None
+        for workers in args.workers:
+            ai = ParallelAI(processes=workers, backend=args.backend)
+            # Starts the worker processes outside the timed search
+            ai.get_executor().submit(int).result()
+            start = time.perf_counter()
+            ai.get_optimal_move(
+                board=create_board(fen_repr=fen_repr, backend=args.backend),
+                limits=SearchLimits(depth=args.depth),
+            )
+            seconds = time.perf_counter() - start
+            ai.close()
+            base_seconds = base_seconds or seconds
+            print(
+                f"{workers:>7} {ai.search_stats.nodes:>9} {seconds:>6.2f}s "
+                f"{base_seconds / seconds:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
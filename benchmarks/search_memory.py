@@ -0,0 +1,49 @@
+"""
+Peak memory allocated by a search against the number of nodes it visits
+
+Usage: python -m benchmarks.search_memory [--depth 5] [--backend bitboard] [--trace]
+"""
+import argparse
+import time
+import tracemalloc
+
+from loguru import logger
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS, SearchLimits
+from chess_engine.backend.perft import create_board
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    parser.add_argument("--trace", action="store_true", help="Keep the searched tree")
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"{'depth':>5} {'nodes':>9} {'peak':>10} {'time':>7}")
+    for fen_repr in FEN_REPRS:
+        print(fen_repr)
+        for depth in range(1, args.depth + 1):
+            board = create_board(fen_repr=fen_repr, backend=args.backend)
+            # The transposition table is allocated up front, its size does not depend on the search
+            ai = AI(backend=args.backend, transposition_table_mb=0, trace=args.trace)
+            tracemalloc.start()
+            start = time.perf_counter()
+            ai.get_optimal_move(board=board, limits=SearchLimits(depth=depth))
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{depth:>5} {ai.search_stats.nodes:>9} {peak / 1024:>8.0f}kB {seconds:>6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
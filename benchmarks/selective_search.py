@@ -0,0 +1,57 @@
+"""
+Depth reached in a fixed time by the full-width and the selective search
+
+Usage: python -m benchmarks.selective_search [--seconds 3] [--backend bitboard]
+"""
+import argparse
+import time
+
+from loguru import logger
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS, SearchLimits, SelectiveSearch
+from chess_engine.backend.move import move_to_uci
+from chess_engine.backend.perft import create_board
+
+FEN_REPRS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+)
+SEARCHES = {
+    "full width": None,
+    "null move": SelectiveSearch(True, False, False, False),
+    "lmr": SelectiveSearch(False, True, False, False),
+    "futility": SelectiveSearch(False, False, True, False),
+    "razoring": SelectiveSearch(False, False, False, True),
+    "selective": SelectiveSearch(),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"{'search':>10} {'move':>6} {'depth':>5} {'nodes':>8} {'EBF':>6} {'time':>7}")
+    for fen_repr in FEN_REPRS:
+        print(fen_repr)
+        for name, selective_search in SEARCHES.items():
+            ai = AI(backend=args.backend, selective_search=selective_search)
+            start = time.perf_counter()
+            move = ai.get_optimal_move(
+                board=create_board(fen_repr=fen_repr, backend=args.backend),
+                limits=SearchLimits(depth=64, time=args.seconds),
+            )
+            seconds = time.perf_counter() - start
+            stats = ai.search_stats.get_stats(depth=ai.completed_depth)
+            print(
+                f"{name:>10} {move_to_uci(move):>6} {ai.completed_depth:>5} {stats['nodes']:>8} "
+                f"{stats['effective_branching_factor']:>6.2f} {seconds:>6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
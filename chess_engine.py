@@ -18,7 +18,7 @@ def initialise_game() -> GameController:
     )
     gui_obj.draw_game_board(chessboard=board_obj.get_chessboard())
 
-    ai_obj = AI()
+    ai_obj = AI(backend="bitboard")
 
     game_controller_obj = GameController(
         ai_obj=ai_obj,
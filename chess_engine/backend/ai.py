@@ -1,11 +1,73 @@
-from typing import List
+import math
+import time
+from loguru import logger
+from typing import Callable, Dict, List, NamedTuple, Optional
 
-from chess_engine.backend.board import Board
+from chess_engine.backend import bitbase
+from chess_engine.backend.board import Board, BoardState
+from chess_engine.backend.bitboard import BitBoard
+from chess_engine.backend.fen import parse_fen
+from chess_engine.backend.move import NO_MOVE, is_tactical, move_to_uci
+from chess_engine.backend.move_picker import (
+    MAX_PLY,
+    MoveOrdering,
+    MovePicker,
+    get_material_gain,
+    get_ordered_captures,
+)
+from chess_engine.backend.opening_book import OpeningBook
+from chess_engine.backend.principal_variation import PVTable
+from chess_engine.backend.transposition_table import (
+    Bound,
+    TranspositionEntry,
+    TranspositionTable,
+)
 
 SEARCH_DEPTH = 3
+TRANSPOSITION_TABLE_MB = 16
+# Search values are in centipawns, piece values of the move ordering in pawns
+CENTIPAWNS = 100
+# A mate is valued MATE_VALUE less its distance from the root in plies, so shorter mates rank
+# higher. Values beyond MIN_MATE_VALUE are mates, quiescence plies included
+MATE_VALUE = 32000
+MIN_MATE_VALUE = MATE_VALUE - 2 * MAX_PLY
+INFINITE_VALUE = 99999
+# Iterations from this depth search a window around the previous score, doubling it on failure
+ASPIRATION_MIN_DEPTH = 3
+ASPIRATION_WINDOW = 25
+# Limits are checked every LIMIT_CHECK_NODES nodes, a power of two
+LIMIT_CHECK_NODES = 256
+# Captures that leave the static value this far below alpha even after winning the victim are
+# pruned in the quiescence search. Material values swing by whole pieces within a capture
+# sequence, a smaller margin makes values depend on the search window
+DELTA_MARGIN = 500
+
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+LATE_MOVE_MIN_DEPTH = 3
+LATE_MOVE_MIN_INDEX = 3
+# Indexed by the remaining depth, a node whose static value is a margin below alpha is unlikely
+# to get above it with a quiet move (futility) or at all (razoring)
+FUTILITY_MARGINS = (0, 200, 400)
+RAZOR_MARGINS = (0, 300, 500)
+# Added to the static value of a position the bitbases know is won, it ranks below any mate found
+# by the search and above any material value
+BITBASE_WIN_VALUE = 10000
+# Per point of bitbase.get_mating_progress of a won position
+BITBASE_PROGRESS_VALUE = 10
+
+BOARD_BACKENDS = {
+    "board": Board,
+    "bitboard": BitBoard,
+}
 
 
 class Node:
+    """
+    Position in a search tree. The search itself keeps no tree, traced searches record the moves
+    they searched as nodes without boards, valued by the search
+    """
+
     def __init__(self, board, value=0, move=None):
         self.board = board
         self.value = value
@@ -14,107 +76,913 @@ class Node:
         self.children = []
 
 
+class SearchLimits(NamedTuple):
+    """
+    :param depth: Maximum depth of the iterative deepening
+    :param time: Wall-clock budget in seconds, None for no limit
+    :param nodes: Node budget, None for no limit
+    """
+
+    depth: int = SEARCH_DEPTH
+    time: Optional[float] = None
+    nodes: Optional[int] = None
+
+
+class SearchInfo(NamedTuple):
+    """
+    Result of a completed iteration
+    :param value: Value of the best move in centipawns, from the side to move
+    :param time: Seconds since the search started
+    """
+
+    depth: int
+    value: int
+    nodes: int
+    time: float
+    principal_variation: List[int]
+
+
+class SelectiveSearch(NamedTuple):
+    """
+    Pruning and reductions that trade search exactness for depth
+    :param null_move: Skip a node when passing the turn still fails high, not with pawns only
+    :param late_move_reductions: Search late quiet moves shallower, again at full depth when they
+    beat the window
+    :param futility_pruning: Skip quiet moves near the leaves when the static value is far below
+    the window
+    :param razoring: Drop into the quiescence search near the leaves when the static value is far
+    below the window
+    """
+
+    null_move: bool = True
+    late_move_reductions: bool = True
+    futility_pruning: bool = True
+    razoring: bool = True
+
+
+def get_table_value(value: int, ply: int) -> int:
+    """
+    Mates are stored in the transposition table by their distance from the node instead of the
+    root, the node may be reached at another ply
+    """
+    if value >= MIN_MATE_VALUE:
+        return value + ply
+    if value <= -MIN_MATE_VALUE:
+        return value - ply
+    return value
+
+
+def get_search_value(value: int, ply: int) -> int:
+    """
+    Inverse of get_table_value for a node at the ply
+    """
+    if value >= MIN_MATE_VALUE:
+        return value - ply
+    if value <= -MIN_MATE_VALUE:
+        return value + ply
+    return value
+
+
+def get_late_move_reduction(depth: int, index: int) -> int:
+    """
+    Plies a quiet move is reduced by, growing with the remaining depth and the move index
+    """
+    return max(1, min(depth - 2, int(0.5 + math.log(depth) * math.log(index) / 2)))
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes: int = 0
+        self.quiescence_nodes: int = 0
+        self.cutoffs: int = 0
+        self.first_move_cutoffs: int = 0
+        self.aspiration_re_searches: int = 0
+        self.null_move_cutoffs: int = 0
+        self.reductions: int = 0
+        self.re_searches: int = 0
+        self.pruned: int = 0
+        self.bitbase_hits: int = 0
+
+    def get_stats(self, depth: int) -> Dict[str, float]:
+        """
+        :param depth: Depth of the search the nodes were counted in
+        """
+        return {
+            "nodes": self.nodes,
+            "quiescence_nodes": self.quiescence_nodes,
+            "cutoffs": self.cutoffs,
+            "effective_branching_factor": self.nodes ** (1 / depth) if depth else 0.0,
+            "first_move_cutoff_rate": (
+                self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+            ),
+            "aspiration_re_searches": self.aspiration_re_searches,
+            "null_move_cutoffs": self.null_move_cutoffs,
+            "reductions": self.reductions,
+            "re_searches": self.re_searches,
+            "pruned": self.pruned,
+            "bitbase_hits": self.bitbase_hits,
+        }
+
+
 class AI:
-    def get_optimal_move(self, board: Board) -> List:
-        node = Node(board=board)
-
-        best_value, best_node = self.alpha_beta(
-            node=node,
-            depth=SEARCH_DEPTH,
-            alpha=-99999,
-            beta=99999,
-            is_maximising_player=True
+    def __init__(
+            self,
+            backend: str = "board",
+            transposition_table_mb: float = TRANSPOSITION_TABLE_MB,
+            move_ordering: bool = True,
+            quiescence: bool = True,
+            check_evasions: bool = True,
+            selective_search: Optional[SelectiveSearch] = None,
+            trace: bool = False,
+            opening_book: Optional[OpeningBook] = None,
+            endgame_bitbases: bool = True,
+    ):
+        """
+        :param backend: Board representation searched on
+        :param transposition_table_mb: Size of the transposition table, 0 disables it
+        :param move_ordering: Order moves by hash move, MVV-LVA, killer moves and history scores,
+        otherwise they are searched in generation order
+        :param quiescence: Search captures beyond the depth limit until the position is quiet
+        :param check_evasions: Search every move of a position in check in the quiescence search
+        :param selective_search: Pruning and reductions to use, None for a full-width search
+        :param trace: Keep the tree of the last completed iteration in search_tree, for debugging
+        :param opening_book: Book whose moves are played without a search
+        :param endgame_bitbases: Value positions reached with a king and a pawn, rook or queen
+        against a king by their bitbase instead of searching them
+        """
+        self.backend = backend
+        self.transposition_table = None
+        if transposition_table_mb:
+            self.transposition_table = TranspositionTable(size_mb=transposition_table_mb)
+        self.move_ordering = MoveOrdering() if move_ordering else None
+        self.quiescence = quiescence
+        self.check_evasions = check_evasions
+        self.selective_search = selective_search or SelectiveSearch(False, False, False, False)
+        self.search_stats = SearchStats()
+        self.pv_table = PVTable()
+        self.principal_variation: List[int] = []
+        self.trace = trace
+        self.opening_book = opening_book
+        self.endgame_bitbases = endgame_bitbases
+        self.probe_bitbases = False
+        self.bitbase_leaves = False
+        self.root_moves: Optional[List[int]] = None
+        self.search_tree: Optional[Node] = None
+        self.limits = SearchLimits()
+        self.stopped = False
+        self.completed_depth = 0
+        self._deadline: Optional[float] = None
+
+    def clear(self) -> None:
+        """
+        Forgets the transposition table and move ordering tables, the next search does not depend
+        on the searches before it
+        """
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+        if self.move_ordering is not None:
+            self.move_ordering = MoveOrdering()
+
+    def new_search(self) -> None:
+        """
+        Ages the transposition table and move ordering tables before a search
+        """
+        if self.transposition_table:
+            self.transposition_table.new_search()
+        if self.move_ordering:
+            self.move_ordering.new_search()
+
+    def resize_transposition_table(self, size_mb: float) -> None:
+        """
+        Replaces the transposition table by an empty one
+        :param size_mb: Size of the new table, 0 disables it
+        """
+        self.transposition_table = TranspositionTable(size_mb=size_mb) if size_mb else None
+
+    def stop(self) -> None:
+        """
+        Ends a running search from another thread, get_optimal_move then returns the best move
+        of the last completed iteration
+        """
+        self.stopped = True
+
+    def set_bitbase_probes(self, board: Board) -> None:
+        """
+        Bitbases only know won from drawn. Below roots with more pieces, positions in a bitbase
+        are valued by it instead of searched. From a root in a bitbase, only the moves that keep
+        its result are searched, and the leaves are valued by the bitbase and ranked by how far
+        they drive towards mate
+        """
+        self.probe_bitbases, self.bitbase_leaves, self.root_moves = False, False, None
+        if not self.endgame_bitbases:
+            return
+        if board.get_piece_count() > bitbase.MAX_PIECES:
+            self.probe_bitbases = True
+            return
+        result = bitbase.probe(snapshot=parse_fen(board.get_fen()))
+        if result is None:
+            return
+        self.bitbase_leaves = True
+        root_moves = []
+        for move in board.get_all_possible_moves():
+            board.make_move(move=move)
+            if bitbase.probe(snapshot=parse_fen(board.get_fen())) == -result:
+                root_moves.append(move)
+            board.unmake_move()
+        self.root_moves = root_moves or None
+
+    def probe_bitbase(self, board: Board, value: int, is_maximising_player: bool) -> Optional[int]:
+        """
+        :return: Value of a position in a bitbase, None for other positions
+        """
+        if board.get_piece_count() > bitbase.MAX_PIECES:
+            return None
+        snapshot = parse_fen(board.get_fen())
+        result = bitbase.probe(snapshot=snapshot)
+        if result is None:
+            return None
+        self.search_stats.bitbase_hits += 1
+        if result == bitbase.DRAW:
+            return 0
+        # The static value still ranks won positions, by how far the pawn got for example
+        win_value = (
+            BITBASE_WIN_VALUE
+            + BITBASE_PROGRESS_VALUE * bitbase.get_mating_progress(snapshot=snapshot)
         )
-        while best_node.parent.parent:
-            best_node = best_node.parent
-        best_move = best_node.move
-        src, dst = best_move
-        src_square = board.get_square(row=src.row, column=src.column)
-        dst_square = board.get_square(row=dst.row, column=dst.column)
-        return [src_square, dst_square, board.promotion_piece]
+        is_win = (result == bitbase.WIN) == is_maximising_player
+        return value + (win_value if is_win else -win_value)
+
+    def check_limits(self) -> None:
+        # The search is only stopped once a root move has a value to fall back on
+        if self.completed_depth == 0 and not self.pv_table.get_pv():
+            return
+        if (self._deadline is not None and time.perf_counter() >= self._deadline) or (
+            self.limits.nodes is not None and self.search_stats.nodes >= self.limits.nodes
+        ):
+            self.stopped = True
+
+    def get_optimal_move(
+            self,
+            board: Board,
+            limits: Optional[SearchLimits] = None,
+            callback: Optional[Callable[[SearchInfo], None]] = None,
+    ) -> int:
+        """
+        Iterative deepening until one of the limits is reached
+        :param board: Position to search, left unchanged
+        :param limits: Depth, time and node limits, defaults to a search of depth SEARCH_DEPTH
+        :param callback: Called with the result of every completed iteration
+        """
+        start = time.perf_counter()
+        self.limits = limits or SearchLimits()
+        self._deadline = None if self.limits.time is None else start + self.limits.time
+        self.stopped = False
+        self.completed_depth = 0
+        self.set_bitbase_probes(board=board)
+
+        if self.opening_book is not None:
+            book_move = self.opening_book.get_move(board=board)
+            if book_move != NO_MOVE:
+                logger.debug(f"Book move: {move_to_uci(book_move)}")
+                self.principal_variation = [book_move]
+                self.search_stats = SearchStats()
+                return book_move
+
+        search_board = board
+        board_type = BOARD_BACKENDS[self.backend]
+        if not isinstance(board, board_type):
+            search_board = board_type()
+            search_board.fen_repr = board.get_fen()
+            search_board.initialise_board()
+        self.new_search()
+        self.search_stats = SearchStats()
+
+        self.principal_variation = []
+        self.search_tree = None
+        best_value = 0
+        for depth in range(1, min(self.limits.depth, MAX_PLY) + 1):
+            trace = Node(board=search_board) if self.trace else None
+            best_value = self.aspiration_search(
+                board=search_board, depth=depth, previous_value=best_value, trace=trace
+            )
+            if self.stopped:
+                if not self.principal_variation:
+                    self.principal_variation = self.pv_table.get_pv()
+                break
+            self.principal_variation = self.pv_table.get_pv()
+            if trace is not None:
+                trace.value = best_value
+                self.search_tree = trace
+            self.completed_depth = depth
+            if callback is not None:
+                callback(
+                    SearchInfo(
+                        depth=depth,
+                        value=best_value,
+                        nodes=self.search_stats.nodes,
+                        time=time.perf_counter() - start,
+                        principal_variation=self.principal_variation,
+                    )
+                )
+            logger.debug(
+                f"Depth {depth}: {best_value} {' '.join(self.moves_to_str(self.principal_variation))}"
+            )
+            # A mate within the depth searched is proven, deeper iterations only find it again
+            if MATE_VALUE - abs(best_value) <= depth:
+                break
+            # An iteration takes longer than all the previous ones, it is unlikely to finish in
+            # the time left
+            if self._deadline is not None and 2 * time.perf_counter() - start > self._deadline:
+                break
+
+        if self.transposition_table:
+            logger.debug(f"Transposition table: {self.transposition_table.get_stats()}")
+        logger.debug(f"Search: {self.search_stats.get_stats(depth=self.completed_depth)}")
+        if self.principal_variation:
+            return self.principal_variation[0]
+        moves = self.get_moves(board=search_board)
+        return moves[0] if moves else NO_MOVE
+
+    def aspiration_search(
+            self, board: Board, depth: int, previous_value: int, trace: Optional[Node] = None
+    ) -> int:
+        """
+        Searches the root with a window around the score of the previous iteration, widening the
+        side it fails on until the score falls inside
+        """
+        window = ASPIRATION_WINDOW
+        alpha, beta = -INFINITE_VALUE, INFINITE_VALUE
+        if depth >= ASPIRATION_MIN_DEPTH and abs(previous_value) < MIN_MATE_VALUE:
+            alpha, beta = previous_value - window, previous_value + window
+        while True:
+            value = self.alpha_beta(
+                board=board,
+                depth=depth,
+                alpha=alpha,
+                beta=beta,
+                is_maximising_player=True,
+                trace=trace,
+            )
+            if self.stopped:
+                return value
+            if value <= alpha and alpha > -INFINITE_VALUE:
+                alpha = max(alpha - window, -INFINITE_VALUE)
+            elif value >= beta and beta < INFINITE_VALUE:
+                beta = min(beta + window, INFINITE_VALUE)
+            else:
+                return value
+            window *= 2
+            self.search_stats.aspiration_re_searches += 1
 
     @staticmethod
-    def add_layer_to_search_tree(root_node: Node, is_maximising_player: bool):
+    def moves_to_str(moves: List[int]) -> List[str]:
+        return [move_to_uci(move) for move in moves]
+
+    @staticmethod
+    def get_moves(board: Board) -> List[int]:
+        return board.get_all_possible_moves()
+
+    def get_ordered_moves(self, board: Board, hash_move: int, ply: int):
+        if ply == 0 and self.root_moves is not None:
+            if hash_move in self.root_moves:
+                return [hash_move] + [move for move in self.root_moves if move != hash_move]
+            return self.root_moves
+        if self.move_ordering is None:
+            return self.get_moves(board=board)
+        return MovePicker(
+            board=board,
+            hash_move=hash_move,
+            killers=self.move_ordering.get_killers(ply=ply),
+            history=self.move_ordering.history,
+        )
+
+    @staticmethod
+    def get_node_value(board: Board, is_maximising_player: bool, ply: int = 1) -> int:
+        """
+        :param is_maximising_player: Side that moved into the position
+        :param ply: Distance of the position from the root
+        """
+        board_state = board.board_state
+        if board_state == BoardState.CHECKMATE:
+            return MATE_VALUE - ply if is_maximising_player else ply - MATE_VALUE
+        if board_state == BoardState.STALEMATE:
+            return 0
+        return board.get_evaluation(is_maximising_player=not is_maximising_player)
+
+    @staticmethod
+    def add_layer_to_search_tree(root_node: Node, is_maximising_player: bool = True):
         root_board = root_node.board
-        root_fen_repr = root_board.get_fen()
-        all_possible_moves = root_board.get_all_possible_moves()
-
-        for move in all_possible_moves:
-            src_square, moves = move
-
-            for possible_move in moves:
-                board = Board()
-                board.fen_repr = root_fen_repr
-                board.initialise_board()
-                if isinstance(possible_move, List):
-                    board.promotion_piece = possible_move[1]
-                    possible_move = possible_move[0]
-                move_src_square = board.get_square(
-                    row=src_square.row, column=src_square.column
-                )
-                move_dst_square = board.get_square(
-                    row=possible_move.row, column=possible_move.column
-                )
-                board.update_board(
-                    src_square=move_src_square,
-                    dst_square=move_dst_square,
-                )
 
-                board_value = board.get_board_value(is_maximising_player=is_maximising_player)
-                node = Node(board=board, value=board_value, move=[move_src_square, move_dst_square])
-                node.board.is_whites_turn = not node.board.is_whites_turn
-                root_node.children.append(node)
-                node.parent = root_node
-                del board
+        for move in AI.get_moves(board=root_board):
+            root_board.make_move(move=move)
+            board = type(root_board)()
+            board.fen_repr = root_board.get_fen()
+            board.initialise_board()
+            board.board_state = root_board.board_state
+            board_value = AI.get_node_value(
+                board=root_board, is_maximising_player=is_maximising_player
+            )
+            root_board.unmake_move()
+
+            node = Node(board=board, value=board_value, move=move)
+            root_node.children.append(node)
+            node.parent = root_node
         return root_node.children
 
-    def alpha_beta(
-            self, node: Node, depth: int, alpha: int, beta: int, is_maximising_player: bool
-    ) -> [int, Node]:
-        if depth == 0 or node.board.is_terminal:
-            return node.value, node
+    def probe_transposition_table(
+            self,
+            entry: Optional[TranspositionEntry],
+            depth: int,
+            alpha: int,
+            beta: int,
+            is_maximising_player: bool,
+            ply: int,
+    ) -> Optional[int]:
+        if entry is not None and abs(entry.value) >= MIN_MATE_VALUE:
+            entry = entry._replace(value=get_search_value(value=entry.value, ply=ply))
+        if is_maximising_player:
+            return self.transposition_table.get_cutoff_value(
+                entry=entry, depth=depth, alpha=alpha, beta=beta
+            )
+        value = self.transposition_table.get_cutoff_value(
+            entry=entry, depth=depth, alpha=-beta, beta=-alpha
+        )
+        return None if value is None else -value
+
+    def store_transposition_table(
+            self,
+            board: Board,
+            depth: int,
+            value: int,
+            alpha: int,
+            beta: int,
+            is_maximising_player: bool,
+            move: int,
+            ply: int,
+    ) -> None:
+        if not is_maximising_player:
+            value, alpha, beta = -value, -beta, -alpha
+        if value <= alpha:
+            bound = Bound.UPPER
+        elif value >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.transposition_table.store(
+            key=board.zobrist_key,
+            depth=depth,
+            value=get_table_value(value=value, ply=ply),
+            bound=bound,
+            move=move,
+        )
 
-        child_node_list = self.add_layer_to_search_tree(root_node=node, is_maximising_player=is_maximising_player)
+    def add_cutoff(self, board: Board, move: int, index: int, ply: int, depth: int) -> None:
+        self.search_stats.cutoffs += 1
+        if index == 0:
+            self.search_stats.first_move_cutoffs += 1
+        if self.move_ordering is not None:
+            self.move_ordering.add_cutoff(board=board, move=move, ply=ply, depth=depth)
 
-        if is_maximising_player:
-            best_value = -99999
-            best_node = None
-            for child_node in child_node_list:
-                value, calc_node = self.alpha_beta(
-                    node=child_node,
-                    depth=depth - 1,
+    def quiescence_search(
+            self,
+            board: Board,
+            value: int,
+            alpha: int,
+            beta: int,
+            is_maximising_player: bool,
+            ply: int = 0,
+    ) -> int:
+        """
+        Searches captures until the position is quiet. The side to move may stand pat on the
+        static value instead of capturing, unless it is in check
+        :param board: Position that is not terminal
+        :param value: Static value of the position
+        :param ply: Distance of the position from the root
+        """
+        if self.check_evasions and board.board_state == BoardState.CHECK:
+            moves = MovePicker(board=board)
+            best_value = -INFINITE_VALUE if is_maximising_player else INFINITE_VALUE
+            delta_pruning = False
+        else:
+            # Material values tie often, so a stand pat on the window bound already cuts
+            if is_maximising_player:
+                if value >= beta:
+                    return value
+                alpha = max(alpha, value)
+            else:
+                if value <= alpha:
+                    return value
+                beta = min(beta, value)
+            moves = get_ordered_captures(board)
+            best_value = value
+            delta_pruning = True
+
+        for move in moves:
+            if delta_pruning:
+                gain = CENTIPAWNS * get_material_gain(board, move) + DELTA_MARGIN
+                if (value + gain <= alpha) if is_maximising_player else (value - gain >= beta):
+                    continue
+            board.make_move(move=move)
+            self.search_stats.nodes += 1
+            self.search_stats.quiescence_nodes += 1
+            if not self.search_stats.nodes & (LIMIT_CHECK_NODES - 1):
+                self.check_limits()
+            child_value = self.get_node_value(
+                board=board, is_maximising_player=is_maximising_player, ply=ply + 1
+            )
+            if not board.is_terminal and not self.stopped:
+                child_value = self.quiescence_search(
+                    board=board,
+                    value=child_value,
                     alpha=alpha,
                     beta=beta,
-                    is_maximising_player=False
+                    is_maximising_player=not is_maximising_player,
+                    ply=ply + 1,
                 )
-                if value > best_value:
-                    best_value = value
-                    best_node = calc_node
+            board.unmake_move()
+            if self.stopped:
+                break
 
-                if value > beta:
+            if is_maximising_player:
+                best_value = max(best_value, child_value)
+                if child_value >= beta:
                     break
-                alpha = max(alpha, value)
+                alpha = max(alpha, child_value)
+            else:
+                best_value = min(best_value, child_value)
+                if child_value <= alpha:
+                    break
+                beta = min(beta, child_value)
+        return best_value
 
-            return best_value, best_node
+    def search_child(
+            self,
+            board: Board,
+            value: int,
+            depth: int,
+            alpha: int,
+            beta: int,
+            is_maximising_player: bool,
+            ply: int,
+            index: int,
+            reduction: int = 0,
+            trace: Optional[Node] = None,
+    ) -> int:
+        """
+        Principal variation search: only the first move gets the full window. Later moves are
+        searched with a null window first, reduced moves at reduced depth, and again with the
+        full window only when they beat it
+        :param board: Position after the move
+        :param value: Static value of the position after the move
+        :param depth: Remaining depth of the parent
+        :param is_maximising_player: Side to move in the child
+        :param ply: Distance of the child from the root
+        :param index: Index of the move among the moves of the parent
+        :param reduction: Plies the child is searched shallower by
+        :param trace: Trace node of the child, None when the search is not traced
+        """
+        if index == 0:
+            return self.alpha_beta(
+                board=board,
+                depth=depth - 1,
+                alpha=alpha,
+                beta=beta,
+                is_maximising_player=is_maximising_player,
+                ply=ply,
+                value=value,
+                trace=trace,
+            )
 
+        # The null window around the bound the parent has to beat
+        if is_maximising_player:
+            null_alpha, null_beta = beta - 1, beta
         else:
-            best_value = 99999
-            best_node = None
-            for child_node in child_node_list:
-                value, calc_node = self.alpha_beta(
-                    node=child_node,
-                    depth=depth - 1,
+            null_alpha, null_beta = alpha, alpha + 1
+        if reduction:
+            self.search_stats.reductions += 1
+        for null_depth in (depth - 1 - reduction, depth - 1) if reduction else (depth - 1,):
+            child_value = self.alpha_beta(
+                board=board,
+                depth=null_depth,
+                alpha=null_alpha,
+                beta=null_beta,
+                is_maximising_player=is_maximising_player,
+                ply=ply,
+                value=value,
+                trace=trace,
+            )
+            if self.stopped or (
+                child_value >= beta if is_maximising_player else child_value <= alpha
+            ):
+                return child_value
+            if null_depth < depth - 1:
+                self.search_stats.re_searches += 1
+        if (
+            child_value <= alpha if is_maximising_player else child_value >= beta
+        ) or beta - alpha <= 1:
+            return child_value
+        self.search_stats.re_searches += 1
+        return self.alpha_beta(
+            board=board,
+            depth=depth - 1,
+            alpha=alpha,
+            beta=beta,
+            is_maximising_player=is_maximising_player,
+            ply=ply,
+            value=value,
+            trace=trace,
+        )
+
+    def prune_node(
+            self,
+            board: Board,
+            value: int,
+            depth: int,
+            alpha: int,
+            beta: int,
+            is_maximising_player: bool,
+            ply: int,
+    ) -> Optional[int]:
+        """
+        Null move pruning and razoring, they settle a node without searching its moves
+        :param value: Static value of the position
+        :return: Value of the node if it was pruned
+        """
+        selective_search = self.selective_search
+        if (
+            selective_search.null_move
+            and depth >= NULL_MOVE_MIN_DEPTH
+            and (value >= beta if is_maximising_player else value <= alpha)
+            and board.has_non_pawn_material()
+        ):
+            board.make_null_move()
+            null_value = self.alpha_beta(
+                board=board,
+                depth=depth - 1 - NULL_MOVE_REDUCTION,
+                alpha=beta - 1 if is_maximising_player else alpha,
+                beta=beta if is_maximising_player else alpha + 1,
+                is_maximising_player=not is_maximising_player,
+                ply=ply + 1,
+                value=value,
+                allow_null_move=False,
+            )
+            board.unmake_null_move()
+            if not self.stopped and (
+                null_value >= beta if is_maximising_player else null_value <= alpha
+            ):
+                self.search_stats.null_move_cutoffs += 1
+                return null_value
+
+        if (
+            selective_search.razoring
+            and self.quiescence
+            and depth < len(RAZOR_MARGINS)
+            and (
+                value + RAZOR_MARGINS[depth] <= alpha
+                if is_maximising_player
+                else value - RAZOR_MARGINS[depth] >= beta
+            )
+        ):
+            razor_value = self.quiescence_search(
+                board=board,
+                value=value,
+                alpha=alpha if is_maximising_player else beta - 1,
+                beta=alpha + 1 if is_maximising_player else beta,
+                is_maximising_player=is_maximising_player,
+                ply=ply,
+            )
+            if not self.stopped and (
+                razor_value <= alpha if is_maximising_player else razor_value >= beta
+            ):
+                self.search_stats.pruned += 1
+                return razor_value
+        return None
+
+    @staticmethod
+    def add_trace(trace: Optional[Node], move: int, value: int) -> Optional[Node]:
+        if trace is None:
+            return None
+        node = Node(board=None, value=value, move=move)
+        node.parent = trace
+        trace.children.append(node)
+        return node
+
+    def alpha_beta(
+            self,
+            board: Board,
+            depth: int,
+            alpha: int,
+            beta: int,
+            is_maximising_player: bool,
+            ply: int = 0,
+            value: int = 0,
+            allow_null_move: bool = True,
+            trace: Optional[Node] = None,
+    ) -> int:
+        """
+        Searches the position on the board in place, only the moves on the current path are kept
+        :param board: Position to search, made and unmade moves leave it unchanged
+        :param value: Static value of the position
+        :param trace: Node the searched moves are recorded under with their values, None to keep
+        no tree. A re-search of the node replaces the moves recorded before
+        """
+        self.search_stats.nodes += 1
+        self.pv_table.clear(ply=ply)
+        if trace is not None:
+            trace.children = []
+        if not self.search_stats.nodes & (LIMIT_CHECK_NODES - 1):
+            self.check_limits()
+        if self.stopped:
+            return value
+        # A repeated position is a draw, the side ahead has to make progress instead
+        if ply > 0 and board.is_repetition():
+            return 0
+        if depth == 0 or board.is_terminal:
+            if depth == 0 and self.bitbase_leaves and not board.is_terminal:
+                bitbase_value = self.probe_bitbase(
+                    board=board, value=value, is_maximising_player=is_maximising_player
+                )
+                if bitbase_value is not None:
+                    return bitbase_value
+            if depth == 0 and self.quiescence and not board.is_terminal:
+                return self.quiescence_search(
+                    board=board,
+                    value=value,
                     alpha=alpha,
                     beta=beta,
-                    is_maximising_player=True
+                    is_maximising_player=is_maximising_player,
+                    ply=ply,
                 )
-                if value < best_value:
-                    best_value = value
-                    best_node = calc_node
+            return value
+        if self.probe_bitbases and ply > 0:
+            bitbase_value = self.probe_bitbase(
+                board=board, value=value, is_maximising_player=is_maximising_player
+            )
+            if bitbase_value is not None:
+                return bitbase_value
 
-                if value < alpha:
+        # Cutoffs at nodes searched with an open window would cut the principal variation short
+        use_transposition_table = (
+            self.transposition_table is not None and ply > 0 and beta - alpha <= 1
+        )
+        hash_move = NO_MOVE
+        if self.transposition_table is not None:
+            entry = self.transposition_table.probe(key=board.zobrist_key)
+            if entry is not None and entry.move is not None:
+                hash_move = entry.move
+            if use_transposition_table:
+                table_value = self.probe_transposition_table(
+                    entry=entry,
+                    depth=depth,
+                    alpha=alpha,
+                    beta=beta,
+                    is_maximising_player=is_maximising_player,
+                    ply=ply,
+                )
+                if table_value is not None:
+                    return table_value
+        alpha_start, beta_start = alpha, beta
+
+        selective_search = self.selective_search
+        in_check = board.board_state == BoardState.CHECK
+        # Static values are far from the bitbase values at the leaves, they would prune every move
+        is_selective = ply > 0 and not in_check and not self.bitbase_leaves
+        if is_selective and allow_null_move:
+            pruned_value = self.prune_node(
+                board=board,
+                value=value,
+                depth=depth,
+                alpha=alpha,
+                beta=beta,
+                is_maximising_player=is_maximising_player,
+                ply=ply,
+            )
+            if pruned_value is not None:
+                return pruned_value
+        futility_margin = None
+        if is_selective and selective_search.futility_pruning and depth < len(FUTILITY_MARGINS):
+            futility_margin = FUTILITY_MARGINS[depth]
+        reduce_late_moves = (
+            is_selective and selective_search.late_move_reductions and depth >= LATE_MOVE_MIN_DEPTH
+        )
+
+        best_move = None
+        if is_maximising_player:
+            best_value = -INFINITE_VALUE
+            for index, move in enumerate(
+                self.get_ordered_moves(board=board, hash_move=hash_move, ply=ply)
+            ):
+                board.make_move(move=move)
+                is_quiet = not is_tactical(move) and board.board_state != BoardState.CHECK
+                if (
+                    is_quiet
+                    and index
+                    and futility_margin is not None
+                    and value + futility_margin <= alpha
+                ):
+                    board.unmake_move()
+                    self.search_stats.pruned += 1
+                    continue
+                child_value = self.get_node_value(
+                    board=board, is_maximising_player=True, ply=ply + 1
+                )
+                child_trace = self.add_trace(trace=trace, move=move, value=child_value)
+                child_value = self.search_child(
+                    board=board,
+                    value=child_value,
+                    depth=depth,
+                    alpha=alpha,
+                    beta=beta,
+                    is_maximising_player=False,
+                    ply=ply + 1,
+                    index=index,
+                    reduction=(
+                        get_late_move_reduction(depth=depth, index=index)
+                        if reduce_late_moves and is_quiet and index >= LATE_MOVE_MIN_INDEX
+                        else 0
+                    ),
+                    trace=child_trace,
+                )
+                board.unmake_move()
+                if child_trace is not None:
+                    child_trace.value = child_value
+                if self.stopped:
                     break
-                beta = min(beta, value)
+                if child_value > best_value:
+                    best_value, best_move = child_value, move
+                if child_value > alpha:
+                    self.pv_table.update(ply=ply, move=move)
+
+                if child_value >= beta:
+                    self.add_cutoff(board=board, move=move, index=index, ply=ply, depth=depth)
+                    break
+                alpha = max(alpha, child_value)
 
-            return best_value, best_node
+        else:
+            best_value = INFINITE_VALUE
+            for index, move in enumerate(
+                self.get_ordered_moves(board=board, hash_move=hash_move, ply=ply)
+            ):
+                board.make_move(move=move)
+                is_quiet = not is_tactical(move) and board.board_state != BoardState.CHECK
+                if (
+                    is_quiet
+                    and index
+                    and futility_margin is not None
+                    and value - futility_margin >= beta
+                ):
+                    board.unmake_move()
+                    self.search_stats.pruned += 1
+                    continue
+                child_value = self.get_node_value(
+                    board=board, is_maximising_player=False, ply=ply + 1
+                )
+                child_trace = self.add_trace(trace=trace, move=move, value=child_value)
+                child_value = self.search_child(
+                    board=board,
+                    value=child_value,
+                    depth=depth,
+                    alpha=alpha,
+                    beta=beta,
+                    is_maximising_player=True,
+                    ply=ply + 1,
+                    index=index,
+                    reduction=(
+                        get_late_move_reduction(depth=depth, index=index)
+                        if reduce_late_moves and is_quiet and index >= LATE_MOVE_MIN_INDEX
+                        else 0
+                    ),
+                    trace=child_trace,
+                )
+                board.unmake_move()
+                if child_trace is not None:
+                    child_trace.value = child_value
+                if self.stopped:
+                    break
+                if child_value < best_value:
+                    best_value, best_move = child_value, move
+                if child_value < beta:
+                    self.pv_table.update(ply=ply, move=move)
+
+                if child_value <= alpha:
+                    self.add_cutoff(board=board, move=move, index=index, ply=ply, depth=depth)
+                    break
+                beta = min(beta, child_value)
 
+        if self.stopped:
+            return best_value
+        # No legal move without being in check, the backends need not detect stalemate themselves
+        if best_move is None:
+            return 0
+        if self.transposition_table is not None:
+            self.store_transposition_table(
+                board=board,
+                depth=depth,
+                value=best_value,
+                alpha=alpha_start,
+                beta=beta_start,
+                is_maximising_player=is_maximising_player,
+                move=best_move,
+                ply=ply,
+            )
+        return best_value
@@ -0,0 +1,296 @@
+"""
+Batch analysis of EPD or FEN positions across a process pool, results are written as JSON lines.
+The static evaluation of the positions is computed in batches in the main process
+
+Usage: python -m chess_engine.backend.analysis [FILE ...] [--depth D] [--movetime MS] [--nodes N]
+[--processes N] [--unordered] [--output FILE]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+from chess_engine.backend.ai import (
+    AI,
+    BOARD_BACKENDS,
+    SearchInfo,
+    SearchLimits,
+    SelectiveSearch,
+    TRANSPOSITION_TABLE_MB,
+)
+from chess_engine.backend.batch_evaluation import evaluate_snapshots
+from chess_engine.backend.bitboard import KING
+from chess_engine.backend.fen import PIECE_SYMBOLS, FenSnapshot, parse_fen
+from chess_engine.backend.move import NO_MOVE, move_to_uci
+from chess_engine.backend.move_picker import MAX_PLY
+from chess_engine.backend.perft import create_board
+
+# Positions submitted to the pool per worker process before waiting for a result
+IN_FLIGHT_PER_PROCESS = 4
+
+# Searcher of a worker process, kept warm across the positions it analyses
+_worker_ai: Optional[AI] = None
+_worker_limits: Optional[SearchLimits] = None
+
+
+class AnalysisTask(NamedTuple):
+    """
+    :param index: Line number of the position among the positions read
+    :param operations: EPD operations of the position, such as id and bm
+    :param static_eval: Evaluation of the position from the side to move, None until computed
+    """
+
+    index: int
+    fen: str
+    operations: Dict[str, str]
+    static_eval: Optional[int] = None
+
+
+def parse_operations(text: str) -> Dict[str, str]:
+    """
+    :param text: EPD operations, an opcode and its operands ended by a semicolon each
+    """
+    operations = {}
+    for operation in text.split(";"):
+        operation = operation.strip()
+        if operation:
+            opcode, _, operand = operation.partition(" ")
+            operations[opcode] = operand.strip().strip('"')
+    return operations
+
+
+def parse_position(line: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    :param line: FEN, or EPD with four position fields followed by operations
+    :return: FEN and EPD operations, None for blank lines and comments
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    fields = line.split(maxsplit=6)
+    if len(fields) >= 6 and fields[4].isdigit() and fields[5].rstrip(";").isdigit():
+        fen = " ".join(fields[:4] + [fields[4], fields[5].rstrip(";")])
+        return fen, parse_operations(" ".join(fields[6:]))
+
+    fields = line.split(maxsplit=4)
+    operations = parse_operations(fields[4]) if len(fields) > 4 else {}
+    half_move = operations.get("hmvc", "0")
+    full_move = operations.get("fmvn", "1")
+    return " ".join(fields[:4] + [half_move, full_move]), operations
+
+
+def read_positions(lines: Iterable[str]) -> Iterator[AnalysisTask]:
+    """
+    Lazily, so that only the positions in flight are held in memory
+    """
+    index = 0
+    for line in lines:
+        position = parse_position(line)
+        if position is not None:
+            yield AnalysisTask(index=index, fen=position[0], operations=position[1])
+            index += 1
+
+
+def read_files(paths: List[str]) -> Iterator[str]:
+    """
+    :param paths: Files read one after the other, "-" for standard input
+    """
+    for path in paths:
+        if path == "-":
+            yield from sys.stdin
+        else:
+            with open(path) as file:
+                yield from file
+
+
+def take_tasks(tasks: Iterator[AnalysisTask], count: int) -> List[AnalysisTask]:
+    """
+    Reads up to count positions and evaluates them in one batch, positions whose FEN cannot be
+    parsed are left without a static evaluation
+    """
+    chunk = list(islice(tasks, count))
+    snapshots: Dict[int, FenSnapshot] = {}
+    for position, task in enumerate(chunk):
+        try:
+            snapshots[position] = parse_fen(fen_str=task.fen)
+        except (ValueError, IndexError):
+            pass
+    if snapshots:
+        values = evaluate_snapshots(list(snapshots.values()))
+        for position, value in zip(snapshots, values):
+            chunk[position] = chunk[position]._replace(static_eval=int(value))
+    return chunk
+
+
+def validate_position(fen: str) -> None:
+    """
+    Positions the search cannot play from: a side without exactly one king, or a king that can be
+    captured because the side not to move is in check
+    :raises ValueError: Describing the first problem found
+    """
+    snapshot = parse_fen(fen_str=fen)
+    for king in (KING, KING + len(PIECE_SYMBOLS) // 2):
+        count = bin(snapshot.pieces[king]).count("1")
+        if count != 1:
+            raise ValueError(f"Invalid number of {PIECE_SYMBOLS[king]} kings: {count}")
+    fields = fen.split()
+    fields[1], fields[3] = "b" if snapshot.is_whites_turn else "w", "-"
+    if create_board(fen_repr=" ".join(fields)).is_in_check():
+        raise ValueError("The king of the side not to move is in check")
+
+
+def _initialise_worker(ai_kwargs: dict, limits: SearchLimits) -> None:
+    global _worker_ai, _worker_limits
+    _worker_ai = AI(**ai_kwargs)
+    _worker_limits = limits
+
+
+def _analyse(task: AnalysisTask) -> dict:
+    """
+    :return: Best move, its value from the side to move, the completed depth, the node count and
+    the search time of the position, or the error of an invalid position
+    """
+    result = {"index": task.index, "fen": task.fen}
+    if "id" in task.operations:
+        result["id"] = task.operations["id"]
+    infos: List[SearchInfo] = []
+    # Positions are analysed independently of the ones the worker analysed before
+    _worker_ai.clear()
+    start = time.perf_counter()
+    try:
+        validate_position(fen=task.fen)
+        board = create_board(fen_repr=task.fen, backend=_worker_ai.backend)
+        move = _worker_ai.get_optimal_move(
+            board=board, limits=_worker_limits, callback=infos.append
+        )
+    except ValueError as error:
+        result["error"] = str(error)
+        return result
+    except Exception as error:
+        # An invalid position the checks miss must not end the stream of the other positions
+        result["error"] = f"{type(error).__name__}: {error}"
+        return result
+    result.update(
+        best_move=move_to_uci(move) if move != NO_MOVE else None,
+        score=infos[-1].value if infos else None,
+        static_eval=task.static_eval,
+        depth=_worker_ai.completed_depth,
+        nodes=_worker_ai.search_stats.nodes,
+        time=round(time.perf_counter() - start, 4),
+    )
+    if "bm" in task.operations:
+        result["bm"] = task.operations["bm"]
+    return result
+
+
+def analyse(
+        tasks: Iterable[AnalysisTask],
+        limits: SearchLimits,
+        processes: int = 1,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None,
+        **ai_kwargs,
+) -> Iterator[dict]:
+    """
+    Streams the positions to worker processes, at most max_in_flight are submitted and not yet
+    yielded at any time
+    :param tasks: Positions, consumed as results are yielded
+    :param limits: Search limits of every position
+    :param processes: Worker processes, each with its own searcher. One analyses in this process
+    :param ordered: Yield the results in input order, otherwise as they complete
+    :param max_in_flight: Defaults to IN_FLIGHT_PER_PROCESS per process. The positions that
+    free slots are refilled with are evaluated in one batch
+    :param ai_kwargs: Parameters of the searchers
+    """
+    tasks = iter(tasks)
+    if processes <= 1:
+        _initialise_worker(ai_kwargs=ai_kwargs, limits=limits)
+        chunk = take_tasks(tasks=tasks, count=max_in_flight or IN_FLIGHT_PER_PROCESS)
+        while chunk:
+            for task in chunk:
+                yield _analyse(task)
+            chunk = take_tasks(tasks=tasks, count=max_in_flight or IN_FLIGHT_PER_PROCESS)
+        return
+
+    max_in_flight = max_in_flight or IN_FLIGHT_PER_PROCESS * processes
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_initialise_worker, initargs=(ai_kwargs, limits)
+    ) as executor:
+        if ordered:
+            in_flight = deque()
+            chunk = take_tasks(tasks=tasks, count=max_in_flight)
+            while chunk:
+                in_flight.extend(executor.submit(_analyse, task) for task in chunk)
+                # The next result and the finished ones queued behind it free the slots
+                yield in_flight.popleft().result()
+                while in_flight and in_flight[0].done():
+                    yield in_flight.popleft().result()
+                chunk = take_tasks(tasks=tasks, count=max_in_flight - len(in_flight))
+            while in_flight:
+                yield in_flight.popleft().result()
+            return
+
+        pending = set()
+        chunk = take_tasks(tasks=tasks, count=max_in_flight)
+        while chunk:
+            pending.update(executor.submit(_analyse, task) for task in chunk)
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            chunk = take_tasks(tasks=tasks, count=max_in_flight - len(pending))
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", default=["-"], help="EPD or FEN files, - for stdin")
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--movetime", type=int, help="Milliseconds per position")
+    parser.add_argument("--nodes", type=int)
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    parser.add_argument("--hash-mb", type=float, default=TRANSPOSITION_TABLE_MB)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--in-flight", type=int, help="Positions submitted ahead of the results")
+    parser.add_argument("--unordered", action="store_true", help="Write results as they complete")
+    parser.add_argument("--output", help="JSON lines file, defaults to stdout")
+    args = parser.parse_args()
+    logger.remove()
+
+    if args.movetime is None and args.nodes is None:
+        limits = SearchLimits(depth=args.depth or SearchLimits().depth)
+    else:
+        limits = SearchLimits(
+            depth=args.depth or MAX_PLY,
+            time=args.movetime / 1000 if args.movetime is not None else None,
+            nodes=args.nodes,
+        )
+    results = analyse(
+        tasks=read_positions(read_files(args.files)),
+        limits=limits,
+        processes=args.processes,
+        ordered=not args.unordered,
+        max_in_flight=args.in_flight,
+        backend=args.backend,
+        transposition_table_mb=args.hash_mb,
+        selective_search=SelectiveSearch(),
+    )
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Win/draw bitbases of a king and a pawn, rook or queen against a lone king, generated by
+retrograde analysis
+
+Usage: python -m chess_engine.backend.bitbase [--directory DIR]
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from chess_engine.backend.fen import EMPTY, FenSnapshot
+
+BITBASE_DIRECTORY: str = os.path.join(os.path.dirname(__file__), "bitbases")
+# Results from the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+# Piece types as ordered in PIECE_SYMBOLS
+PAWN, ROOK, QUEEN, KING = 0, 3, 4, 5
+SIGNATURES: Dict[int, str] = {PAWN: "kpk", ROOK: "krk", QUEEN: "kqk"}
+MAX_PIECES: int = 3
+
+# Side to move in the bitbase index, the strong side has the extra piece
+STRONG, WEAK = 0, 1
+# Pawnless positions are mirrored until the strong king is on a1-d4, pawn positions until the pawn
+# is on files a-d. The strong side is always white
+QUADRANT_SIZE: int = 16
+PAWN_SQUARES: int = 24
+BITBASE_SIZES: Dict[int, int] = {
+    PAWN: 2 * 64 * 64 * PAWN_SQUARES,
+    ROOK: 2 * QUADRANT_SIZE * 64 * 64,
+    QUEEN: 2 * QUADRANT_SIZE * 64 * 64,
+}
+
+ROOK_DIRECTIONS: Tuple = ((-1, 0), (0, 1), (1, 0), (0, -1))
+BISHOP_DIRECTIONS: Tuple = ((-1, 1), (1, 1), (1, -1), (-1, -1))
+SLIDER_DIRECTIONS: Dict[int, Tuple] = {
+    ROOK: ROOK_DIRECTIONS,
+    QUEEN: ROOK_DIRECTIONS + BISHOP_DIRECTIONS,
+}
+
+Position = Tuple[int, int, int, int]
+
+_bitbases: Dict[int, Optional[bytes]] = {}
+
+
+def _build_rays(directions: Tuple) -> List[List[List[int]]]:
+    rays = []
+    for square in range(64):
+        row, column = divmod(square, 8)
+        square_rays = []
+        for row_step, column_step in directions:
+            ray = []
+            ray_row, ray_column = row + row_step, column + column_step
+            while 0 <= ray_row < 8 and 0 <= ray_column < 8:
+                ray.append(ray_row * 8 + ray_column)
+                ray_row, ray_column = ray_row + row_step, ray_column + column_step
+            if ray:
+                square_rays.append(ray)
+        rays.append(square_rays)
+    return rays
+
+
+KING_SQUARES: List[List[int]] = [[ray[0] for ray in rays] for rays in _build_rays(
+    ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+)]
+KING_MASKS: List[int] = [sum(1 << target for target in targets) for targets in KING_SQUARES]
+SLIDER_RAYS: Dict[int, List[List[List[int]]]] = {
+    piece_type: _build_rays(directions) for piece_type, directions in SLIDER_DIRECTIONS.items()
+}
+
+
+def _build_between(piece_type: int) -> List[int]:
+    """
+    Squares strictly between two squares on a line of the slider, -1 when they are not on one
+    """
+    between = [-1] * (64 * 64)
+    for square, rays in enumerate(SLIDER_RAYS[piece_type]):
+        for ray in rays:
+            mask = 0
+            for target in ray:
+                between[square * 64 + target] = mask
+                mask |= 1 << target
+    return between
+
+
+SLIDER_BETWEEN: Dict[int, List[int]] = {
+    piece_type: _build_between(piece_type) for piece_type in SLIDER_DIRECTIONS
+}
+
+
+def is_attacked(piece_type: int, piece_square: int, target: int, blockers: int) -> bool:
+    """
+    :param piece_type: Pawn, rook or queen of the strong side, pawns move towards row 0
+    :param blockers: Bit mask of the squares that block sliders
+    """
+    if piece_type == PAWN:
+        return (
+            target >> 3 == (piece_square >> 3) - 1
+            and abs((target & 7) - (piece_square & 7)) == 1
+        )
+    between = SLIDER_BETWEEN[piece_type][piece_square * 64 + target]
+    return between != -1 and not between & blockers
+
+
+def is_valid(piece_type: int, position: Position) -> bool:
+    side, strong_king, weak_king, piece_square = position
+    if len({strong_king, weak_king, piece_square}) < 3 or KING_MASKS[strong_king] >> weak_king & 1:
+        return False
+    if piece_type == PAWN and not 1 <= piece_square >> 3 <= 6:
+        return False
+    # The weak king can not be in check with the strong side to move
+    return side == WEAK or not is_attacked(piece_type, piece_square, weak_king, 1 << strong_king)
+
+
+def get_index(piece_type: int, position: Position) -> int:
+    """
+    Index of a position of the strong side as white, after mirroring it into the indexed part
+    """
+    side, strong_king, weak_king, piece_square = position
+    if piece_type == PAWN:
+        if piece_square & 7 > 3:
+            strong_king, weak_king, piece_square = strong_king ^ 7, weak_king ^ 7, piece_square ^ 7
+        pawn_index = ((piece_square >> 3) - 1) * 4 + (piece_square & 7)
+        return ((side * 64 + strong_king) * 64 + weak_king) * PAWN_SQUARES + pawn_index
+
+    mirror = (7 if strong_king & 7 > 3 else 0) | (56 if strong_king >> 3 < 4 else 0)
+    strong_king, weak_king = strong_king ^ mirror, weak_king ^ mirror
+    piece_square ^= mirror
+    king_index = ((strong_king >> 3) - 4) * 4 + (strong_king & 7)
+    return ((side * QUADRANT_SIZE + king_index) * 64 + weak_king) * 64 + piece_square
+
+
+def get_position(piece_type: int, index: int) -> Position:
+    if piece_type == PAWN:
+        index, pawn_index = divmod(index, PAWN_SQUARES)
+        piece_square = (pawn_index // 4 + 1) * 8 + pawn_index % 4
+    else:
+        index, piece_square = divmod(index, 64)
+    index, weak_king = divmod(index, 64)
+    if piece_type == PAWN:
+        side, strong_king = divmod(index, 64)
+    else:
+        side, king_index = divmod(index, QUADRANT_SIZE)
+        strong_king = (king_index // 4 + 4) * 8 + king_index % 4
+    return side, strong_king, weak_king, piece_square
+
+
+def get_weak_moves(piece_type: int, position: Position) -> Tuple[List[Position], bool]:
+    """
+    :return: Positions after the quiet moves of the weak king, and whether it can capture the piece
+    """
+    _, strong_king, weak_king, piece_square = position
+    blockers = 1 << strong_king
+    positions, can_capture = [], False
+    for target in KING_SQUARES[weak_king]:
+        if target == strong_king or KING_MASKS[strong_king] >> target & 1:
+            continue
+        if target == piece_square:
+            can_capture = can_capture or not KING_MASKS[strong_king] >> piece_square & 1
+        elif not is_attacked(piece_type, piece_square, target, blockers):
+            positions.append((STRONG, strong_king, target, piece_square))
+    return positions, can_capture
+
+
+def get_predecessors(piece_type: int, position: Position) -> List[Position]:
+    """
+    Valid positions with a move to the position, captures lead out of the bitbase
+    """
+    side, strong_king, weak_king, piece_square = position
+    occupied = 1 << strong_king | 1 << weak_king | 1 << piece_square
+    predecessors = []
+    if side == STRONG:
+        for source in KING_SQUARES[weak_king]:
+            if not occupied >> source & 1 and not KING_MASKS[strong_king] >> source & 1:
+                predecessors.append((WEAK, strong_king, source, piece_square))
+        return predecessors
+
+    for source in KING_SQUARES[strong_king]:
+        if not occupied >> source & 1 and not KING_MASKS[weak_king] >> source & 1:
+            predecessors.append((STRONG, source, weak_king, piece_square))
+    if piece_type == PAWN:
+        sources = []
+        if piece_square >> 3 < 6 and not occupied >> (piece_square + 8) & 1:
+            sources.append(piece_square + 8)
+            if piece_square >> 3 == 4 and not occupied >> (piece_square + 16) & 1:
+                sources.append(piece_square + 16)
+    else:
+        sources = []
+        for ray in SLIDER_RAYS[piece_type][piece_square]:
+            for source in ray:
+                if occupied >> source & 1:
+                    break
+                sources.append(source)
+    for source in sources:
+        predecessors.append((STRONG, strong_king, weak_king, source))
+    return [
+        predecessor for predecessor in predecessors if is_valid(piece_type, predecessor)
+    ]
+
+
+def get_promotion_result(position: Position) -> bool:
+    """
+    Whether the strong side to move wins by promoting its pawn to a queen or a rook
+    """
+    _, strong_king, weak_king, piece_square = position
+    target = piece_square - 8
+    if piece_square >> 3 != 1 or target in (strong_king, weak_king):
+        return False
+    return any(
+        probe_index(piece_type, get_index(piece_type, (WEAK, strong_king, weak_king, target)))
+        for piece_type in (QUEEN, ROOK)
+    )
+
+
+def generate(piece_type: int) -> bytes:
+    """
+    Marks mates and winning promotions as won, then walks back through the moves that lead to won
+    positions. A strong side position is won by one move to a won position, a weak side position
+    once all its moves lead to won positions
+    :return: Bit per index, set when the strong side wins
+    """
+    size = BITBASE_SIZES[piece_type]
+    won = bytearray(size)
+    # Moves of a weak side position left that do not lead to a won position, -1 when it can
+    # capture the piece
+    moves_left = [0] * size
+    queue = deque()
+    for index in range(size):
+        position = get_position(piece_type, index)
+        if not is_valid(piece_type, position):
+            continue
+        side, strong_king, weak_king, piece_square = position
+        if side == WEAK:
+            positions, can_capture = get_weak_moves(piece_type, position)
+            moves_left[index] = -1 if can_capture else len(positions)
+            if not positions and not can_capture and is_attacked(
+                piece_type, piece_square, weak_king, 1 << strong_king
+            ):
+                won[index] = 1
+                queue.append(index)
+        elif piece_type == PAWN and get_promotion_result(position):
+            won[index] = 1
+            queue.append(index)
+
+    while queue:
+        for predecessor in get_predecessors(piece_type, get_position(piece_type, queue.popleft())):
+            index = get_index(piece_type, predecessor)
+            if won[index]:
+                continue
+            if predecessor[0] == WEAK:
+                if moves_left[index] <= 0:
+                    continue
+                moves_left[index] -= 1
+                if moves_left[index]:
+                    continue
+            won[index] = 1
+            queue.append(index)
+
+    bits = bytearray(size // 8)
+    for index in range(size):
+        if won[index]:
+            bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+
+def get_path(piece_type: int, directory: str = BITBASE_DIRECTORY) -> str:
+    return os.path.join(directory, f"{SIGNATURES[piece_type]}.bin")
+
+
+def load(piece_type: int, directory: str = BITBASE_DIRECTORY) -> Optional[bytes]:
+    """
+    Reads a bitbase on first use. A missing file is not generated here, that would take seconds
+    inside a timed search
+    :return: None when the bitbase file does not exist
+    """
+    if piece_type not in _bitbases:
+        path = get_path(piece_type, directory)
+        bits = None
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                bits = file.read()
+        _bitbases[piece_type] = bits
+    return _bitbases[piece_type]
+
+
+def build(piece_type: int, directory: str = BITBASE_DIRECTORY) -> bytes:
+    """
+    Generates a bitbase and saves it. The file is written under a temporary name and renamed, so
+    other processes never read it partly written
+    """
+    if piece_type == PAWN:
+        # Promotions are looked up in the queen and rook bitbases
+        for promotion_type in (QUEEN, ROOK):
+            if load(promotion_type, directory) is None:
+                build(promotion_type, directory)
+    bits = generate(piece_type)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(bits)
+        os.replace(temporary_path, get_path(piece_type, directory))
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    _bitbases[piece_type] = bits
+    return bits
+
+
+def probe_index(piece_type: int, index: int) -> bool:
+    return bool(_bitbases[piece_type][index >> 3] >> (index & 7) & 1)
+
+
+def probe(snapshot: FenSnapshot) -> Optional[int]:
+    """
+    :return: WIN, DRAW or LOSS for the side to move, None when no bitbase covers the material
+    """
+    pieces = [(piece, square) for square, piece in enumerate(snapshot.mailbox) if piece != EMPTY]
+    if len(pieces) == 2:
+        return DRAW
+    if len(pieces) != MAX_PIECES:
+        return None
+    squares = {}
+    extra_piece = None
+    for piece, square in pieces:
+        if piece % 6 == KING:
+            squares[piece // 6] = square
+        else:
+            extra_piece = piece
+    if extra_piece is None or extra_piece % 6 not in SIGNATURES:
+        return None
+
+    piece_type, strong_colour = extra_piece % 6, extra_piece // 6
+    piece_square = next(square for piece, square in pieces if piece == extra_piece)
+    strong_king, weak_king = squares[strong_colour], squares[1 - strong_colour]
+    if strong_colour:
+        # Black is the strong side, mirrored across the middle of the board to play as white
+        strong_king, weak_king, piece_square = strong_king ^ 56, weak_king ^ 56, piece_square ^ 56
+    side = STRONG if snapshot.is_whites_turn != bool(strong_colour) else WEAK
+    position = (side, strong_king, weak_king, piece_square)
+    if not is_valid(piece_type, position) or load(piece_type) is None:
+        return None
+    if not probe_index(piece_type, get_index(piece_type, position)):
+        return DRAW
+    return WIN if side == STRONG else LOSS
+
+
+def get_mating_progress(snapshot: FenSnapshot) -> int:
+    """
+    How far a position of a king and a rook or queen against a king is driven towards mate, the
+    bitbases know won from drawn but not the distance to mate
+    :return: Higher with the weak king nearer a corner and the kings nearer each other, 0 with a
+    pawn on the board
+    """
+    kings = [EMPTY, EMPTY]
+    strong_colour = None
+    for square, piece in enumerate(snapshot.mailbox):
+        if piece == EMPTY:
+            continue
+        if piece % 6 == KING:
+            kings[piece // 6] = square
+        elif piece % 6 == PAWN:
+            return 0
+        else:
+            strong_colour = piece // 6
+    if strong_colour is None:
+        return 0
+    strong_row, strong_column = divmod(kings[strong_colour], 8)
+    weak_row, weak_column = divmod(kings[1 - strong_colour], 8)
+    centre_distance = max(3 - weak_row, weak_row - 4) + max(3 - weak_column, weak_column - 4)
+    king_distance = abs(strong_row - weak_row) + abs(strong_column - weak_column)
+    return 2 * centre_distance + 14 - king_distance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--directory", default=BITBASE_DIRECTORY)
+    args = parser.parse_args()
+
+    # The pawn bitbase looks up its promotions in the other two
+    for piece_type in (QUEEN, ROOK, PAWN):
+        start = time.perf_counter()
+        bits = build(piece_type, args.directory)
+        wins = sum(bin(byte).count("1") for byte in bits)
+        print(
+            f"{SIGNATURES[piece_type]}: {wins} won positions of {BITBASE_SIZES[piece_type]}, "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
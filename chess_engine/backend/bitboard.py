@@ -0,0 +1,846 @@
+from typing import Dict, List, Optional, Tuple
+
+from chess_engine.backend.board import BoardState, PIECE_SYMBOLS
+from chess_engine.backend.evaluation import (
+    EG_SCORES,
+    MG_SCORES,
+    PHASES,
+    get_scores,
+    get_tapered_value,
+)
+from chess_engine.backend.fen import BOARD_SYMBOLS, get_fen, parse_fen
+from chess_engine.backend.move import (
+    CAPTURE,
+    COLUMNS,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KING_CASTLE,
+    NO_MOVE,
+    PROMOTION,
+    PROMOTION_CAPTURE,
+    QUEEN_CASTLE,
+    QUIET,
+    ROWS,
+    move_to_uci,
+    square_index,
+)
+from chess_engine.backend.pieces import Bishop, King, Knight, Pawn, Queen, Rook
+from chess_engine.backend.zobrist import (
+    CASTLING_KEYS,
+    EN_PASSANT_KEYS,
+    PIECE_KEYS,
+    SIDE_KEY,
+    get_zobrist_key,
+)
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+EMPTY = -1
+
+SQUARES: int = ROWS * COLUMNS
+FULL_BOARD: int = (1 << SQUARES) - 1
+PIECE_VALUES: Tuple = tuple(piece.value for piece in (Pawn, Knight, Bishop, Rook, Queen, King))
+
+PROMOTION_TYPES: Tuple = (QUEEN, BISHOP, KNIGHT, ROOK)
+
+WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE, BLACK_QUEEN_SIDE = 1, 2, 4, 8
+
+ROOK_DIRECTIONS: Tuple = ((-1, 0), (0, 1), (1, 0), (0, -1))
+BISHOP_DIRECTIONS: Tuple = ((-1, 1), (1, 1), (1, -1), (-1, -1))
+KNIGHT_OFFSETS: Tuple = ((2, 1), (1, 2), (-2, 1), (-2, -1), (2, -1), (-1, 2), (-1, -2), (1, -2))
+KING_OFFSETS: Tuple = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def _is_on_board(row: int, column: int) -> bool:
+    return -1 < row < ROWS and -1 < column < COLUMNS
+
+
+def _build_leaper_attacks(offsets: Tuple) -> List[int]:
+    attacks = []
+    for square in range(SQUARES):
+        row, column = divmod(square, COLUMNS)
+        square_attacks = 0
+        for row_offset, column_offset in offsets:
+            if _is_on_board(row + row_offset, column + column_offset):
+                square_attacks |= 1 << square_index(row + row_offset, column + column_offset)
+        attacks.append(square_attacks)
+    return attacks
+
+
+def _build_ray(square: int, direction: Tuple[int, int], include_edge: bool = True) -> int:
+    row, column = divmod(square, COLUMNS)
+    row_offset, column_offset = direction
+    ray = 0
+    row, column = row + row_offset, column + column_offset
+    while _is_on_board(row, column):
+        if not include_edge and not _is_on_board(row + row_offset, column + column_offset):
+            break
+        ray |= 1 << square_index(row, column)
+        row, column = row + row_offset, column + column_offset
+    return ray
+
+
+def _slide(square: int, directions: Tuple, occupied: int) -> int:
+    attacks = 0
+    for row_offset, column_offset in directions:
+        row, column = divmod(square, COLUMNS)
+        row, column = row + row_offset, column + column_offset
+        while _is_on_board(row, column):
+            bit = 1 << square_index(row, column)
+            attacks |= bit
+            if occupied & bit:
+                break
+            row, column = row + row_offset, column + column_offset
+    return attacks
+
+
+def _build_slider_attacks(directions: Tuple) -> Tuple[List[int], List[Dict[int, int]]]:
+    """
+    Attack sets for every blocker subset of each square's relevant occupancy mask. Lookups
+    index the per-square dictionary with `occupied & mask`, which plays the role of the
+    magic multiply-and-shift with Python's own integer hashing
+    """
+    masks, tables = [], []
+    for square in range(SQUARES):
+        mask = 0
+        for direction in directions:
+            mask |= _build_ray(square, direction, include_edge=False)
+        table = {}
+        subset = 0
+        while 1:
+            table[subset] = _slide(square, directions, subset)
+            subset = (subset - mask) & mask
+            if not subset:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+def _build_lines() -> Tuple[List[int], List[int]]:
+    between, line = [0] * (SQUARES * SQUARES), [0] * (SQUARES * SQUARES)
+    for square in range(SQUARES):
+        for row_offset, column_offset in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            full_line = (
+                _build_ray(square, (row_offset, column_offset))
+                | _build_ray(square, (-row_offset, -column_offset))
+                | 1 << square
+            )
+            row, column = divmod(square, COLUMNS)
+            squares_between = 0
+            row, column = row + row_offset, column + column_offset
+            while _is_on_board(row, column):
+                target = square_index(row, column)
+                between[square * SQUARES + target] = squares_between
+                line[square * SQUARES + target] = full_line
+                squares_between |= 1 << target
+                row, column = row + row_offset, column + column_offset
+    return between, line
+
+
+KNIGHT_ATTACKS: List[int] = _build_leaper_attacks(KNIGHT_OFFSETS)
+KING_ATTACKS: List[int] = _build_leaper_attacks(KING_OFFSETS)
+PAWN_ATTACKS: Tuple[List[int], List[int]] = (
+    _build_leaper_attacks(((-1, -1), (-1, 1))),
+    _build_leaper_attacks(((1, -1), (1, 1))),
+)
+ROOK_RAYS: List[int] = [_slide(square, ROOK_DIRECTIONS, 0) for square in range(SQUARES)]
+BISHOP_RAYS: List[int] = [_slide(square, BISHOP_DIRECTIONS, 0) for square in range(SQUARES)]
+ROOK_MASKS, ROOK_ATTACKS = _build_slider_attacks(ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_ATTACKS = _build_slider_attacks(BISHOP_DIRECTIONS)
+BETWEEN, LINE = _build_lines()
+
+ROW_MASKS: List[int] = [0xFF << (row * COLUMNS) for row in range(ROWS)]
+NOT_FIRST_COLUMN: int = FULL_BOARD ^ sum(1 << square_index(row, 0) for row in range(ROWS))
+NOT_LAST_COLUMN: int = FULL_BOARD ^ sum(1 << square_index(row, COLUMNS - 1) for row in range(ROWS))
+
+CASTLING_RIGHTS_MASK: List[int] = [0xF] * SQUARES
+CASTLING_RIGHTS_MASK[square_index(ROWS - 1, 4)] ^= WHITE_KING_SIDE | WHITE_QUEEN_SIDE
+CASTLING_RIGHTS_MASK[square_index(ROWS - 1, COLUMNS - 1)] ^= WHITE_KING_SIDE
+CASTLING_RIGHTS_MASK[square_index(ROWS - 1, 0)] ^= WHITE_QUEEN_SIDE
+CASTLING_RIGHTS_MASK[square_index(0, 4)] ^= BLACK_KING_SIDE | BLACK_QUEEN_SIDE
+CASTLING_RIGHTS_MASK[square_index(0, COLUMNS - 1)] ^= BLACK_KING_SIDE
+CASTLING_RIGHTS_MASK[square_index(0, 0)] ^= BLACK_QUEEN_SIDE
+
+# King destination -> (rook source, rook destination)
+CASTLING_ROOK_MOVES: Dict = {
+    square_index(ROWS - 1, 6): (square_index(ROWS - 1, 7), square_index(ROWS - 1, 5)),
+    square_index(ROWS - 1, 2): (square_index(ROWS - 1, 0), square_index(ROWS - 1, 3)),
+    square_index(0, 6): (square_index(0, 7), square_index(0, 5)),
+    square_index(0, 2): (square_index(0, 0), square_index(0, 3)),
+}
+
+
+class BitBoard:
+    def __init__(self):
+        self._fen_repr = None
+        self._is_whites_turn = True
+        self._castling_rights = 0
+        self._en_passant = EMPTY
+        self._half_move, self._full_move = 0, 1
+        self._zobrist_key = 0
+        self._mg_score, self._eg_score, self._phase = 0, 0, 0
+
+        self._board_state: Optional[BoardState] = BoardState.NORMAL
+        self._legal_moves: Optional[List[int]] = None
+
+        self._pieces: List[int] = [0] * 12
+        self._occupancy: List[int] = [0, 0]
+        self._mailbox: List[int] = [EMPTY] * SQUARES
+        self._move_stack = []
+
+    @property
+    def fen_repr(self):
+        return self._fen_repr
+
+    @fen_repr.setter
+    def fen_repr(self, fen_repr: str):
+        self._fen_repr = fen_repr
+
+    @property
+    def is_whites_turn(self):
+        return self._is_whites_turn
+
+    @is_whites_turn.setter
+    def is_whites_turn(self, whites_turn: bool):
+        if whites_turn != self._is_whites_turn:
+            self._zobrist_key ^= SIDE_KEY
+        self._is_whites_turn = whites_turn
+        self._legal_moves, self._board_state = None, None
+
+    @property
+    def zobrist_key(self) -> int:
+        return self._zobrist_key
+
+    @property
+    def board_state(self) -> BoardState:
+        if self._board_state is None:
+            if not self.is_in_check():
+                self._board_state = BoardState.NORMAL
+            elif self.generate_moves():
+                self._board_state = BoardState.CHECK
+            else:
+                self._board_state = BoardState.CHECKMATE
+        return self._board_state
+
+    @board_state.setter
+    def board_state(self, board_state: BoardState):
+        self._board_state = board_state
+
+    @property
+    def is_terminal(self) -> bool:
+        board_state = self.board_state
+        return board_state == BoardState.CHECKMATE or board_state == BoardState.STALEMATE
+
+    def initialise_board(self) -> None:
+        snapshot = parse_fen(fen_str=self._fen_repr)
+        self._mailbox = list(snapshot.mailbox)
+        self._pieces = list(snapshot.pieces)
+        self._occupancy = [0, 0]
+        for piece, bits in enumerate(self._pieces):
+            self._occupancy[piece // 6] |= bits
+
+        self._is_whites_turn = snapshot.is_whites_turn
+        self._castling_rights = snapshot.castling_rights
+        self._en_passant = snapshot.en_passant
+        self._half_move, self._full_move = snapshot.half_move, snapshot.full_move
+        self._board_state, self._legal_moves = None, None
+        self._zobrist_key = self.compute_zobrist_key()
+        self._mg_score, self._eg_score, self._phase = get_scores(
+            pieces=[(piece, square) for square, piece in enumerate(self._mailbox) if piece != EMPTY]
+        )
+
+    def compute_zobrist_key(self) -> int:
+        return get_zobrist_key(
+            pieces=[
+                (piece, square)
+                for square, piece in enumerate(self._mailbox)
+                if piece != EMPTY
+            ],
+            castling_rights=self._castling_rights,
+            en_passant_column=self._en_passant % COLUMNS if self._en_passant != EMPTY else None,
+            is_whites_turn=self._is_whites_turn,
+        )
+
+    def get_fen(self) -> str:
+        return get_fen(
+            board_symbols="".join([BOARD_SYMBOLS[piece] for piece in self._mailbox]),
+            is_whites_turn=self._is_whites_turn,
+            castling_rights=self._castling_rights,
+            en_passant=self._en_passant,
+            half_move=self._half_move,
+            full_move=self._full_move,
+        )
+
+    def __attackers(self, square: int, colour: int, occupied: int) -> int:
+        pieces = self._pieces
+        base = colour * 6
+        queens = pieces[base + QUEEN]
+        return (
+            (PAWN_ATTACKS[colour ^ 1][square] & pieces[base + PAWN])
+            | (KNIGHT_ATTACKS[square] & pieces[base + KNIGHT])
+            | (KING_ATTACKS[square] & pieces[base + KING])
+            | (
+                BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+                & (pieces[base + BISHOP] | queens)
+            )
+            | (
+                ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]]
+                & (pieces[base + ROOK] | queens)
+            )
+        )
+
+    def is_in_check(self) -> bool:
+        us = BLACK - self._is_whites_turn
+        king_square = self._pieces[us * 6 + KING].bit_length() - 1
+        occupied = self._occupancy[WHITE] | self._occupancy[BLACK]
+        return bool(self.__attackers(king_square, us ^ 1, occupied))
+
+    def generate_moves(self) -> List[int]:
+        if self._legal_moves is None:
+            self._legal_moves = self.__generate_moves(tactical=True, quiet=True)
+        return self._legal_moves
+
+    def generate_captures(self) -> List[int]:
+        """
+        Captures, en passant and promotions, without generating the quiet moves
+        """
+        if self._legal_moves is not None:
+            return [move for move in self._legal_moves if move >> 14]
+        return self.__generate_moves(tactical=True, quiet=False)
+
+    def generate_quiets(self) -> List[int]:
+        if self._legal_moves is not None:
+            return [move for move in self._legal_moves if not move >> 14]
+        return self.__generate_moves(tactical=False, quiet=True)
+
+    def is_legal(self, move: int) -> bool:
+        """
+        Checks a move taken from another position, such as a hash or killer move, without
+        generating the moves of this one
+        """
+        if self._legal_moves is not None:
+            return move in self._legal_moves
+        src, dst, flag = move & 63, move >> 6 & 63, move >> 12
+        if flag == KING_CASTLE or flag == QUEEN_CASTLE or flag == EN_PASSANT:
+            return move in self.generate_moves()
+        if EN_PASSANT < flag < PROMOTION:
+            return False
+
+        us = BLACK - self._is_whites_turn
+        mailbox = self._mailbox
+        piece, captured = mailbox[src], mailbox[dst]
+        if piece == EMPTY or piece // 6 != us:
+            return False
+        if captured == EMPTY:
+            if flag & CAPTURE:
+                return False
+        elif not flag & CAPTURE or captured // 6 == us:
+            return False
+
+        occupied = self._occupancy[WHITE] | self._occupancy[BLACK]
+        dst_bit = 1 << dst
+        piece_type = piece % 6
+        if piece_type == PAWN:
+            promotion_row = ROW_MASKS[0] if us == WHITE else ROW_MASKS[ROWS - 1]
+            if bool(flag & PROMOTION) != bool(dst_bit & promotion_row):
+                return False
+            push_offset = -COLUMNS if us == WHITE else COLUMNS
+            if flag & CAPTURE:
+                if not PAWN_ATTACKS[us][src] & dst_bit:
+                    return False
+            elif flag == DOUBLE_PAWN_PUSH:
+                start_row = ROW_MASKS[ROWS - 2] if us == WHITE else ROW_MASKS[1]
+                if (
+                    not start_row & 1 << src
+                    or dst != src + 2 * push_offset
+                    or occupied >> (src + push_offset) & 1
+                ):
+                    return False
+            elif dst != src + push_offset:
+                return False
+        elif flag & ~CAPTURE:
+            return False
+        elif piece_type == KNIGHT:
+            if not KNIGHT_ATTACKS[src] & dst_bit:
+                return False
+        elif piece_type == KING:
+            if not KING_ATTACKS[src] & dst_bit:
+                return False
+        else:
+            attacks = 0
+            if piece_type != ROOK:
+                attacks |= BISHOP_ATTACKS[src][occupied & BISHOP_MASKS[src]]
+            if piece_type != BISHOP:
+                attacks |= ROOK_ATTACKS[src][occupied & ROOK_MASKS[src]]
+            if not attacks & dst_bit:
+                return False
+
+        king_square = dst if piece_type == KING else self._pieces[us * 6 + KING].bit_length() - 1
+        after_move = (occupied ^ 1 << src) | dst_bit
+        return not self.__attackers(king_square, us ^ 1, after_move) & ~dst_bit
+
+    def __generate_moves(self, tactical: bool, quiet: bool) -> List[int]:
+        us = BLACK - self._is_whites_turn
+        them = us ^ 1
+        pieces = self._pieces
+        own, enemy = self._occupancy[us], self._occupancy[them]
+        occupied = own | enemy
+        base, enemy_base = us * 6, them * 6
+        king_square = pieces[base + KING].bit_length() - 1
+        king_line = king_square * SQUARES
+        checkers = self.__attackers(king_square, them, occupied)
+
+        moves = []
+        append = moves.append
+
+        stage_mask = 0
+        if tactical:
+            stage_mask |= enemy
+        if quiet:
+            stage_mask |= ~occupied & FULL_BOARD
+
+        occupied_without_king = occupied ^ (1 << king_square)
+        targets = KING_ATTACKS[king_square] & stage_mask
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            dst = bit.bit_length() - 1
+            if not self.__attackers(dst, them, occupied_without_king):
+                append(king_square | dst << 6 | (CAPTURE << 12 if enemy & bit else 0))
+
+        if checkers & (checkers - 1):
+            return moves
+
+        if checkers:
+            check_mask = BETWEEN[king_line + checkers.bit_length() - 1] | checkers
+        else:
+            check_mask = FULL_BOARD
+            if quiet:
+                self.__add_castling_moves(append, us, occupied)
+
+        enemy_queens = pieces[enemy_base + QUEEN]
+        snipers = (ROOK_RAYS[king_square] & (pieces[enemy_base + ROOK] | enemy_queens)) | (
+            BISHOP_RAYS[king_square] & (pieces[enemy_base + BISHOP] | enemy_queens)
+        )
+        pinned = 0
+        while snipers:
+            bit = snipers & -snipers
+            snipers ^= bit
+            blockers = BETWEEN[king_line + bit.bit_length() - 1] & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+
+        target_mask = stage_mask & check_mask
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN):
+            piece_bitboard = pieces[base + piece_type]
+            while piece_bitboard:
+                bit = piece_bitboard & -piece_bitboard
+                piece_bitboard ^= bit
+                src = bit.bit_length() - 1
+                if piece_type == KNIGHT:
+                    if bit & pinned:
+                        continue
+                    targets = KNIGHT_ATTACKS[src]
+                elif piece_type == BISHOP:
+                    targets = BISHOP_ATTACKS[src][occupied & BISHOP_MASKS[src]]
+                elif piece_type == ROOK:
+                    targets = ROOK_ATTACKS[src][occupied & ROOK_MASKS[src]]
+                else:
+                    targets = (
+                        BISHOP_ATTACKS[src][occupied & BISHOP_MASKS[src]]
+                        | ROOK_ATTACKS[src][occupied & ROOK_MASKS[src]]
+                    )
+                targets &= target_mask
+                if bit & pinned:
+                    targets &= LINE[king_line + src]
+                while targets:
+                    dst_bit = targets & -targets
+                    targets ^= dst_bit
+                    append(
+                        src
+                        | (dst_bit.bit_length() - 1) << 6
+                        | (CAPTURE << 12 if enemy & dst_bit else 0)
+                    )
+
+        self.__add_pawn_moves(
+            append, us, enemy, occupied, check_mask, pinned, king_line, tactical, quiet
+        )
+        return moves
+
+    def __add_pawn_moves(
+        self,
+        append,
+        us: int,
+        enemy: int,
+        occupied: int,
+        check_mask: int,
+        pinned: int,
+        king_line: int,
+        tactical: bool,
+        quiet: bool,
+    ) -> None:
+        pawns = self._pieces[us * 6 + PAWN]
+        empty = ~occupied & FULL_BOARD
+        if us == WHITE:
+            single_pushes = (pawns >> 8) & empty
+            double_pushes = ((single_pushes & ROW_MASKS[5]) >> 8) & empty
+            left_captures = ((pawns & NOT_FIRST_COLUMN) >> 9) & enemy
+            right_captures = ((pawns & NOT_LAST_COLUMN) >> 7) & enemy
+            push_offset, left_offset, right_offset = 8, 9, 7
+            promotion_row = ROW_MASKS[0]
+        else:
+            single_pushes = (pawns << 8) & empty
+            double_pushes = ((single_pushes & ROW_MASKS[2]) << 8) & empty
+            left_captures = ((pawns & NOT_FIRST_COLUMN) << 7) & enemy
+            right_captures = ((pawns & NOT_LAST_COLUMN) << 9) & enemy
+            push_offset, left_offset, right_offset = -8, -7, -9
+            promotion_row = ROW_MASKS[ROWS - 1]
+
+        # Push promotions belong to the tactical stage, every other push to the quiet one
+        push_mask, capture_mask = 0, 0
+        if tactical:
+            push_mask, capture_mask = promotion_row & check_mask, check_mask
+        if quiet:
+            push_mask |= check_mask & ~promotion_row
+        else:
+            double_pushes = 0
+
+        for targets, offset, flag in (
+            (single_pushes & push_mask, push_offset, QUIET),
+            (double_pushes & check_mask, 2 * push_offset, DOUBLE_PAWN_PUSH),
+            (left_captures & capture_mask, left_offset, CAPTURE),
+            (right_captures & capture_mask, right_offset, CAPTURE),
+        ):
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                dst = bit.bit_length() - 1
+                src = dst + offset
+                if pinned >> src & 1 and not LINE[king_line + src] & bit:
+                    continue
+                move = src | dst << 6
+                if bit & promotion_row:
+                    flag_base = PROMOTION_CAPTURE if flag == CAPTURE else PROMOTION
+                    for piece_type in PROMOTION_TYPES:
+                        append(move | (flag_base + piece_type - KNIGHT) << 12)
+                else:
+                    append(move | flag << 12)
+
+        if tactical and self._en_passant != EMPTY:
+            self.__add_en_passant_moves(append, us, pawns, occupied, king_line // SQUARES)
+
+    def __add_en_passant_moves(
+        self, append, us: int, pawns: int, occupied: int, king_square: int
+    ) -> None:
+        them = us ^ 1
+        pieces = self._pieces
+        dst = self._en_passant
+        captured_square = dst + 8 if us == WHITE else dst - 8
+        captured_bit = 1 << captured_square
+        enemy_base = them * 6
+        enemy_queens = pieces[enemy_base + QUEEN]
+
+        capturers = PAWN_ATTACKS[them][dst] & pawns
+        while capturers:
+            bit = capturers & -capturers
+            capturers ^= bit
+            after_capture = (occupied ^ bit ^ captured_bit) | 1 << dst
+            if (
+                BISHOP_ATTACKS[king_square][after_capture & BISHOP_MASKS[king_square]]
+                & (pieces[enemy_base + BISHOP] | enemy_queens)
+                or ROOK_ATTACKS[king_square][after_capture & ROOK_MASKS[king_square]]
+                & (pieces[enemy_base + ROOK] | enemy_queens)
+                or KNIGHT_ATTACKS[king_square] & pieces[enemy_base + KNIGHT]
+                or PAWN_ATTACKS[us][king_square] & pieces[enemy_base + PAWN] & ~captured_bit
+            ):
+                continue
+            append(bit.bit_length() - 1 | dst << 6 | EN_PASSANT << 12)
+
+    def __add_castling_moves(self, append, us: int, occupied: int) -> None:
+        row = ROWS - 1 if us == WHITE else 0
+        king_side, queen_side = (
+            (WHITE_KING_SIDE, WHITE_QUEEN_SIDE) if us == WHITE else (BLACK_KING_SIDE, BLACK_QUEEN_SIDE)
+        )
+        king_square = square_index(row, 4)
+        them = us ^ 1
+
+        if self._castling_rights & king_side and not occupied & (
+            1 << (king_square + 1) | 1 << (king_square + 2)
+        ):
+            if not self.__attackers(king_square + 1, them, occupied) and not self.__attackers(
+                king_square + 2, them, occupied
+            ):
+                append(king_square | (king_square + 2) << 6 | KING_CASTLE << 12)
+
+        if self._castling_rights & queen_side and not occupied & (
+            1 << (king_square - 1) | 1 << (king_square - 2) | 1 << (king_square - 3)
+        ):
+            if not self.__attackers(king_square - 1, them, occupied) and not self.__attackers(
+                king_square - 2, them, occupied
+            ):
+                append(king_square | (king_square - 2) << 6 | QUEEN_CASTLE << 12)
+
+    def push(self, move: int) -> None:
+        src, dst, flag = move & 63, move >> 6 & 63, move >> 12
+        us = BLACK - self._is_whites_turn
+        them = us ^ 1
+        pieces, occupancy, mailbox = self._pieces, self._occupancy, self._mailbox
+
+        piece = mailbox[src]
+        captured = mailbox[dst]
+        self._move_stack.append(
+            (
+                move,
+                captured,
+                self._castling_rights,
+                self._en_passant,
+                self._half_move,
+                self._legal_moves,
+                self._board_state,
+                self._zobrist_key,
+                self._mg_score,
+                self._eg_score,
+                self._phase,
+            )
+        )
+
+        key = self._zobrist_key ^ SIDE_KEY ^ CASTLING_KEYS[self._castling_rights]
+        if self._en_passant != EMPTY:
+            key ^= EN_PASSANT_KEYS[self._en_passant % COLUMNS]
+
+        dst_bit = 1 << dst
+        move_bits = 1 << src | dst_bit
+        pieces[piece] ^= move_bits
+        occupancy[us] ^= move_bits
+        mailbox[src], mailbox[dst] = EMPTY, piece
+        src_index, dst_index = piece * SQUARES + src, piece * SQUARES + dst
+        key ^= PIECE_KEYS[src_index] ^ PIECE_KEYS[dst_index]
+        mg_score = self._mg_score + MG_SCORES[dst_index] - MG_SCORES[src_index]
+        eg_score = self._eg_score + EG_SCORES[dst_index] - EG_SCORES[src_index]
+
+        if captured != EMPTY:
+            pieces[captured] ^= dst_bit
+            occupancy[them] ^= dst_bit
+            captured_index = captured * SQUARES + dst
+            key ^= PIECE_KEYS[captured_index]
+            mg_score -= MG_SCORES[captured_index]
+            eg_score -= EG_SCORES[captured_index]
+            self._phase -= PHASES[captured]
+        elif flag == EN_PASSANT:
+            captured_square = dst + 8 if us == WHITE else dst - 8
+            captured_bit = 1 << captured_square
+            pieces[them * 6 + PAWN] ^= captured_bit
+            occupancy[them] ^= captured_bit
+            mailbox[captured_square] = EMPTY
+            captured_index = (them * 6 + PAWN) * SQUARES + captured_square
+            key ^= PIECE_KEYS[captured_index]
+            mg_score -= MG_SCORES[captured_index]
+            eg_score -= EG_SCORES[captured_index]
+
+        if flag & PROMOTION:
+            promoted_piece = us * 6 + KNIGHT + (flag & 3)
+            pieces[piece] ^= dst_bit
+            pieces[promoted_piece] ^= dst_bit
+            mailbox[dst] = promoted_piece
+            promoted_index = promoted_piece * SQUARES + dst
+            key ^= PIECE_KEYS[dst_index] ^ PIECE_KEYS[promoted_index]
+            mg_score += MG_SCORES[promoted_index] - MG_SCORES[dst_index]
+            eg_score += EG_SCORES[promoted_index] - EG_SCORES[dst_index]
+            self._phase += PHASES[promoted_piece]
+        elif flag == KING_CASTLE or flag == QUEEN_CASTLE:
+            rook_src, rook_dst = CASTLING_ROOK_MOVES[dst]
+            rook = mailbox[rook_src]
+            rook_bits = 1 << rook_src | 1 << rook_dst
+            pieces[rook] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            mailbox[rook_src], mailbox[rook_dst] = EMPTY, rook
+            rook_src_index, rook_dst_index = rook * SQUARES + rook_src, rook * SQUARES + rook_dst
+            key ^= PIECE_KEYS[rook_src_index] ^ PIECE_KEYS[rook_dst_index]
+            mg_score += MG_SCORES[rook_dst_index] - MG_SCORES[rook_src_index]
+            eg_score += EG_SCORES[rook_dst_index] - EG_SCORES[rook_src_index]
+        self._mg_score, self._eg_score = mg_score, eg_score
+
+        self._castling_rights &= CASTLING_RIGHTS_MASK[src] & CASTLING_RIGHTS_MASK[dst]
+        key ^= CASTLING_KEYS[self._castling_rights]
+        if flag == DOUBLE_PAWN_PUSH:
+            self._en_passant = (src + dst) >> 1
+            key ^= EN_PASSANT_KEYS[src % COLUMNS]
+        else:
+            self._en_passant = EMPTY
+        self._zobrist_key = key
+        if piece % 6 == PAWN or captured != EMPTY:
+            self._half_move = 0
+        else:
+            self._half_move += 1
+        if us == BLACK:
+            self._full_move += 1
+        self._is_whites_turn = not self._is_whites_turn
+        self._legal_moves, self._board_state = None, None
+
+    def pop(self) -> int:
+        (
+            move,
+            captured,
+            self._castling_rights,
+            self._en_passant,
+            self._half_move,
+            self._legal_moves,
+            self._board_state,
+            self._zobrist_key,
+            self._mg_score,
+            self._eg_score,
+            self._phase,
+        ) = self._move_stack.pop()
+        src, dst, flag = move & 63, move >> 6 & 63, move >> 12
+        self._is_whites_turn = not self._is_whites_turn
+        us = BLACK - self._is_whites_turn
+        them = us ^ 1
+        pieces, occupancy, mailbox = self._pieces, self._occupancy, self._mailbox
+        if us == BLACK:
+            self._full_move -= 1
+
+        dst_bit = 1 << dst
+        piece = mailbox[dst]
+        if flag & PROMOTION:
+            pieces[piece] ^= dst_bit
+            piece = us * 6 + PAWN
+            pieces[piece] ^= dst_bit
+        elif flag == KING_CASTLE or flag == QUEEN_CASTLE:
+            rook_src, rook_dst = CASTLING_ROOK_MOVES[dst]
+            rook = mailbox[rook_dst]
+            rook_bits = 1 << rook_src | 1 << rook_dst
+            pieces[rook] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            mailbox[rook_src], mailbox[rook_dst] = rook, EMPTY
+
+        move_bits = 1 << src | dst_bit
+        pieces[piece] ^= move_bits
+        occupancy[us] ^= move_bits
+        mailbox[src], mailbox[dst] = piece, captured
+
+        if captured != EMPTY:
+            pieces[captured] ^= dst_bit
+            occupancy[them] ^= dst_bit
+        elif flag == EN_PASSANT:
+            captured_square = dst + 8 if us == WHITE else dst - 8
+            captured_bit = 1 << captured_square
+            pieces[them * 6 + PAWN] ^= captured_bit
+            occupancy[them] ^= captured_bit
+            mailbox[captured_square] = them * 6 + PAWN
+        return move
+
+    def is_repetition(self) -> bool:
+        """
+        Whether the position occurred before among the moves made on the board, since the last
+        capture or pawn move
+        """
+        key, stack = self._zobrist_key, self._move_stack
+        for distance in range(4, min(self._half_move, len(stack)) + 1, 2):
+            if stack[-distance][7] == key:
+                return True
+        return False
+
+    def make_null_move(self) -> None:
+        """
+        Passes the turn, only valid when the side to move is not in check
+        """
+        self._move_stack.append(
+            (
+                NO_MOVE,
+                EMPTY,
+                self._castling_rights,
+                self._en_passant,
+                self._half_move,
+                self._legal_moves,
+                self._board_state,
+                self._zobrist_key,
+                self._mg_score,
+                self._eg_score,
+                self._phase,
+            )
+        )
+        self._zobrist_key ^= SIDE_KEY
+        if self._en_passant != EMPTY:
+            self._zobrist_key ^= EN_PASSANT_KEYS[self._en_passant % COLUMNS]
+            self._en_passant = EMPTY
+        # No position before a null move is repeated by moves after it
+        self._half_move = 0
+        self._is_whites_turn = not self._is_whites_turn
+        self._legal_moves, self._board_state = None, BoardState.NORMAL
+
+    def unmake_null_move(self) -> None:
+        (
+            _,
+            _,
+            self._castling_rights,
+            self._en_passant,
+            self._half_move,
+            self._legal_moves,
+            self._board_state,
+            self._zobrist_key,
+            self._mg_score,
+            self._eg_score,
+            self._phase,
+        ) = self._move_stack.pop()
+        self._is_whites_turn = not self._is_whites_turn
+
+    def make_move(self, move: int) -> None:
+        self.push(move)
+
+    def unmake_move(self) -> None:
+        self.pop()
+
+    def get_all_possible_moves(self) -> List[int]:
+        return list(self.generate_moves())
+
+    def get_piece_count(self) -> int:
+        return bin(self._occupancy[0] | self._occupancy[1]).count("1")
+
+    def has_non_pawn_material(self) -> bool:
+        base = (BLACK - self._is_whites_turn) * 6
+        return any(self._pieces[base + piece_type] for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN))
+
+    def get_piece_value(self, square: int) -> int:
+        piece = self._mailbox[square]
+        return PIECE_VALUES[piece % 6] if piece != EMPTY else 0
+
+    def get_board_value(self, is_maximising_player: bool = True) -> int:
+        if self.is_terminal:
+            if is_maximising_player:
+                return 2000
+            else:
+                return -2000
+
+        total_white, total_black = 0, 0
+        for piece_type, value in enumerate(PIECE_VALUES):
+            total_white += value * bin(self._pieces[WHITE * 6 + piece_type]).count("1")
+            total_black += value * bin(self._pieces[BLACK * 6 + piece_type]).count("1")
+
+        if is_maximising_player == self._is_whites_turn:
+            return total_white - total_black
+        return total_black - total_white
+
+    def get_evaluation(self, is_maximising_player: bool = True) -> int:
+        """
+        Tapered piece-square evaluation in centipawns, kept up to date by make_move and unmake_move
+        :param is_maximising_player: Same orientation as get_board_value
+        """
+        value = get_tapered_value(
+            mg_score=self._mg_score, eg_score=self._eg_score, phase=self._phase
+        )
+        return value if is_maximising_player == self._is_whites_turn else -value
+
+    @staticmethod
+    def moves_to_str(moves: List[int]) -> List[str]:
+        return [move_to_uci(move) for move in moves]
+
+    def __repr__(self):
+        chess_board_str = ""
+        for row in range(ROWS):
+            row_symbols = []
+            for column in range(COLUMNS):
+                piece = self._mailbox[square_index(row, column)]
+                row_symbols.append(PIECE_SYMBOLS[piece].lower() if piece != EMPTY else "0")
+            chess_board_str += f"{row_symbols}\n"
+        return chess_board_str
@@ -1,8 +1,44 @@
 import copy
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 from enum import Enum
 
+from chess_engine.backend.move import (
+    CAPTURE,
+    COLUMNS,
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KING_CASTLE,
+    QUEEN_CASTLE,
+    QUIET,
+    ROWS,
+    get_promotion_flag,
+    get_promotion_piece,
+    is_tactical,
+    move_to_uci,
+)
+from chess_engine.backend.evaluation import (
+    EG_SCORES,
+    MG_SCORES,
+    PHASES,
+    get_scores,
+    get_tapered_value,
+)
+from chess_engine.backend.fen import (
+    CASTLING_SYMBOLS,
+    EMPTY,
+    PIECE_SYMBOLS,
+    FenSnapshot,
+    get_fen,
+    parse_fen,
+)
 from chess_engine.backend.square import Square
+from chess_engine.backend.zobrist import (
+    CASTLING_KEYS,
+    EN_PASSANT_KEYS,
+    PIECE_KEYS,
+    SIDE_KEY,
+    get_zobrist_key,
+)
 from chess_engine.backend.pieces import (
     Pawn,
     Bishop,
@@ -11,10 +47,12 @@ from chess_engine.backend.pieces import (
     Queen,
     King,
     Piece,
+    KING_MOVES,
 )
 
-ROWS: int = 8
-COLUMNS: int = 8
+KNIGHT_MOVES: Tuple = Knight.moves
+# Indexed by (row + column) % 2 for squares and by PIECE_SYMBOLS index // 6 for pieces
+COLOURS: Tuple = ("white", "black")
 
 PIECE_TO_SYMBOL: Dict = {
     Queen: "q",
@@ -42,6 +80,15 @@ class BoardState(Enum):
     CHECKMATE = 3
 
 
+class CheckInfo(NamedTuple):
+    colour: str
+    king_square: Square
+    attacked_squares: Set[int]
+    checkers: List[Square]
+    check_squares: Optional[Set[int]]
+    pins: Dict[int, Set[int]]
+
+
 class Board:
     def __init__(self):
         self._is_whites_turn = True
@@ -49,11 +96,16 @@ class Board:
 
         self._previous_move = None
         self._fen_repr = None
-        self._fen_castling_status = None
+        self._half_move, self._full_move = 0, 1
+        self._zobrist_key = 0
+        self._mg_score, self._eg_score, self._phase = 0, 0, 0
         self.promotion_piece = None
 
-        self._check_moves = {}
-        self._pieces = {"white": {}, "black": {}}
+        self._check_info: Optional[CheckInfo] = None
+        # Legal moves of the side to move, generated once per position
+        self._legal_moves: Optional[List[int]] = None
+        self._move_stack, self._removed_pieces = [], []
+        self._pieces: Dict[str, Dict[str, List[Piece]]] = {"white": {}, "black": {}}
         self._chessboard, self._move_squares, self.all_possible_moves = [], [], []
 
     @property
@@ -72,6 +124,10 @@ class Board:
     def board_state(self):
         return self._board_state
 
+    @property
+    def zobrist_key(self) -> int:
+        return self._zobrist_key
+
     @property
     def is_terminal(self) -> bool:
         if self.board_state == BoardState.CHECKMATE or self.board_state == BoardState.STALEMATE:
@@ -88,50 +144,87 @@ class Board:
 
     @is_whites_turn.setter
     def is_whites_turn(self, whites_turn: bool):
+        if whites_turn != self._is_whites_turn:
+            self._zobrist_key ^= SIDE_KEY
+            self._legal_moves = None
         self._is_whites_turn = whites_turn
 
     def get_chessboard(self) -> List[List[Square]]:
         return self._chessboard
 
     def initialise_board(self) -> None:
-        parsed_fen_list = self.parse_fen(fen_str=self._fen_repr)
+        self._check_info, self._legal_moves = None, None
+        snapshot = self.parse_fen(fen_str=self._fen_repr)
 
-        for row, row_list in enumerate(parsed_fen_list):
-            current_row = []
-            for column, piece_symbol in enumerate(row_list):
-                if (column + row) % 2 == 0:
-                    colour = "white"
-                else:
-                    colour = "black"
-                square = Square(row, column, colour)
-                if piece_symbol.isupper():
-                    piece_colour = "white"
-                else:
-                    piece_colour = "black"
-                piece_type = SYMBOL_TO_PIECE.get(piece_symbol.lower())
-                if not piece_type:
-                    current_row.append(square)
-                    continue
-                square.piece = piece_type(row, column, piece_colour, piece_symbol)
-                if piece_symbol == "k":
-                    if "k" in self._fen_castling_status:
-                        square.piece.castling_status.append("k")
-                    if "q" in self._fen_castling_status:
-                        square.piece.castling_status.append("q")
-
-                if piece_symbol == "K":
-                    if "K" in self._fen_castling_status:
-                        square.piece.castling_status.append("K")
-                    if "Q" in self._fen_castling_status:
-                        square.piece.castling_status.append("Q")
-
-                piece_symbol = piece_symbol.lower()
-                if not self._pieces[piece_colour].get(piece_symbol):
-                    self._pieces[piece_colour][piece_symbol] = [square.piece]
-                else:
-                    self._pieces[piece_colour][piece_symbol].append(square.piece)
-                current_row.append(square)
-            self._chessboard.append(current_row)
+        for row in range(ROWS):
+            self._chessboard.append(
+                [Square(row, column, COLOURS[(row + column) % 2]) for column in range(COLUMNS)]
+            )
+
+        for square_index, piece in enumerate(snapshot.mailbox):
+            if piece == EMPTY:
+                continue
+            row, column = divmod(square_index, COLUMNS)
+            piece_symbol = PIECE_SYMBOLS[piece]
+            piece_type = SYMBOL_TO_PIECE[piece_symbol.lower()]
+            piece_obj = piece_type(row, column, COLOURS[piece // 6], piece_symbol)
+            if piece_type is King:
+                piece_obj.castling_status.extend(
+                    castling_symbol
+                    for index, castling_symbol in enumerate(CASTLING_SYMBOLS)
+                    if snapshot.castling_rights >> index & 1
+                    and castling_symbol.isupper() == piece_symbol.isupper()
+                )
+            self._chessboard[row][column].piece = piece_obj
+            self.__add_piece(piece=piece_obj)
+
+        if snapshot.en_passant != EMPTY:
+            self.__set_en_passant_move(en_passant=snapshot.en_passant)
+        self._zobrist_key = self.compute_zobrist_key()
+        self._mg_score, self._eg_score, self._phase = get_scores(pieces=self.__get_piece_indices())
+
+    def __get_piece_indices(self) -> List[Tuple[int, int]]:
+        return [
+            (PIECE_SYMBOLS.index(square.piece.symbol), square.row * COLUMNS + square.column)
+            for square in self.__get_piece_squares()
+        ]
+
+    def compute_zobrist_key(self) -> int:
+        pieces = self.__get_piece_indices()
+        en_passant_column = self._previous_move[1].column if self._previous_move else None
+        return get_zobrist_key(
+            pieces=pieces,
+            castling_rights=self.get_castling_rights(),
+            en_passant_column=en_passant_column,
+            is_whites_turn=self._is_whites_turn,
+        )
+
+    def __get_state_key(self) -> int:
+        state_key = CASTLING_KEYS[self.get_castling_rights()]
+        if self._previous_move:
+            state_key ^= EN_PASSANT_KEYS[self._previous_move[1].column]
+        return state_key
+
+    def __toggle_piece(self, square: Square, sign: int) -> None:
+        """
+        Updates the zobrist key and the evaluation scores for the piece on a square
+        :param sign: 1 when the piece is placed on the square, -1 when it is taken off
+        """
+        if square.piece:
+            piece = PIECE_SYMBOLS.index(square.piece.symbol)
+            index = piece * 64 + square.row * COLUMNS + square.column
+            self._zobrist_key ^= PIECE_KEYS[index]
+            self._mg_score += sign * MG_SCORES[index]
+            self._eg_score += sign * EG_SCORES[index]
+            self._phase += sign * PHASES[piece]
+
+    def __set_en_passant_move(self, en_passant: int) -> None:
+        passing_row, column = divmod(en_passant, COLUMNS)
+        direction = 1 if self._is_whites_turn else -1
+        src_square = self.get_square(row=passing_row - direction, column=column)
+        dst_square = self.get_square(row=passing_row + direction, column=column)
+        if isinstance(dst_square.piece, Pawn):
+            self._previous_move = [copy.copy(src_square), copy.copy(dst_square)]
 
     def get_move_squares(self) -> List[Square]:
         if not self._move_squares:
@@ -142,44 +235,24 @@ class Board:
         self._move_squares.clear()
 
     def update_board(self, src_square: Square, dst_square: Square) -> None:
-        self._is_whites_turn = not self._is_whites_turn
-        is_check = self.__is_in_check(src_square=src_square, dst_square=dst_square)
-        if is_check:
-            self.board_state = BoardState.CHECK
-        self._is_whites_turn = not self._is_whites_turn
-
-        is_castle_move = self.__is_castle_move(
-            src_square=src_square,
-            dst_square=dst_square,
-        )
-
-        if is_castle_move:
+        self._check_info, self._legal_moves = None, None
+        if isinstance(src_square.piece, Pawn) or dst_square.piece:
+            self._half_move = 0
+        else:
+            self._half_move += 1
+        if not self._is_whites_turn:
+            self._full_move += 1
+        self._zobrist_key ^= self.__get_state_key()
+        self.__toggle_piece(square=src_square, sign=-1)
+        self.__toggle_piece(square=dst_square, sign=-1)
+
+        if isinstance(src_square.piece, King):
             src_square.piece.castling_status.clear()
 
-        if isinstance(src_square.piece, Rook) or isinstance(dst_square.piece, Rook):
-            king_piece_colour = (
-                dst_square.piece.colour
-                if isinstance(dst_square.piece, Rook)
-                else src_square.piece.colour
-            )
-            king_piece = self._pieces[king_piece_colour]["k"][0]
-            if king_piece.castling_status:
-                if src_square.piece.column > 4:
-                    king_symbol = (
-                        "K"
-                        if self._is_whites_turn or king_piece_colour == "white"
-                        else "k"
-                    )
-                    if king_symbol in king_piece.castling_status:
-                        king_piece.castling_status.remove(king_symbol)
-                else:
-                    queen_symbol = (
-                        "Q"
-                        if self._is_whites_turn or king_piece_colour == "white"
-                        else "q"
-                    )
-                    if queen_symbol in king_piece.castling_status:
-                        king_piece.castling_status.remove(queen_symbol)
+        self.__update_castling_status(square=src_square)
+        self.__update_castling_status(square=dst_square)
+        if dst_square.piece:
+            self.__remove_piece(piece=dst_square.piece)
 
         en_passant_move = self.__is_en_passant_move(
             src_square=src_square, dst_square=dst_square, in_check=False
@@ -189,6 +262,8 @@ class Board:
             en_passant_square = self.get_square(
                 row=prev_dst_square.row, column=prev_dst_square.column
             )
+            self.__toggle_piece(square=en_passant_square, sign=-1)
+            self.__remove_piece(piece=en_passant_square.piece)
             en_passant_square.piece = None
             self._move_squares.append(en_passant_square)
 
@@ -202,8 +277,10 @@ class Board:
             )
         else:
             dst_square.piece = src_square.piece
+            dst_square.piece.row, dst_square.piece.column = dst_square.row, dst_square.column
         src_square.piece = None
         dst_square.piece.has_moved = True
+        self.__toggle_piece(square=dst_square, sign=1)
 
         if (
             isinstance(dst_square.piece, Pawn)
@@ -229,32 +306,189 @@ class Board:
                 new_rook_square = self.get_square(
                     row=dst_square.row, column=dst_square.column - 1
                 )
+            self.__toggle_piece(square=rook_square, sign=-1)
             new_rook_square.piece = rook_square.piece
+            new_rook_square.piece.row = new_rook_square.row
+            new_rook_square.piece.column = new_rook_square.column
             rook_square.piece = None
+            self.__toggle_piece(square=new_rook_square, sign=1)
             self._move_squares.append(rook_square)
 
         dst_square.piece.has_moved = True
+        self._zobrist_key ^= self.__get_state_key()
 
-        if self.board_state == BoardState.NORMAL:
-            return
         colour = "black" if self._is_whites_turn else "white"
-        squares = self.__get_all_pieces(
-            chessboard=self._chessboard,
-            colour=colour,
-        )
-        all_possible_squares = []
+        if self.__get_check_info(colour=colour).checkers:
+            self.board_state = BoardState.CHECK
+        else:
+            self.board_state = BoardState.NORMAL
+            return
         self._is_whites_turn = not self._is_whites_turn
-        for square in squares:
-            possible_squares = self.get_piece_moves(square)
-            all_possible_squares.append(possible_squares)
+        legal_moves = self.generate_moves()
         self._is_whites_turn = not self._is_whites_turn
 
-        if not any(all_possible_squares):
+        if not legal_moves:
             if self.board_state == BoardState.CHECK:
                 self.board_state = BoardState.CHECKMATE
             else:
                 self.board_state = BoardState.STALEMATE
 
+    def make_move(self, move: int) -> None:
+        src_square = self.get_square(*divmod(move & 63, COLUMNS))
+        dst_square = self.get_square(*divmod(move >> 6 & 63, COLUMNS))
+        promotion_piece = get_promotion_piece(move)
+        moved_piece = src_square.piece
+        changed_squares = [(src_square, src_square.piece), (dst_square, dst_square.piece)]
+
+        if self._previous_move:
+            prev_src_square, prev_dst_square = self._previous_move
+            en_passant_square = self.get_square(
+                row=prev_dst_square.row, column=prev_dst_square.column
+            )
+            changed_squares.append((en_passant_square, en_passant_square.piece))
+
+        if (
+            isinstance(moved_piece, King)
+            and abs(src_square.column - dst_square.column) == 2
+        ):
+            if dst_square.column < (COLUMNS // 2):
+                rook_columns = (0, dst_square.column + 1)
+            else:
+                rook_columns = (COLUMNS - 1, dst_square.column - 1)
+            for column in rook_columns:
+                rook_square = self.get_square(row=dst_square.row, column=column)
+                changed_squares.append((rook_square, rook_square.piece))
+
+        kings = [self._pieces[colour]["k"][0] for colour in ("white", "black")]
+        self._move_stack.append(
+            (
+                changed_squares,
+                moved_piece,
+                moved_piece.has_moved,
+                [(king, list(king.castling_status)) for king in kings],
+                self._previous_move,
+                self._board_state,
+                self._zobrist_key,
+                self._mg_score,
+                self._eg_score,
+                self._phase,
+                self._half_move,
+                self._full_move,
+                self._check_info,
+                self._legal_moves,
+                len(self._move_squares),
+                len(self._removed_pieces),
+            )
+        )
+
+        previous_promotion_piece = self.promotion_piece
+        self.promotion_piece = promotion_piece
+        self._board_state = BoardState.NORMAL
+        self.update_board(src_square=src_square, dst_square=dst_square)
+        self.promotion_piece = previous_promotion_piece
+        self._is_whites_turn = not self._is_whites_turn
+        self._zobrist_key ^= SIDE_KEY
+
+    def unmake_move(self) -> None:
+        (
+            changed_squares,
+            moved_piece,
+            has_moved,
+            castling_status,
+            previous_move,
+            board_state,
+            self._zobrist_key,
+            self._mg_score,
+            self._eg_score,
+            self._phase,
+            self._half_move,
+            self._full_move,
+            self._check_info,
+            self._legal_moves,
+            move_square_count,
+            removed_piece_count,
+        ) = self._move_stack.pop()
+
+        dst_square = changed_squares[1][0]
+        if dst_square.piece is not moved_piece:
+            promoted_piece = dst_square.piece
+            self._pieces[promoted_piece.colour][promoted_piece.symbol.lower()].pop()
+        for piece, index in reversed(self._removed_pieces[removed_piece_count:]):
+            self._pieces[piece.colour][piece.symbol.lower()].insert(index, piece)
+        del self._removed_pieces[removed_piece_count:]
+
+        for square, piece in changed_squares:
+            square.piece = piece
+            if piece:
+                piece.row, piece.column = square.row, square.column
+        moved_piece.has_moved = has_moved
+        for king, king_castling_status in castling_status:
+            king.castling_status[:] = king_castling_status
+        self._previous_move = previous_move
+        self._board_state = board_state
+        del self._move_squares[move_square_count:]
+        self._is_whites_turn = not self._is_whites_turn
+
+    def is_repetition(self) -> bool:
+        """
+        Whether the position occurred before among the moves made on the board, since the last
+        capture or pawn move
+        """
+        key, stack = self._zobrist_key, self._move_stack
+        for distance in range(4, min(self._half_move, len(stack)) + 1, 2):
+            if stack[-distance][6] == key:
+                return True
+        return False
+
+    def make_null_move(self) -> None:
+        """
+        Passes the turn, only valid when the side to move is not in check
+        """
+        self._move_stack.append(
+            (
+                self._previous_move,
+                self._board_state,
+                self._zobrist_key,
+                self._half_move,
+                self._check_info,
+                self._legal_moves,
+            )
+        )
+        self._zobrist_key ^= SIDE_KEY
+        if self._previous_move:
+            self._zobrist_key ^= EN_PASSANT_KEYS[self._previous_move[1].column]
+            self._previous_move = None
+        # No position before a null move is repeated by moves after it
+        self._half_move = 0
+        self._check_info, self._legal_moves = None, None
+        self._board_state = BoardState.NORMAL
+        self._is_whites_turn = not self._is_whites_turn
+
+    def unmake_null_move(self) -> None:
+        (
+            self._previous_move,
+            self._board_state,
+            self._zobrist_key,
+            self._half_move,
+            self._check_info,
+            self._legal_moves,
+        ) = self._move_stack.pop()
+        self._is_whites_turn = not self._is_whites_turn
+
+    def __update_castling_status(self, square: Square) -> None:
+        if not isinstance(square.piece, Rook) or square.column not in (0, COLUMNS - 1):
+            return
+        colour = square.piece.colour
+        if square.row != (ROWS - 1 if colour == "white" else 0):
+            return
+
+        castling_symbol = "k" if square.column == COLUMNS - 1 else "q"
+        if colour == "white":
+            castling_symbol = castling_symbol.upper()
+        king_piece = self._pieces[colour]["k"][0]
+        if castling_symbol in king_piece.castling_status:
+            king_piece.castling_status.remove(castling_symbol)
+
     def __set_promoted_piece(
         self, src_square: Square, dst_square: Square, piece_type: Piece
     ) -> None:
@@ -266,43 +500,66 @@ class Board:
         dst_square.piece = piece_type(
             dst_square.row, dst_square.column, src_square.piece.colour, piece_symbol
         )
-
-    @staticmethod
-    def __get_all_pieces(
-        chessboard: List[List[Square]], colour: str = None
-    ) -> List[Square]:
-        squares = []
-        for row in chessboard:
-            for square in row:
-                if not square.piece:
-                    continue
-                if square.piece.colour != colour and colour:
-                    continue
-                squares.append(square)
-        return squares
-
-    def get_piece_moves(self, square: Square) -> List[Square]:
+        self.__remove_piece(piece=src_square.piece)
+        self.__add_piece(piece=dst_square.piece)
+
+    def __add_piece(self, piece: Piece) -> None:
+        self._pieces[piece.colour].setdefault(piece.symbol.lower(), []).append(piece)
+
+    def __remove_piece(self, piece: Piece) -> None:
+        pieces = self._pieces[piece.colour][piece.symbol.lower()]
+        index = pieces.index(piece)
+        del pieces[index]
+        self._removed_pieces.append((piece, index))
+
+    def __get_piece_squares(self, colour: str = None) -> List[Square]:
+        colours = (colour,) if colour else ("white", "black")
+        return [
+            self._chessboard[piece.row][piece.column]
+            for piece_colour in colours
+            for pieces in self._pieces[piece_colour].values()
+            for piece in pieces
+        ]
+
+    def get_piece_moves(self, square: Square) -> List[int]:
         moves = []
-        is_promoted = False
-        for move in square.piece.get_moves():
-            possible_squares = self.__get_all_moves(src_square=square, move=move)
-            if isinstance(square.piece, Pawn):
-                for dst_square in possible_squares:
-                    if square.piece.is_being_promoted(dst_row=dst_square.row):
-                        promotion_pieces = [Queen, Bishop, Knight, Rook]
-                        is_promoted = True
-                        for promotion_piece in promotion_pieces:
-                            moves.append([dst_square, promotion_piece])
-            if not is_promoted:
-                moves.extend(possible_squares)
+        piece = square.piece
+        check_info = self.__get_check_info(colour=piece.colour)
+        if len(check_info.checkers) > 1 and not isinstance(piece, King):
+            return moves
+
+        src = square.row * COLUMNS + square.column
+        for direction in piece.get_moves():
+            possible_squares = self.__get_all_moves(
+                src_square=square, move=direction, check_info=check_info
+            )
+            for dst_square in possible_squares:
+                move = src | (dst_square.row * COLUMNS + dst_square.column) << 6
+                flag = CAPTURE if dst_square.piece else QUIET
+                if isinstance(piece, Pawn):
+                    if piece.is_being_promoted(dst_row=dst_square.row):
+                        for promotion_piece in (Queen, Bishop, Knight, Rook):
+                            moves.append(move | (flag | get_promotion_flag(promotion_piece)) << 12)
+                        continue
+                    if square.column != dst_square.column and not dst_square.piece:
+                        flag = EN_PASSANT
+                    elif abs(square.row - dst_square.row) == 2:
+                        flag = DOUBLE_PAWN_PUSH
+                elif isinstance(piece, King) and abs(square.column - dst_square.column) == 2:
+                    flag = KING_CASTLE if dst_square.column > square.column else QUEEN_CASTLE
+                moves.append(move | flag << 12)
         return moves
 
-    def __get_all_moves(self, src_square: Square, move: Tuple[int, int]) -> List[Square]:
+    def __get_all_moves(
+        self, src_square: Square, move: Tuple[int, int], check_info: CheckInfo
+    ) -> List[Square]:
         all_possible_moves = []
-        is_in_check, is_starting_pawn, is_en_passant_move = False, False, False
+        is_starting_pawn, is_en_passant_move = False, False
         row, column = move
         dst_row = row + src_square.row
         dst_column = column + src_square.column
+        is_king = isinstance(src_square.piece, King)
+        pin_squares = check_info.pins.get(src_square.row * COLUMNS + src_square.column)
 
         while 1:
             if not self.__is_on_board(dst_row, dst_column):
@@ -319,7 +576,7 @@ class Board:
                 is_en_passant_move = self.__is_en_passant_move(
                     src_square=src_square,
                     dst_square=dst_square,
-                    in_check=is_in_check,
+                    in_check=False,
                 )
                 if is_en_passant_move:
                     is_capture_move = True
@@ -339,25 +596,38 @@ class Board:
                     if not src_square.piece.has_moved and not is_capture_move:
                         break
 
-            is_in_check = self.__is_in_check(
-                src_square=src_square,
-                dst_square=dst_square,
-                is_en_passant_move=is_en_passant_move,
-            )
+            dst_index = dst_row * COLUMNS + dst_column
+            if is_king:
+                is_legal = dst_index not in check_info.attacked_squares
+            elif is_en_passant_move:
+                is_legal = self.__is_legal_en_passant_move(
+                    src_square=src_square, dst_square=dst_square, check_info=check_info
+                )
+            else:
+                is_legal = (
+                    check_info.check_squares is None or dst_index in check_info.check_squares
+                ) and (pin_squares is None or dst_index in pin_squares)
 
-            if not is_in_check:
+            if is_legal:
                 all_possible_moves.append(dst_square)
 
             if is_capture_move:
                 break
 
-            is_castle_move = self.__is_castle_move(src_square, dst_square, is_in_check)
+            if is_king:
+                if is_legal and self.__is_castle_move(src_square, dst_square, check_info):
+                    castle_square = self.get_square(
+                        row=dst_row, column=dst_column + column
+                    )
+                    if (
+                        not castle_square.piece
+                        and castle_square.row * COLUMNS + castle_square.column
+                        not in check_info.attacked_squares
+                    ):
+                        all_possible_moves.append(castle_square)
+                break
 
-            if (
-                not src_square.piece.multi_moves
-                and not is_castle_move
-                and not is_starting_pawn
-            ):
+            if not src_square.piece.multi_moves and not is_starting_pawn:
                 break
 
             dst_row = row + dst_square.row
@@ -387,14 +657,13 @@ class Board:
         return True
 
     def __is_castle_move(
-        self, src_square: Square, dst_square: Square, in_check: bool = False
+        self, src_square: Square, dst_square: Square, check_info: CheckInfo
     ) -> bool:
         if (
-            not isinstance(src_square.piece, King)
-            or in_check
-            or self.board_state == BoardState.CHECK
-            or abs(src_square.row - dst_square.row) > 0
-            or abs(src_square.column - dst_square.column > 1)
+            check_info.checkers
+            or src_square.row != dst_square.row
+            or src_square.column != 4
+            or abs(src_square.column - dst_square.column) != 1
         ):
             return False
 
@@ -448,164 +717,193 @@ class Board:
                 return True
         return False
 
-    def __is_in_check(
-        self,
-        src_square: Square,
-        dst_square: Square,
-        is_en_passant_move: bool = False,
-    ) -> bool:
-        is_in_check = False
-        dst_capture_piece = None
-        en_passant_piece = None
-        src_square_piece = src_square.piece
-        if self.__is_capture_move(src_square, dst_square):
-            dst_capture_piece = dst_square.piece
-
-        if is_en_passant_move:
-            prev_src_square, prev_dst_square = self.previous_move
-            en_passant_square = self.get_square(
-                row=prev_dst_square.row, column=prev_dst_square.column
-            )
-            en_passant_piece = en_passant_square.piece
-            en_passant_square.piece = None
+    def __get_check_info(self, colour: str) -> CheckInfo:
+        if self._check_info and self._check_info.colour == colour:
+            return self._check_info
 
-        if isinstance(src_square.piece, Pawn) and (
-            dst_square.row == (ROWS - 1) or dst_square.row == 0
+        king_piece = self._pieces[colour]["k"][0]
+        king_square = self.get_square(row=king_piece.row, column=king_piece.column)
+        attacked_squares = set()
+        for square in self.__get_piece_squares(
+            colour="black" if colour == "white" else "white"
         ):
-            piece_symbol = "Q" if self._is_whites_turn else "q"
-            dst_square.piece = Queen(
-                dst_square.row, dst_square.column, src_square.piece.colour, piece_symbol
-            )
-        else:
-            dst_square.piece = src_square.piece
-        src_square.piece = None
+            attacked_squares.update(self.__get_attacked_squares(square=square))
+
+        checkers, check_squares, pins = [], None, {}
+        for move in KING_MOVES:
+            ray, own_square = [], None
+            row, column = king_square.row + move[0], king_square.column + move[1]
+            while self.__is_on_board(row, column):
+                square = self.get_square(row=row, column=column)
+                ray.append(row * COLUMNS + column)
+                row, column = row + move[0], column + move[1]
+                if not square.piece:
+                    continue
+                if square.piece.colour == colour:
+                    if own_square:
+                        break
+                    own_square = square
+                    continue
+                if self.__is_slider_attack(piece=square.piece, move=move):
+                    if own_square:
+                        pins[own_square.row * COLUMNS + own_square.column] = set(ray)
+                    else:
+                        checkers.append(square)
+                        check_squares = set(ray)
+                break
+
+        pawn_row = -1 if colour == "white" else 1
+        for move in KNIGHT_MOVES + ((pawn_row, 1), (pawn_row, -1)):
+            row, column = king_square.row + move[0], king_square.column + move[1]
+            if not self.__is_on_board(row, column):
+                continue
+            square = self.get_square(row=row, column=column)
+            if not square.piece or square.piece.colour == colour:
+                continue
+            piece_type = Knight if move in KNIGHT_MOVES else Pawn
+            if isinstance(square.piece, piece_type):
+                checkers.append(square)
+                check_squares = {row * COLUMNS + column}
 
-        colour = "white" if self._is_whites_turn else "black"
-        squares = self.__get_all_pieces(
-            chessboard=self._chessboard,
+        self._check_info = CheckInfo(
             colour=colour,
+            king_square=king_square,
+            attacked_squares=attacked_squares,
+            checkers=checkers,
+            check_squares=check_squares,
+            pins=pins,
         )
-        king_src_square = None
-        knight_moves = []
-        for square in squares:
-            if isinstance(square.piece, King) and square.piece.colour == colour:
-                king_src_square = square
-            elif isinstance(square.piece, Knight):
-                knight_moves = square.piece.moves
-
-        for move in king_src_square.piece.moves:
-            row, column = move
-            dst_row = row + king_src_square.row
-            dst_column = column + king_src_square.column
-
-            while 1:
-                if not self.__is_on_board(dst_row, dst_column):
-                    break
-                king_dst_square = self.get_square(row=dst_row, column=dst_column)
-
-                if self.__is_own_piece(king_src_square, king_dst_square):
-                    break
+        return self._check_info
 
-                if king_dst_square.piece:
-                    if king_dst_square.piece.colour == king_src_square.piece.colour:
-                        break
+    @staticmethod
+    def __is_slider_attack(piece: Piece, move: Tuple[int, int]) -> bool:
+        if isinstance(piece, Queen):
+            return True
+        if move[0] and move[1]:
+            return isinstance(piece, Bishop)
+        return isinstance(piece, Rook)
+
+    def __get_attacked_squares(self, square: Square) -> List[int]:
+        attacked_squares = []
+        piece = square.piece
+        if isinstance(piece, Pawn):
+            moves = piece.moves[1:]
+        else:
+            moves = piece.moves
 
-                    if (
-                        isinstance(king_dst_square.piece, Pawn)
-                        and abs(king_src_square.row - king_dst_square.row) < 2
-                    ):
-                        if abs(move[0] * move[1]) == 1:
-                            if (
-                                self._is_whites_turn
-                                and king_src_square.row > king_dst_square.row
-                            ):
-                                is_in_check = True
-                            if (
-                                not self._is_whites_turn
-                                and king_src_square.row < king_dst_square.row
-                            ):
-                                is_in_check = True
-                        else:
-                            break
-                    elif isinstance(king_dst_square.piece, Queen):
-                        is_in_check = True
-                    elif isinstance(king_dst_square.piece, Rook) and (
-                        king_src_square.column == king_dst_square.column
-                        or king_src_square.row == king_dst_square.row
-                    ):
-                        is_in_check = True
-                    elif isinstance(king_dst_square.piece, Bishop) and (
-                        abs(move[0] * move[1]) == 1
+        for move in moves:
+            row, column = square.row + move[0], square.column + move[1]
+            while self.__is_on_board(row, column):
+                attacked_squares.append(row * COLUMNS + column)
+                attacked_square = self.get_square(row=row, column=column)
+                if not piece.multi_moves:
+                    break
+                if attacked_square.piece and not (
+                    isinstance(attacked_square.piece, King)
+                    and attacked_square.piece.colour != piece.colour
+                ):
+                    break
+                row, column = row + move[0], column + move[1]
+        return attacked_squares
+
+    def __is_square_attacked(self, square: Square, colour: str) -> bool:
+        for move in KING_MOVES:
+            row, column = square.row + move[0], square.column + move[1]
+            distance = 1
+            while self.__is_on_board(row, column):
+                attacker = self.get_square(row=row, column=column).piece
+                if attacker:
+                    if attacker.colour == colour and (
+                        self.__is_slider_attack(piece=attacker, move=move)
+                        or (distance == 1 and isinstance(attacker, King))
                     ):
-                        is_in_check = True
-                    else:
-                        break
+                        return True
+                    break
+                row, column = row + move[0], column + move[1]
+                distance += 1
 
-                dst_row = row + king_dst_square.row
-                dst_column = column + king_dst_square.column
+        pawn_row = 1 if colour == "white" else -1
+        for move in KNIGHT_MOVES + ((pawn_row, 1), (pawn_row, -1)):
+            row, column = square.row + move[0], square.column + move[1]
+            if not self.__is_on_board(row, column):
+                continue
+            attacker = self.get_square(row=row, column=column).piece
+            if not attacker or attacker.colour != colour:
+                continue
+            if isinstance(attacker, Knight if move in KNIGHT_MOVES else Pawn):
+                return True
+        return False
 
-        for move in knight_moves:
-            row, column = move
-            dst_row = row + king_src_square.row
-            dst_column = column + king_src_square.column
+    def __is_legal_en_passant_move(
+        self, src_square: Square, dst_square: Square, check_info: CheckInfo
+    ) -> bool:
+        prev_src_square, prev_dst_square = self.previous_move
+        en_passant_square = self.get_square(
+            row=prev_dst_square.row, column=prev_dst_square.column
+        )
+        en_passant_piece = en_passant_square.piece
+        dst_square.piece, src_square.piece = src_square.piece, None
+        en_passant_square.piece = None
 
-            if not self.__is_on_board(dst_row, dst_column):
-                continue
-            king_dst_square = self.get_square(row=dst_row, column=dst_column)
+        is_legal = not self.__is_square_attacked(
+            square=check_info.king_square,
+            colour="black" if check_info.colour == "white" else "white",
+        )
 
-            if self.__is_own_piece(king_src_square, king_dst_square):
-                continue
+        src_square.piece, dst_square.piece = dst_square.piece, None
+        en_passant_square.piece = en_passant_piece
+        return is_legal
 
-            if king_dst_square.piece:
-                if king_dst_square.piece.colour != king_src_square.piece.colour:
-                    if isinstance(king_dst_square.piece, Knight):
-                        is_in_check = True
+    def generate_moves(self) -> List[int]:
+        if self._legal_moves is None:
+            pieces = self.__get_piece_squares(
+                colour="white" if self._is_whites_turn else "black"
+            )
+            legal_moves = []
+            for square in pieces:
+                legal_moves.extend(self.get_piece_moves(square))
+            self._legal_moves = legal_moves
+        return self._legal_moves
 
-        src_square.piece = src_square_piece
-        if dst_capture_piece:
-            dst_square.piece = dst_capture_piece
-        else:
-            dst_square.piece = None
+    def get_all_possible_moves(self) -> List[int]:
+        self.all_possible_moves = list(self.generate_moves())
+        return self.all_possible_moves
 
-        if en_passant_piece:
-            en_passant_square.piece = en_passant_piece
+    def generate_captures(self) -> List[int]:
+        return [move for move in self.generate_moves() if is_tactical(move)]
 
-        if is_in_check:
-            piece_str = str(src_square)
-            if piece_str not in self._check_moves:
-                self._check_moves[piece_str] = []
-            self._check_moves[piece_str].append((dst_square.row, dst_square.column))
+    def generate_quiets(self) -> List[int]:
+        return [move for move in self.generate_moves() if not is_tactical(move)]
 
-        return is_in_check
+    def is_legal(self, move: int) -> bool:
+        return move in self.generate_moves()
 
-    def get_all_possible_moves(self) -> List[List[Union[Square, List[Square]]]]:
-        pieces = self.__get_all_pieces(
-            chessboard=self._chessboard,
-            colour="white" if self._is_whites_turn else "black",
+    def get_piece_count(self) -> int:
+        return sum(
+            len(pieces) for colour in ("white", "black") for pieces in self._pieces[colour].values()
         )
-        all_possible_moves = []
-        for square in pieces:
-            possible_moves = self.get_piece_moves(square)
-            if possible_moves:
-                all_possible_moves.append([square, possible_moves])
-        self.all_possible_moves = all_possible_moves
-        return all_possible_moves
 
-    def get_board_value(self, is_maximising_player: bool) -> int:
-        pieces = self.__get_all_pieces(chessboard=self._chessboard)
-        total_white = 0
-        total_black = 0
+    def has_non_pawn_material(self) -> bool:
+        pieces = self._pieces["white" if self._is_whites_turn else "black"]
+        return any(pieces.get(symbol) for symbol in "nbrq")
+
+    def get_piece_value(self, square: int) -> int:
+        piece = self.get_square(*divmod(square, COLUMNS)).piece
+        return piece.value if piece else 0
+
+    def get_board_value(self, is_maximising_player: bool = True) -> int:
         if self.is_terminal:
             if is_maximising_player:
                 return 2000
             else:
                 return -2000
 
-        for square in pieces:
-            if square.piece.colour == "white":
-                total_white += square.piece.value
-            else:
-                total_black += square.piece.value
+        total_white = sum(
+            piece.value for pieces in self._pieces["white"].values() for piece in pieces
+        )
+        total_black = sum(
+            piece.value for pieces in self._pieces["black"].values() for piece in pieces
+        )
 
         if is_maximising_player:
             if self._is_whites_turn:
@@ -618,6 +916,16 @@ class Board:
             else:
                 return total_white - total_black
 
+    def get_evaluation(self, is_maximising_player: bool = True) -> int:
+        """
+        Tapered piece-square evaluation in centipawns, kept up to date by make_move and unmake_move
+        :param is_maximising_player: Same orientation as get_board_value
+        """
+        value = get_tapered_value(
+            mg_score=self._mg_score, eg_score=self._eg_score, phase=self._phase
+        )
+        return value if is_maximising_player == self._is_whites_turn else -value
+
     def __repr__(self):
         chess_board_str = ""
         for row in self._chessboard:
@@ -633,45 +941,20 @@ class Board:
         return fen_list
 
     def get_fen(self) -> str:
-        fen = ""
-
-        for row_index, row in enumerate(self._chessboard):
-            empty_square_count = 0
-            for square in row:
-                if square.piece:
-                    if empty_square_count > 0:
-                        fen += str(empty_square_count)
-                        empty_square_count = 0
-                    fen += str(square.piece)
-                else:
-                    empty_square_count += 1
-            if empty_square_count > 0:
-                fen += str(empty_square_count)
-            if row_index == ROWS - 1:
-                if self._is_whites_turn:
-                    fen += " w"
-                else:
-                    fen += " b"
-                castling_stat = self.get_castling_status()
-                castling_str = ""
-                for element in castling_stat:
-                    castling_str += element
-                if castling_str:
-                    fen += f" {castling_str}"
-                else:
-                    fen += " -"
-                if self.previous_move:
-                    src_square, dst_square = self.previous_move
-                    passing_pawn_row = dst_square.row - 1 if self._is_whites_turn else dst_square.row + 1
-                    passing_square = self.get_square(row=passing_pawn_row, column=dst_square.column)
-                    fen += f" {passing_square}"
-                else:
-                    fen += " -"
-
-                fen += f" 0 1"
-            else:
-                fen += "/"
-        return fen
+        en_passant = EMPTY
+        if self._previous_move:
+            src_square, dst_square = self._previous_move
+            en_passant = (src_square.row + dst_square.row) // 2 * COLUMNS + dst_square.column
+        return get_fen(
+            board_symbols="".join(
+                [square.piece.symbol if square.piece else "1" for row in self._chessboard for square in row]
+            ),
+            is_whites_turn=self._is_whites_turn,
+            castling_rights=self.get_castling_rights(),
+            en_passant=en_passant,
+            half_move=self._half_move,
+            full_move=self._full_move,
+        )
 
     def get_castling_status(self) -> List:
         black_king = self._pieces["black"]["k"][0]
@@ -679,35 +962,18 @@ class Board:
 
         return white_king.castling_status + black_king.castling_status
 
-    def parse_fen(self, fen_str: str) -> List[List[str]]:
-        fen_str = fen_str.replace(" ", "/")
-        fen_list = fen_str.split("/")
-        board_rep = fen_list[:ROWS]
-
-        turn, castling_status, en_passant, half_move, full_move = fen_list[8:]
-        self._is_whites_turn = True if turn == "w" else False
-        self._fen_castling_status = castling_status if castling_status != "-" else []
-        parsed_fen_list = []
-        for row in board_rep:
-            parsed_col_list = []
-            for col in row:
-                if col.isdigit():
-                    chr_list = int(col) * ["x"]
-                    parsed_col_list.extend(chr_list)
-                else:
-                    parsed_col_list.extend(col)
-            parsed_fen_list.append(parsed_col_list)
-        return parsed_fen_list
+    def get_castling_rights(self) -> int:
+        castling_rights = 0
+        for castling_symbol in self.get_castling_status():
+            castling_rights |= 1 << CASTLING_SYMBOLS.index(castling_symbol)
+        return castling_rights
+
+    def parse_fen(self, fen_str: str) -> FenSnapshot:
+        snapshot = parse_fen(fen_str=fen_str)
+        self._is_whites_turn = snapshot.is_whites_turn
+        self._half_move, self._full_move = snapshot.half_move, snapshot.full_move
+        return snapshot
 
     @staticmethod
-    def moves_to_str(moves) -> List[str]:
-        moves_str = []
-        for move in moves:
-            src_square, dst_squares = move
-            for dst in dst_squares:
-                if isinstance(dst, List):
-                    dst_square, piece_type = dst
-                    piece = PIECE_TO_SYMBOL[piece_type]
-                    dst = f"{dst_square}{piece}"
-                moves_str.append(f"{src_square}{dst}")
-        return moves_str
+    def moves_to_str(moves: List[int]) -> List[str]:
+        return [move_to_uci(move) for move in moves]
@@ -0,0 +1,97 @@
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+from chess_engine.backend.move import COLUMNS, ROWS, parse_square_name, square_name
+
+PIECE_SYMBOLS: str = "PNBRQKpnbrqk"
+CASTLING_SYMBOLS: str = "KQkq"
+EMPTY: int = -1
+FEN_CACHE_SIZE: int = 4096
+
+# Board symbols with an empty square as "1", so index EMPTY maps to it
+BOARD_SYMBOLS: str = PIECE_SYMBOLS + "1"
+_SYMBOL_TO_PIECE = {symbol: piece for piece, symbol in enumerate(BOARD_SYMBOLS)}
+_SYMBOL_TO_PIECE["1"] = EMPTY
+_EXPAND_EMPTY_SQUARES = str.maketrans({str(count): "1" * count for count in range(1, COLUMNS + 1)})
+_EMPTY_RUNS = tuple(("1" * count, str(count)) for count in range(COLUMNS, 1, -1))
+_ROW_STARTS = tuple(range(0, ROWS * COLUMNS, COLUMNS))
+# Indexed by the castling rights bit mask
+_CASTLING_STATUS = tuple(
+    "".join(symbol for index, symbol in enumerate(CASTLING_SYMBOLS) if castling_rights >> index & 1)
+    or "-"
+    for castling_rights in range(1 << len(CASTLING_SYMBOLS))
+)
+
+
+class FenSnapshot(NamedTuple):
+    """
+    Parsed position in the square numbering of the board backends (a8 = 0)
+    """
+
+    mailbox: Tuple[int, ...]
+    pieces: Tuple[int, ...]
+    is_whites_turn: bool
+    castling_rights: int
+    en_passant: int
+    half_move: int
+    full_move: int
+
+
+@lru_cache(maxsize=FEN_CACHE_SIZE)
+def parse_fen(fen_str: str) -> FenSnapshot:
+    fields = fen_str.split()
+    board_rep, turn, castling_status, en_passant = fields[:4]
+
+    board_symbols = board_rep.replace("/", "").translate(_EXPAND_EMPTY_SQUARES)
+    if len(board_symbols) != ROWS * COLUMNS:
+        raise ValueError(f"Invalid FEN board: {board_rep}")
+    try:
+        mailbox = tuple(_SYMBOL_TO_PIECE[symbol] for symbol in board_symbols)
+    except KeyError as error:
+        raise ValueError(f"Invalid FEN piece: {error.args[0]}") from None
+    pieces = [0] * len(PIECE_SYMBOLS)
+    for square, piece in enumerate(mailbox):
+        if piece != EMPTY:
+            pieces[piece] |= 1 << square
+
+    castling_rights = 0
+    for index, symbol in enumerate(CASTLING_SYMBOLS):
+        if symbol in castling_status:
+            castling_rights |= 1 << index
+
+    counters = [int(field) if field.isdigit() else None for field in fields[4:6]]
+    counters += [None] * (2 - len(counters))
+    return FenSnapshot(
+        mailbox=mailbox,
+        pieces=tuple(pieces),
+        is_whites_turn=turn == "w",
+        castling_rights=castling_rights,
+        en_passant=parse_square_name(en_passant) if en_passant != "-" else EMPTY,
+        half_move=0 if counters[0] is None else counters[0],
+        full_move=1 if counters[1] is None else counters[1],
+    )
+
+
+def get_fen(
+    board_symbols: str,
+    is_whites_turn: bool,
+    castling_rights: int,
+    en_passant: int,
+    half_move: int,
+    full_move: int,
+) -> str:
+    """
+    :param board_symbols: One symbol per square from a8 to h1, "1" for an empty square
+    :param is_whites_turn: Side to move
+    :param castling_rights: Castling rights bit mask
+    :param en_passant: En passant square index, EMPTY if there is none
+    :param half_move: Half-move clock
+    :param full_move: Full-move number
+    """
+    board_rep = "/".join([board_symbols[index:index + COLUMNS] for index in _ROW_STARTS])
+    for empty_run, count in _EMPTY_RUNS:
+        board_rep = board_rep.replace(empty_run, count)
+    return (
+        f"{board_rep} {'w' if is_whites_turn else 'b'} {_CASTLING_STATUS[castling_rights]} "
+        f"{square_name(en_passant) if en_passant != EMPTY else '-'} {half_move} {full_move}"
+    )
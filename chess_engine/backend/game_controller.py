@@ -4,6 +4,7 @@ from typing import List
 from chess_engine.backend.square import Square
 from chess_engine.backend.pieces import Piece
 from chess_engine.backend.board import BoardState
+from chess_engine.backend.move import move_to_squares
 
 
 class GameController:
@@ -38,11 +39,11 @@ class GameController:
         while not dst_square:
             while not src_square:
                 src_square = self.get_src_square()
-            valid_squares = self.board_obj.get_piece_moves(src_square)
-            valid_squares = [
-                square if not isinstance(square, list) else square[0]
-                for square in valid_squares
-            ]
+            valid_squares = []
+            for move in self.board_obj.get_piece_moves(src_square):
+                _, valid_square, _ = move_to_squares(board=self.board_obj, move=move)
+                if valid_square not in valid_squares:
+                    valid_squares.append(valid_square)
             self.display_possible_moves(valid_squares)
 
             dst_square = self.get_dst_square(valid_squares)
@@ -61,7 +62,7 @@ class GameController:
 
     def ai_move(self) -> None:
         move = self.ai_obj.get_optimal_move(board=self.board_obj)
-        src_square, dst_square, promotion_piece = move
+        src_square, dst_square, promotion_piece = move_to_squares(board=self.board_obj, move=move)
         self.update_game_state(
             src_square=src_square,
             dst_square=dst_square,
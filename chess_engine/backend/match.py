@@ -0,0 +1,605 @@
+"""
+Self-play matches between two engines, games are played in parallel across processes with a
+running Elo estimate and sequential probability ratio test
+
+Usage: python -m chess_engine.backend.match --engine1 SPEC --engine2 SPEC [--openings FILE]
+[--games 100] [--movetime MS | --nodes N | --depth D] [--processes N] [--sprt ELO0 ELO1]
+"""
+import argparse
+import json
+import math
+import os
+import shlex
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Tuple
+
+import chess
+import chess.pgn
+from loguru import logger
+
+from chess_engine.backend import bitbase
+from chess_engine.backend.ai import AI, MATE_VALUE, SearchInfo, SearchLimits, SelectiveSearch
+from chess_engine.backend.analysis import parse_position
+from chess_engine.backend.fen import parse_fen
+from chess_engine.backend.move import NO_MOVE, move_to_uci, uci_to_move
+from chess_engine.backend.move_picker import MAX_PLY
+from chess_engine.backend.perft import START_FEN, create_board
+
+# Games submitted to the pool per worker process before waiting for a result
+IN_FLIGHT_PER_PROCESS = 2
+# Two-sided 95% interval of the Elo estimate
+CONFIDENCE_Z = 1.96
+
+# Players of a worker process by engine name, kept across the games the worker plays
+_worker_players: Dict[str, "Player"] = {}
+_worker_limits: Optional[SearchLimits] = None
+_worker_adjudication: Optional["Adjudication"] = None
+
+
+class EngineSpec(NamedTuple):
+    """
+    :param options: Parameters of an AI searching in the worker process
+    :param command: Command of a UCI engine run as a subprocess, such as the UCI front-end of
+    another checkout. Used instead of options when given
+    """
+
+    name: str
+    options: Optional[dict] = None
+    command: Optional[List[str]] = None
+
+
+class Adjudication(NamedTuple):
+    """
+    Scores are in centipawns from the engine that reported them
+    :param max_plies: Games this long are drawn
+    :param resign_score: An engine loses after resign_moves moves in a row scored this far below 0
+    :param draw_score: The game is drawn after draw_moves moves of each engine scored within this
+    of 0, from draw_min_ply
+    :param bitbases: Games reaching a position in the endgame bitbases end with its result
+    """
+
+    max_plies: int = 400
+    resign_score: int = 1000
+    resign_moves: int = 3
+    draw_score: int = 10
+    draw_moves: int = 8
+    draw_min_ply: int = 80
+    bitbases: bool = True
+
+
+class GameResult(NamedTuple):
+    """
+    :param result: "1-0", "0-1" or "1/2-1/2"
+    :param reason: Termination of the game, rule or adjudication
+    :param moves: Moves in UCI notation from the opening
+    """
+
+    index: int
+    opening: str
+    white: str
+    black: str
+    result: str
+    reason: str
+    moves: List[str]
+
+    def get_score(self, name: str) -> float:
+        """
+        :return: Points of the engine from the game
+        """
+        if self.result == "1/2-1/2":
+            return 0.5
+        return float((self.result == "1-0") == (self.white == name))
+
+
+class SPRT(NamedTuple):
+    """
+    Tests H0: the Elo difference is elo0 against H1: it is elo1
+    :param alpha: False positive rate, accepting H1 when H0 holds
+    :param beta: False negative rate
+    """
+
+    elo0: float = 0.0
+    elo1: float = 5.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    def get_bounds(self) -> Tuple[float, float]:
+        return math.log(self.beta / (1 - self.alpha)), math.log((1 - self.beta) / self.alpha)
+
+    def get_verdict(self, llr: float) -> Optional[str]:
+        """
+        :return: The accepted hypothesis, None while the test goes on
+        """
+        lower, upper = self.get_bounds()
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        return None
+
+
+def get_expected_score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def get_elo(score: float) -> float:
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+class MatchStats:
+    def __init__(self):
+        """
+        Wins, draws and losses of the first engine
+        """
+        self.wins: int = 0
+        self.draws: int = 0
+        self.losses: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def add(self, score: float) -> None:
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def get_score(self) -> float:
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    def get_variance(self) -> float:
+        """
+        Variance of the points of one game
+        """
+        if not self.games:
+            return 0.0
+        score = self.get_score()
+        return (
+            self.wins * (1 - score) ** 2
+            + self.draws * (0.5 - score) ** 2
+            + self.losses * score ** 2
+        ) / self.games
+
+    def get_elo(self) -> Tuple[float, float]:
+        """
+        :return: Elo difference and the half width of its 95% interval
+        """
+        if not self.games:
+            return 0.0, math.inf
+        score = self.get_score()
+        margin = CONFIDENCE_Z * math.sqrt(self.get_variance() / self.games)
+        lower, upper = get_elo(score - margin), get_elo(score + margin)
+        return get_elo(score), (upper - lower) / 2
+
+    def get_llr(self, sprt: SPRT) -> float:
+        """
+        Log-likelihood ratio of H1 to H0, approximated from the mean and variance of the points
+        per game
+        """
+        variance = self.get_variance()
+        if not variance:
+            return 0.0
+        score0, score1 = get_expected_score(sprt.elo0), get_expected_score(sprt.elo1)
+        return (
+            (score1 - score0) * (2 * self.get_score() - score0 - score1) * self.games
+            / (2 * variance)
+        )
+
+
+class Player(Protocol):
+    def new_game(self) -> None:
+        ...
+
+    def get_move(self, board: chess.Board, limits: SearchLimits) -> Tuple[Optional[str], int]:
+        """
+        :return: Move in UCI notation, None if there is none, and its score from the engine
+        """
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class AIPlayer:
+    def __init__(self, options: dict):
+        """
+        :param options: AI parameters, selective_search may be a bool or the fields of
+        SelectiveSearch as a list
+        """
+        options = dict(options)
+        selective_search = options.get("selective_search")
+        if isinstance(selective_search, bool):
+            options["selective_search"] = SelectiveSearch() if selective_search else None
+        elif isinstance(selective_search, list):
+            options["selective_search"] = SelectiveSearch(*selective_search)
+        self.ai = AI(**options)
+
+    def new_game(self) -> None:
+        self.ai.clear()
+
+    def get_search_board(self, board: chess.Board):
+        """
+        The moves since the last capture or pawn move are made on the board searched, so that the
+        search sees the repetitions of the game
+        """
+        history = board.copy()
+        moves = [history.pop() for _ in range(min(board.halfmove_clock, len(board.move_stack)))]
+        search_board = create_board(fen_repr=history.fen(), backend=self.ai.backend)
+        for move in reversed(moves):
+            search_board.make_move(
+                move=uci_to_move(uci=move.uci(), moves=search_board.get_all_possible_moves())
+            )
+        return search_board
+
+    def get_move(self, board: chess.Board, limits: SearchLimits) -> Tuple[Optional[str], int]:
+        infos: List[SearchInfo] = []
+        move = self.ai.get_optimal_move(
+            board=self.get_search_board(board=board), limits=limits, callback=infos.append
+        )
+        return (move_to_uci(move) if move != NO_MOVE else None), (infos[-1].value if infos else 0)
+
+    def close(self) -> None:
+        pass
+
+
+class UCIPlayer:
+    def __init__(self, command: List[str]):
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1
+        )
+        self.send("uci")
+        self.read_until("uciok")
+
+    def send(self, line: str) -> None:
+        self.process.stdin.write(line + "\n")
+        self.process.stdin.flush()
+
+    def read_until(self, prefix: str) -> List[str]:
+        """
+        :return: Lines read up to the line starting with prefix
+        """
+        lines = []
+        for line in self.process.stdout:
+            lines.append(line.strip())
+            if line.startswith(prefix):
+                return lines
+        raise RuntimeError(f"Engine exited before sending {prefix}")
+
+    def new_game(self) -> None:
+        self.send("ucinewgame")
+        self.send("isready")
+        self.read_until("readyok")
+
+    def get_move(self, board: chess.Board, limits: SearchLimits) -> Tuple[Optional[str], int]:
+        position = f"position fen {board.root().fen()}"
+        if board.move_stack:
+            position += " moves " + " ".join(move.uci() for move in board.move_stack)
+        self.send(position)
+        go = "go"
+        if limits.time is not None:
+            go += f" movetime {int(limits.time * 1000)}"
+        if limits.nodes is not None:
+            go += f" nodes {limits.nodes}"
+        if limits.depth < MAX_PLY or go == "go":
+            go += f" depth {limits.depth}"
+        self.send(go)
+
+        lines = self.read_until("bestmove")
+        score = 0
+        for line in lines:
+            tokens = line.split()
+            if tokens[0] == "info" and "score" in tokens:
+                kind, value = tokens[tokens.index("score") + 1:tokens.index("score") + 3]
+                if kind == "cp":
+                    score = int(value)
+                elif kind == "mate":
+                    score = MATE_VALUE if int(value) > 0 else -MATE_VALUE
+        move = lines[-1].split()[1]
+        return (move if move != "0000" else None), score
+
+    def close(self) -> None:
+        try:
+            self.send("quit")
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+def create_player(spec: EngineSpec) -> Player:
+    return UCIPlayer(command=spec.command) if spec.command else AIPlayer(options=spec.options or {})
+
+
+def get_bitbase_result(board: chess.Board) -> Optional[str]:
+    if chess.popcount(board.occupied) > bitbase.MAX_PIECES:
+        return None
+    result = bitbase.probe(parse_fen(board.fen()))
+    if result is None:
+        return None
+    if result == bitbase.DRAW:
+        return "1/2-1/2"
+    return "1-0" if (result == bitbase.WIN) == board.turn else "0-1"
+
+
+def play_game(
+        players: Dict[bool, Tuple[str, Player]],
+        opening: str,
+        limits: SearchLimits,
+        adjudication: Adjudication = Adjudication(),
+        index: int = 0,
+) -> GameResult:
+    """
+    The rules are applied by the chess package, independently of the engines
+    :param players: Name and player of white and black, keyed by chess.WHITE and chess.BLACK
+    :param opening: FEN of the first position
+    """
+    board = chess.Board(opening)
+    for _, player in players.values():
+        player.new_game()
+    scores: Dict[bool, List[int]] = {chess.WHITE: [], chess.BLACK: []}
+    loss = {chess.WHITE: "0-1", chess.BLACK: "1-0"}
+
+    def finish(result: str, reason: str) -> GameResult:
+        return GameResult(
+            index=index,
+            opening=opening,
+            white=players[chess.WHITE][0],
+            black=players[chess.BLACK][0],
+            result=result,
+            reason=reason,
+            moves=[move.uci() for move in board.move_stack],
+        )
+
+    while True:
+        outcome = board.outcome(claim_draw=True)
+        if outcome is not None:
+            return finish(outcome.result(), outcome.termination.name.lower())
+        if adjudication.bitbases:
+            result = get_bitbase_result(board)
+            if result is not None:
+                return finish(result, "bitbase")
+        if len(board.move_stack) >= adjudication.max_plies:
+            return finish("1/2-1/2", "max_plies")
+
+        turn = board.turn
+        uci, score = players[turn][1].get_move(board=board, limits=limits)
+        move = chess.Move.from_uci(uci) if uci else None
+        if move is None or move not in board.legal_moves:
+            return finish(loss[turn], "illegal_move")
+        scores[turn].append(score)
+
+        resign_scores = scores[turn][-adjudication.resign_moves:]
+        if len(resign_scores) == adjudication.resign_moves and all(
+            value <= -adjudication.resign_score for value in resign_scores
+        ):
+            return finish(loss[turn], "resign")
+        draw_scores = [
+            value
+            for colour_scores in scores.values()
+            for value in colour_scores[-adjudication.draw_moves:]
+        ]
+        if (
+            len(board.move_stack) >= adjudication.draw_min_ply
+            and len(draw_scores) == 2 * adjudication.draw_moves
+            and all(abs(value) <= adjudication.draw_score for value in draw_scores)
+        ):
+            return finish("1/2-1/2", "draw_scores")
+        board.push(move)
+
+
+class GameTask(NamedTuple):
+    """
+    :param first_is_white: Whether the first engine plays white, colours alternate for every
+    opening
+    """
+
+    index: int
+    opening: str
+    first_is_white: bool
+
+
+def get_game_tasks(openings: List[str], games: int) -> Iterator[GameTask]:
+    """
+    Every opening is played twice, once with each engine as white
+    """
+    for index in range(games):
+        yield GameTask(
+            index=index,
+            opening=openings[index // 2 % len(openings)],
+            first_is_white=index % 2 == 0,
+        )
+
+
+def _initialise_worker(
+        specs: Tuple[EngineSpec, EngineSpec], limits: SearchLimits, adjudication: Adjudication
+) -> None:
+    global _worker_players, _worker_limits, _worker_adjudication
+    for player in _worker_players.values():
+        player.close()
+    _worker_players = {spec.name: create_player(spec) for spec in specs}
+    _worker_limits = limits
+    _worker_adjudication = adjudication
+
+
+def _play(task: Tuple[GameTask, str, str]) -> GameResult:
+    """
+    :param task: Game and the names of the first and second engine
+    """
+    game, first, second = task
+    white, black = (first, second) if game.first_is_white else (second, first)
+    return play_game(
+        players={
+            chess.WHITE: (white, _worker_players[white]),
+            chess.BLACK: (black, _worker_players[black]),
+        },
+        opening=game.opening,
+        limits=_worker_limits,
+        adjudication=_worker_adjudication,
+        index=game.index,
+    )
+
+
+def run_match(
+        specs: Tuple[EngineSpec, EngineSpec],
+        tasks: Iterable[GameTask],
+        limits: SearchLimits,
+        adjudication: Adjudication = Adjudication(),
+        processes: int = 1,
+) -> Iterator[GameResult]:
+    """
+    Games are yielded as they finish, closing the iterator cancels the games not yet started
+    :param specs: First and second engine, with distinct names
+    :param processes: Worker processes, each with its own pair of engines. One plays the games
+    in this process
+    """
+    first, second = specs[0].name, specs[1].name
+    if processes <= 1:
+        _initialise_worker(specs=specs, limits=limits, adjudication=adjudication)
+        try:
+            for task in tasks:
+                yield _play((task, first, second))
+        finally:
+            for player in _worker_players.values():
+                player.close()
+        return
+
+    max_in_flight = IN_FLIGHT_PER_PROCESS * processes
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_initialise_worker,
+        initargs=(specs, limits, adjudication),
+    ) as executor:
+        pending = set()
+        try:
+            for task in tasks:
+                pending.add(executor.submit(_play, (task, first, second)))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def parse_engine(name: str, spec: str) -> EngineSpec:
+    """
+    :param spec: JSON object of AI parameters, or the command of a UCI engine
+    """
+    if spec.lstrip().startswith("{"):
+        return EngineSpec(name=name, options=json.loads(spec))
+    return EngineSpec(name=name, command=shlex.split(spec))
+
+
+def read_openings(path: Optional[str]) -> List[str]:
+    if path is None:
+        return [START_FEN]
+    with open(path) as file:
+        positions = [parse_position(line) for line in file]
+    return [position[0] for position in positions if position is not None]
+
+
+def get_pgn_game(result: GameResult) -> chess.pgn.Game:
+    board = chess.Board(result.opening)
+    for uci in result.moves:
+        board.push_uci(uci)
+    game = chess.pgn.Game.from_board(board)
+    game.headers.update(
+        Round=str(result.index + 1),
+        White=result.white,
+        Black=result.black,
+        Result=result.result,
+        Termination=result.reason,
+    )
+    return game
+
+
+def format_stats(stats: MatchStats, sprt: Optional[SPRT]) -> str:
+    elo, margin = stats.get_elo()
+    line = (
+        f"W {stats.wins} D {stats.draws} L {stats.losses} "
+        f"score {stats.get_score():.3f} Elo {elo:.1f} +/- {margin:.1f}"
+    )
+    if sprt is not None:
+        lower, upper = sprt.get_bounds()
+        line += f" LLR {stats.get_llr(sprt):.2f} ({lower:.2f}, {upper:.2f})"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--engine1", default="{}", help="JSON of AI parameters, or a UCI engine command"
+    )
+    parser.add_argument("--engine2", default="{}")
+    parser.add_argument("--openings", help="EPD or FEN file, the start position by default")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--movetime", type=int, help="Milliseconds per move")
+    parser.add_argument("--nodes", type=int)
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--max-plies", type=int, default=Adjudication().max_plies)
+    parser.add_argument("--resign-score", type=int, default=Adjudication().resign_score)
+    parser.add_argument("--draw-score", type=int, default=Adjudication().draw_score)
+    parser.add_argument(
+        "--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"), help="Stop once SPRT decides"
+    )
+    parser.add_argument("--pgn", help="File the games are written to")
+    args = parser.parse_args()
+    logger.remove()
+
+    if args.movetime is None and args.nodes is None:
+        limits = SearchLimits(depth=args.depth or SearchLimits().depth)
+    else:
+        limits = SearchLimits(
+            depth=args.depth or MAX_PLY,
+            time=args.movetime / 1000 if args.movetime is not None else None,
+            nodes=args.nodes,
+        )
+    specs = (parse_engine("engine1", args.engine1), parse_engine("engine2", args.engine2))
+    adjudication = Adjudication(
+        max_plies=args.max_plies, resign_score=args.resign_score, draw_score=args.draw_score
+    )
+    sprt = SPRT(elo0=args.sprt[0], elo1=args.sprt[1]) if args.sprt else None
+
+    stats = MatchStats()
+    pgn = open(args.pgn, "w") if args.pgn else None
+    results = run_match(
+        specs=specs,
+        tasks=get_game_tasks(openings=read_openings(args.openings), games=args.games),
+        limits=limits,
+        adjudication=adjudication,
+        processes=args.processes,
+    )
+    try:
+        for result in results:
+            stats.add(result.get_score(specs[0].name))
+            print(
+                f"Game {result.index + 1} {result.white} vs {result.black}: {result.result} "
+                f"({result.reason}) | {format_stats(stats, sprt)}",
+                flush=True,
+            )
+            if pgn is not None:
+                print(get_pgn_game(result), file=pgn, end="\n\n", flush=True)
+            verdict = sprt.get_verdict(stats.get_llr(sprt)) if sprt is not None else None
+            if verdict is not None:
+                print(f"SPRT accepts {verdict}")
+                break
+    finally:
+        results.close()
+        if pgn is not None:
+            pgn.close()
+    print(f"{specs[0].name} vs {specs[1].name}: {format_stats(stats, sprt)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from typing import Iterable, Optional, Tuple
+
+from chess_engine.backend.pieces import Bishop, Knight, Piece, Queen, Rook
+from chess_engine.backend.square import Square
+
+ROWS: int = 8
+COLUMNS: int = 8
+COLUMN_SYMBOLS: str = "abcdefgh"
+
+# Move layout: bits 0-5 source square, bits 6-11 destination square, bits 12-15 flag.
+# Squares are row * COLUMNS + column with a8 = 0, as on both board backends
+QUIET, DOUBLE_PAWN_PUSH, KING_CASTLE, QUEEN_CASTLE, CAPTURE, EN_PASSANT = range(6)
+PROMOTION, PROMOTION_CAPTURE = 8, 12
+NO_MOVE: int = 0
+
+# Indexed by the low two bits of a promotion flag
+PROMOTION_PIECES: Tuple = (Knight, Bishop, Rook, Queen)
+PROMOTION_SYMBOLS: str = "nbrq"
+
+
+def square_index(row: int, column: int) -> int:
+    return row * COLUMNS + column
+
+
+def square_name(square: int) -> str:
+    row, column = divmod(square, COLUMNS)
+    return f"{COLUMN_SYMBOLS[column]}{ROWS - row}"
+
+
+def parse_square_name(name: str) -> int:
+    return square_index(row=ROWS - int(name[1]), column=COLUMN_SYMBOLS.index(name[0]))
+
+
+def encode_move(src: int, dst: int, flag: int = QUIET) -> int:
+    return src | dst << 6 | flag << 12
+
+
+def get_src(move: int) -> int:
+    return move & 63
+
+
+def get_dst(move: int) -> int:
+    return move >> 6 & 63
+
+
+def get_flag(move: int) -> int:
+    return move >> 12
+
+
+def is_capture(move: int) -> bool:
+    return bool(move >> 12 & CAPTURE)
+
+
+def is_promotion(move: int) -> bool:
+    return bool(move >> 12 & PROMOTION)
+
+
+def is_tactical(move: int) -> bool:
+    """
+    Captures, en passant and promotions, the moves generated before the quiet ones
+    """
+    return bool(move >> 14)
+
+
+def get_promotion_flag(piece_type: Piece) -> int:
+    return PROMOTION + PROMOTION_PIECES.index(piece_type)
+
+
+def get_promotion_piece(move: int) -> Optional[Piece]:
+    if not move >> 12 & PROMOTION:
+        return None
+    return PROMOTION_PIECES[move >> 12 & 3]
+
+
+def move_to_uci(move: int) -> str:
+    uci = f"{square_name(move & 63)}{square_name(move >> 6 & 63)}"
+    if move >> 12 & PROMOTION:
+        uci += PROMOTION_SYMBOLS[move >> 12 & 3]
+    return uci
+
+
+def find_move(
+    moves: Iterable[int], src: int, dst: int, promotion_piece: Piece = None
+) -> Optional[int]:
+    """
+    Flags can only be derived from the position, so squares are matched against its moves
+    :param moves: Legal moves of the position
+    :param src: Source square index
+    :param dst: Destination square index
+    :param promotion_piece: Piece class a pawn is promoted to, defaults to Queen
+    """
+    for move in moves:
+        if move & 63 != src or move >> 6 & 63 != dst:
+            continue
+        if move >> 12 & PROMOTION and PROMOTION_PIECES[move >> 12 & 3] != (promotion_piece or Queen):
+            continue
+        return move
+    return None
+
+
+def uci_to_move(uci: str, moves: Iterable[int]) -> Optional[int]:
+    promotion_piece = None
+    if len(uci) == 5:
+        promotion_piece = PROMOTION_PIECES[PROMOTION_SYMBOLS.index(uci[4])]
+    return find_move(
+        moves=moves,
+        src=parse_square_name(uci[:2]),
+        dst=parse_square_name(uci[2:4]),
+        promotion_piece=promotion_piece,
+    )
+
+
+def move_to_squares(board, move: int) -> Tuple[Square, Square, Optional[Piece]]:
+    """
+    :param board: Board the squares are taken from
+    :param move: Encoded move
+    :return: Source square, destination square and promotion piece class
+    """
+    src_square = board.get_square(*divmod(move & 63, COLUMNS))
+    dst_square = board.get_square(*divmod(move >> 6 & 63, COLUMNS))
+    return src_square, dst_square, get_promotion_piece(move)
+
+
+def squares_to_move(
+    moves: Iterable[int], src_square: Square, dst_square: Square, promotion_piece: Piece = None
+) -> Optional[int]:
+    return find_move(
+        moves=moves,
+        src=square_index(row=src_square.row, column=src_square.column),
+        dst=square_index(row=dst_square.row, column=dst_square.column),
+        promotion_piece=promotion_piece,
+    )
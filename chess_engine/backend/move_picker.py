@@ -0,0 +1,132 @@
+from typing import Iterator, List, Optional, Sequence
+
+from chess_engine.backend.move import EN_PASSANT, NO_MOVE, PROMOTION, PROMOTION_PIECES, is_tactical
+from chess_engine.backend.pieces import Pawn
+
+MAX_PLY: int = 64
+KILLER_SLOTS: int = 2
+# One butterfly board per side, indexed by the source and destination squares of a move
+HISTORY_SIZE: int = 2 * 64 * 64
+
+
+def get_material_gain(board, move: int) -> int:
+    """
+    Material won by a capture or promotion, before any recapture
+    """
+    flag = move >> 12
+    gain = Pawn.value if flag == EN_PASSANT else board.get_piece_value(move >> 6 & 63)
+    if flag & PROMOTION:
+        gain += PROMOTION_PIECES[flag & 3].value - Pawn.value
+    return gain
+
+
+def get_mvv_lva_score(board, move: int) -> int:
+    """
+    Most valuable victim first, least valuable attacker among equal victims. Promotions count the
+    promoted piece as an extra victim
+    """
+    return 10 * get_material_gain(board, move) - board.get_piece_value(move & 63)
+
+
+def get_ordered_captures(board) -> List[int]:
+    captures = board.generate_captures()
+    captures.sort(key=lambda capture: get_mvv_lva_score(board, capture), reverse=True)
+    return captures
+
+
+def get_history_index(is_whites_turn: bool, move: int) -> int:
+    return (0 if is_whites_turn else 4096) + (move & 4095)
+
+
+class MoveOrdering:
+    """
+    Killer moves per ply and butterfly history scores, both learnt from quiet moves that caused a
+    cutoff
+    """
+
+    def __init__(self):
+        self.killers: List[List[int]] = [[NO_MOVE] * KILLER_SLOTS for _ in range(MAX_PLY)]
+        self.history: List[int] = [0] * HISTORY_SIZE
+
+    def new_search(self) -> None:
+        """
+        Killers are only related by ply within one search, history scores of older searches decay
+        """
+        self.killers = [[NO_MOVE] * KILLER_SLOTS for _ in range(MAX_PLY)]
+        self.history = [score >> 1 for score in self.history]
+
+    def get_killers(self, ply: int) -> Sequence[int]:
+        return self.killers[ply] if ply < MAX_PLY else ()
+
+    def add_cutoff(self, board, move: int, ply: int, depth: int) -> None:
+        """
+        :param board: Position the move was made from
+        :param move: Move that caused the cutoff
+        :param ply: Distance from the root
+        :param depth: Remaining depth, deeper cutoffs weigh more
+        """
+        if is_tactical(move):
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1:] = killers[:-1]
+                killers[0] = move
+        self.history[get_history_index(board.is_whites_turn, move)] += depth * depth
+
+
+class MovePicker:
+    """
+    Yields the legal moves of a position in stages: hash move, captures, killer moves and quiet
+    moves. A stage is only generated once the previous ones are exhausted, so a cutoff on an
+    early move skips the rest of the move generation
+    """
+
+    def __init__(
+        self,
+        board,
+        hash_move: int = NO_MOVE,
+        killers: Sequence[int] = (),
+        history: Optional[List[int]] = None,
+    ):
+        """
+        :param board: Position to pick moves from, it must be unchanged whenever a move is requested
+        :param hash_move: Best move stored in the transposition table, checked for legality first
+        :param killers: Quiet moves that caused a cutoff at the same ply, checked for legality first
+        :param history: Butterfly history scores the quiet moves are sorted by
+        """
+        self.board = board
+        self.hash_move = hash_move
+        self.killers = killers
+        self.history = history
+
+    def __iter__(self) -> Iterator[int]:
+        board = self.board
+        hash_move = self.hash_move
+        if hash_move != NO_MOVE and board.is_legal(move=hash_move):
+            yield hash_move
+
+        for move in get_ordered_captures(board):
+            if move != hash_move:
+                yield move
+
+        killers = []
+        for killer in self.killers:
+            if (
+                killer != NO_MOVE
+                and killer != hash_move
+                and killer not in killers
+                and not is_tactical(killer)
+                and board.is_legal(move=killer)
+            ):
+                killers.append(killer)
+                yield killer
+
+        quiets = board.generate_quiets()
+        if self.history is not None:
+            history = self.history
+            offset = get_history_index(board.is_whites_turn, NO_MOVE)
+            quiets.sort(key=lambda quiet: history[offset + (quiet & 4095)], reverse=True)
+        for move in quiets:
+            if move != hash_move and move not in killers:
+                yield move
@@ -0,0 +1,165 @@
+"""
+Polyglot opening book, probed from a memory-mapped file
+"""
+import mmap
+import random
+import struct
+from typing import List, NamedTuple, Optional
+
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY
+
+from chess_engine.backend.fen import EMPTY, FenSnapshot, parse_fen
+from chess_engine.backend.move import COLUMNS, NO_MOVE, PROMOTION_PIECES, ROWS, find_move
+
+# Big-endian key, move, weight and learn value, entries are sorted by key
+ENTRY_STRUCT = struct.Struct(">QHHI")
+ENTRY_SIZE: int = ENTRY_STRUCT.size
+BOOK_DEPTH: int = 16
+BOOK_SELECTIONS = ("weighted", "best")
+
+_CASTLING_OFFSET = 768
+_EN_PASSANT_OFFSET = 772
+_TURN_OFFSET = 780
+_KING = 5
+
+
+class BookEntry(NamedTuple):
+    key: int
+    move: int
+    weight: int
+    learn: int
+
+
+def get_polyglot_key(snapshot: FenSnapshot) -> int:
+    """
+    Polyglot keys hash the same position features as the zobrist keys of the board backends, but
+    with the random numbers and numbering of the Polyglot format
+    """
+    key = 0
+    for square, piece in enumerate(snapshot.mailbox):
+        if piece == EMPTY:
+            continue
+        # Black pawn first, then the white pawn and so on, squares counted from a1
+        kind = 2 * (piece % 6) + (piece < 6)
+        row, column = divmod(square, COLUMNS)
+        key ^= POLYGLOT_RANDOM_ARRAY[64 * kind + 8 * (ROWS - 1 - row) + column]
+    for index in range(4):
+        if snapshot.castling_rights >> index & 1:
+            key ^= POLYGLOT_RANDOM_ARRAY[_CASTLING_OFFSET + index]
+    if snapshot.en_passant != EMPTY:
+        # Only hashed when a pawn of the side to move stands next to the pawn that passed
+        row, column = divmod(snapshot.en_passant, COLUMNS)
+        pawn_row, pawn = (row + 1, 0) if snapshot.is_whites_turn else (row - 1, 6)
+        pawn_squares = [
+            pawn_row * COLUMNS + pawn_column
+            for pawn_column in (column - 1, column + 1)
+            if 0 <= pawn_column < COLUMNS
+        ]
+        if any(snapshot.mailbox[square] == pawn for square in pawn_squares):
+            key ^= POLYGLOT_RANDOM_ARRAY[_EN_PASSANT_OFFSET + column]
+    if snapshot.is_whites_turn:
+        key ^= POLYGLOT_RANDOM_ARRAY[_TURN_OFFSET]
+    return key
+
+
+class OpeningBook:
+    def __init__(
+        self,
+        path: str,
+        selection: str = "weighted",
+        max_ply: int = BOOK_DEPTH,
+        seed: Optional[int] = None,
+    ):
+        """
+        The file is mapped, not read, entries are only paged in when the binary search reaches them
+        :param path: Polyglot .bin file
+        :param selection: "weighted" picks a move with a probability proportional to its weight,
+        "best" the move with the highest weight
+        :param max_ply: Positions after this many plies of the game are not looked up
+        :param seed: Seed of the weighted selection
+        """
+        if selection not in BOOK_SELECTIONS:
+            raise ValueError(f"Invalid book selection: {selection}")
+        self.selection = selection
+        self.max_ply = max_ply
+        self._random = random.Random(seed)
+        self._file = open(path, "rb")
+        size = self._file.seek(0, 2)
+        self.entry_count = size // ENTRY_SIZE
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_entry(self, index: int) -> BookEntry:
+        return BookEntry(*ENTRY_STRUCT.unpack_from(self._mmap, index * ENTRY_SIZE))
+
+    def get_entries(self, key: int) -> List[BookEntry]:
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if ENTRY_STRUCT.unpack_from(self._mmap, middle * ENTRY_SIZE)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        for index in range(low, self.entry_count):
+            entry = self.get_entry(index)
+            if entry.key != key:
+                break
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def get_board_move(snapshot: FenSnapshot, moves: List[int], book_move: int) -> Optional[int]:
+        """
+        :param moves: Legal moves of the position
+        :param book_move: Polyglot move, castling is encoded as the king capturing its rook
+        :return: Legal move of the board backends, None if the book move is illegal
+        """
+        row = ROWS - 1 - (book_move >> 9 & 7)
+        src = row * COLUMNS + (book_move >> 6 & 7)
+        dst_column = book_move & 7
+        dst = (ROWS - 1 - (book_move >> 3 & 7)) * COLUMNS + dst_column
+        if snapshot.mailbox[src] % 6 == _KING and abs(dst_column - src % COLUMNS) > 1:
+            dst = row * COLUMNS + (6 if dst_column > src % COLUMNS else 2)
+        promotion = book_move >> 12 & 7
+        return find_move(
+            moves=moves,
+            src=src,
+            dst=dst,
+            promotion_piece=PROMOTION_PIECES[promotion - 1] if promotion else None,
+        )
+
+    def get_move(self, board) -> int:
+        """
+        :param board: Position to look up, of either board backend
+        :return: Legal book move, NO_MOVE when the position is not in the book or too deep
+        """
+        if self._mmap is None:
+            return NO_MOVE
+        snapshot = parse_fen(board.get_fen())
+        ply = 2 * (snapshot.full_move - 1) + (not snapshot.is_whites_turn)
+        if ply >= self.max_ply:
+            return NO_MOVE
+
+        moves = board.get_all_possible_moves()
+        candidates, weights = [], []
+        for entry in self.get_entries(key=get_polyglot_key(snapshot)):
+            move = self.get_board_move(snapshot=snapshot, moves=moves, book_move=entry.move)
+            if move is not None:
+                candidates.append(move)
+                weights.append(entry.weight)
+        if not candidates:
+            return NO_MOVE
+        if self.selection == "best" or not any(weights):
+            return candidates[weights.index(max(weights))]
+        return self._random.choices(candidates, weights=weights)[0]
@@ -0,0 +1,276 @@
+"""
+Root splitting search across a process pool
+"""
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, List, Optional, Set, Tuple
+
+from chess_engine.backend.ai import (
+    AI,
+    INFINITE_VALUE,
+    LIMIT_CHECK_NODES,
+    Node,
+    SearchInfo,
+    SearchLimits,
+    SearchStats,
+    SelectiveSearch,
+    TRANSPOSITION_TABLE_MB,
+)
+from chess_engine.backend.board import Board
+from chess_engine.backend.move import NO_MOVE
+from chess_engine.backend.perft import create_board
+
+# Iterations below this depth are too short to be worth sending to the workers
+PARALLEL_MIN_DEPTH = 3
+# Seconds between limit checks of the main process while the workers search
+POLL_INTERVAL = 0.005
+
+# Searcher, stop event, best root value and node counter of a worker process, and the number of
+# the search its tables were last aged for
+_worker_ai: Optional["WorkerAI"] = None
+_worker_search = -1
+_worker_stop_event = None
+_worker_alpha = None
+_worker_nodes = None
+
+
+class WorkerAI(AI):
+    """
+    Searches root moves in a worker process, stopped by the main process through a shared event.
+    The nodes of a running search are added to a shared counter for the node limit
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.shared_nodes = 0
+
+    def check_limits(self) -> None:
+        with _worker_nodes.get_lock():
+            _worker_nodes.value += LIMIT_CHECK_NODES
+        self.shared_nodes += LIMIT_CHECK_NODES
+        if _worker_stop_event.is_set():
+            self.stopped = True
+
+
+def _initialise_worker(ai_kwargs: dict, stop_event, alpha, nodes) -> None:
+    global _worker_ai, _worker_stop_event, _worker_alpha, _worker_nodes
+    _worker_ai = WorkerAI(**ai_kwargs)
+    _worker_stop_event = stop_event
+    _worker_alpha = alpha
+    _worker_nodes = nodes
+
+
+def _search_root_move(task: Tuple[str, int, int, int]) -> Tuple[int, int, bool, List[int], int]:
+    """
+    Searches a root move with a null window on the best root value so far, and with an open
+    window above it when it beats it
+    :param task: Root position, move, depth and the number of the search of the main process
+    :return: Move, value, whether the value is exact, its principal variation and the node count
+    """
+    global _worker_search
+    fen_repr, move, depth, search = task
+    ai = _worker_ai
+    if search != _worker_search:
+        ai.new_search()
+        _worker_search = search
+    ai.stopped = False
+    ai.search_stats = SearchStats()
+    ai.shared_nodes = 0
+    board = create_board(fen_repr=fen_repr, backend=ai.backend)
+    ai.set_bitbase_probes(board=board)
+    board.make_move(move=move)
+    static_value = ai.get_node_value(board=board, is_maximising_player=True)
+
+    alpha = _worker_alpha.value
+    value = ai.alpha_beta(
+        board=board,
+        depth=depth - 1,
+        alpha=alpha,
+        beta=alpha + 1,
+        is_maximising_player=False,
+        ply=1,
+        value=static_value,
+    )
+    is_exact = False
+    if value > alpha and not ai.stopped:
+        alpha = _worker_alpha.value
+        if value > alpha:
+            value = ai.alpha_beta(
+                board=board,
+                depth=depth - 1,
+                alpha=alpha,
+                beta=INFINITE_VALUE,
+                is_maximising_player=False,
+                ply=1,
+                value=static_value,
+            )
+            is_exact = value > alpha and not ai.stopped
+    if is_exact:
+        with _worker_alpha.get_lock():
+            _worker_alpha.value = max(_worker_alpha.value, value)
+    pv = [move] + ai.pv_table.get_pv(ply=1) if is_exact else []
+    # The main process counts the nodes of a finished search itself
+    with _worker_nodes.get_lock():
+        _worker_nodes.value -= ai.shared_nodes
+    return move, value, is_exact, pv, ai.search_stats.nodes
+
+
+class ParallelAI(AI):
+    def __init__(
+            self,
+            processes: int = 2,
+            backend: str = "board",
+            transposition_table_mb: float = TRANSPOSITION_TABLE_MB,
+            move_ordering: bool = True,
+            quiescence: bool = True,
+            check_evasions: bool = True,
+            selective_search: Optional[SelectiveSearch] = None,
+            endgame_bitbases: bool = True,
+    ):
+        """
+        Splits the root moves of each iteration across worker processes. The first move is
+        searched by this process to set the bound the workers search the other moves against,
+        a worker that beats it raises the bound for the moves searched after
+        :param processes: Number of worker processes, each has its own transposition table and
+        move ordering tables
+        See AI for the other parameters
+        """
+        super().__init__(
+            backend=backend,
+            transposition_table_mb=transposition_table_mb,
+            move_ordering=move_ordering,
+            quiescence=quiescence,
+            check_evasions=check_evasions,
+            selective_search=selective_search,
+            endgame_bitbases=endgame_bitbases,
+        )
+        self.processes = processes
+        self._ai_kwargs = dict(
+            backend=backend,
+            transposition_table_mb=transposition_table_mb,
+            move_ordering=move_ordering,
+            quiescence=quiescence,
+            check_evasions=check_evasions,
+            selective_search=selective_search,
+            endgame_bitbases=endgame_bitbases,
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._search = 0
+        self._stop_event = multiprocessing.Event()
+        self._alpha = multiprocessing.Value("q", 0)
+        self._worker_nodes = multiprocessing.Value("q", 0)
+
+    def close(self) -> None:
+        """
+        Shuts the worker processes down, they are started again by the next search
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def stop(self) -> None:
+        super().stop()
+        self._stop_event.set()
+
+    def clear(self) -> None:
+        """
+        The workers are restarted with empty tables by the next search
+        """
+        super().clear()
+        self.close()
+
+    def resize_transposition_table(self, size_mb: float) -> None:
+        """
+        The workers are restarted with tables of the new size by the next search
+        """
+        super().resize_transposition_table(size_mb=size_mb)
+        self._ai_kwargs["transposition_table_mb"] = size_mb
+        self.close()
+
+    def get_optimal_move(
+            self,
+            board: Board,
+            limits: Optional[SearchLimits] = None,
+            callback: Optional[Callable[[SearchInfo], None]] = None,
+    ) -> int:
+        self._stop_event.clear()
+        self._worker_nodes.value = 0
+        self._search += 1
+        return super().get_optimal_move(board=board, limits=limits, callback=callback)
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_initialise_worker,
+                initargs=(self._ai_kwargs, self._stop_event, self._alpha, self._worker_nodes),
+            )
+        return self._executor
+
+    def check_shared_limits(self) -> None:
+        """
+        Stops the workers once the main process is stopped or the limits are reached with the
+        nodes of the running worker searches
+        """
+        if not self.stopped and self.limits.nodes is not None:
+            if self.search_stats.nodes + self._worker_nodes.value >= self.limits.nodes:
+                self.stopped = True
+        if not self.stopped:
+            self.check_limits()
+        if self.stopped:
+            self._stop_event.set()
+
+    def aspiration_search(
+            self, board: Board, depth: int, previous_value: int, trace: Optional[Node] = None
+    ) -> int:
+        """
+        Iterations from PARALLEL_MIN_DEPTH search the root moves in parallel with an open window,
+        the shallower ones and traced searches are searched by this process only
+        """
+        hash_move = self.principal_variation[0] if self.principal_variation else NO_MOVE
+        moves = list(self.get_ordered_moves(board=board, hash_move=hash_move, ply=0))
+        if self.processes <= 1 or depth < PARALLEL_MIN_DEPTH or trace is not None or len(moves) < 2:
+            return super().aspiration_search(
+                board=board, depth=depth, previous_value=previous_value, trace=trace
+            )
+
+        self.search_stats.nodes += 1
+        first_move = moves[0]
+        board.make_move(move=first_move)
+        best_value = self.alpha_beta(
+            board=board,
+            depth=depth - 1,
+            alpha=-INFINITE_VALUE,
+            beta=INFINITE_VALUE,
+            is_maximising_player=False,
+            ply=1,
+            value=self.get_node_value(board=board, is_maximising_player=True),
+        )
+        board.unmake_move()
+        if self.stopped:
+            return best_value
+        best_pv = [first_move] + self.pv_table.get_pv(ply=1)
+
+        self._alpha.value = best_value
+        fen_repr = board.get_fen()
+        executor = self.get_executor()
+        pending: Set[Future] = {
+            executor.submit(_search_root_move, (fen_repr, move, depth, self._search))
+            for move in moves[1:]
+        }
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                _, value, is_exact, pv, nodes = future.result()
+                self.search_stats.nodes += nodes
+                if is_exact and value > best_value:
+                    best_value, best_pv = value, pv
+            if not self.stopped:
+                self.check_shared_limits()
+                if self.stopped:
+                    for future in pending:
+                        future.cancel()
+        self.pv_table.set_pv(ply=0, moves=best_pv)
+        return best_value
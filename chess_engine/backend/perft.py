@@ -0,0 +1,131 @@
+"""
+Perft move generation counter
+
+Usage: python -m chess_engine.backend.perft --depth 5 [--fen FEN] [--divide] [--processes N]
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from chess_engine.backend.ai import BOARD_BACKENDS
+from chess_engine.backend.board import Board
+from chess_engine.backend.move import move_to_uci
+from chess_engine.backend.transposition_table import Bound, TranspositionTable
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Perft hash table of a worker process, shared by all root moves the worker counts
+_worker_hash_table: Optional[TranspositionTable] = None
+
+
+def create_board(fen_repr: str, backend: str = "bitboard") -> Board:
+    board = BOARD_BACKENDS[backend]()
+    board.fen_repr = fen_repr
+    board.initialise_board()
+    return board
+
+
+def perft(board: Board, depth: int, hash_table: Optional[TranspositionTable] = None) -> int:
+    """
+    Counts leaf nodes, the last ply only counts moves instead of making them
+    :param board: Position to count from, left unchanged
+    :param depth: Number of plies
+    :param hash_table: Optional table caching subtree counts by position and depth
+    """
+    if depth == 0:
+        return 1
+    if depth == 1:
+        return len(board.get_all_possible_moves())
+
+    if hash_table is not None:
+        entry = hash_table.probe(key=board.zobrist_key)
+        if entry is not None and entry.depth == depth:
+            return entry.value
+
+    moves = board.get_all_possible_moves()
+    nodes = 0
+    for move in moves:
+        board.make_move(move=move)
+        nodes += perft(board=board, depth=depth - 1, hash_table=hash_table)
+        board.unmake_move()
+
+    if hash_table is not None:
+        hash_table.store(key=board.zobrist_key, depth=depth, value=nodes, bound=Bound.EXACT)
+    return nodes
+
+
+def _initialise_worker(hash_mb: float) -> None:
+    global _worker_hash_table
+    _worker_hash_table = TranspositionTable(size_mb=hash_mb) if hash_mb else None
+
+
+def _perft_root_move(task: Tuple[str, str, int, int]) -> int:
+    fen_repr, backend, move, depth = task
+    board = create_board(fen_repr=fen_repr, backend=backend)
+    board.make_move(move=move)
+    return perft(board=board, depth=depth - 1, hash_table=_worker_hash_table)
+
+
+def divide(
+    fen_repr: str,
+    depth: int,
+    backend: str = "bitboard",
+    processes: int = 1,
+    hash_mb: float = 0,
+) -> Dict[str, int]:
+    """
+    Leaf counts per root move, root moves are split across a process pool when processes > 1
+    :param fen_repr: FEN board representation
+    :param depth: Number of plies, at least 1
+    :param backend: Board representation used to generate moves
+    :param processes: Number of worker processes
+    :param hash_mb: Size of the perft hash table per process, 0 disables it
+    """
+    board = create_board(fen_repr=fen_repr, backend=backend)
+    moves = board.get_all_possible_moves()
+    if processes > 1:
+        tasks = [(fen_repr, backend, move, depth) for move in moves]
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_initialise_worker, initargs=(hash_mb,)
+        ) as executor:
+            counts = list(executor.map(_perft_root_move, tasks))
+    else:
+        hash_table = TranspositionTable(size_mb=hash_mb) if hash_mb else None
+        counts = []
+        for move in moves:
+            board.make_move(move=move)
+            counts.append(perft(board=board, depth=depth - 1, hash_table=hash_table))
+            board.unmake_move()
+    return {move_to_uci(move): count for move, count in zip(moves, counts)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fen", default=START_FEN)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--hash-mb", type=float, default=0)
+    parser.add_argument("--divide", action="store_true", help="Print the count of every root move")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = divide(
+        fen_repr=args.fen,
+        depth=args.depth,
+        backend=args.backend,
+        processes=args.processes,
+        hash_mb=args.hash_mb,
+    )
+    seconds = time.perf_counter() - start
+
+    if args.divide:
+        for uci, count in sorted(counts.items()):
+            print(f"{uci}: {count}")
+    nodes = sum(counts.values())
+    print(f"Nodes: {nodes}\nTime: {seconds:.2f}s\nNodes/s: {nodes / seconds:.0f}")
+
+
+if __name__ == "__main__":
+    main()
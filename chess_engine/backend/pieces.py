@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 
 PIECE_COLOUR_CODES = {
@@ -6,17 +6,36 @@ PIECE_COLOUR_CODES = {
     "black": (0, 0, 0, 0),
 }
 
+KING_MOVES: Tuple = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+PAWN_MOVES: Dict[str, Tuple] = {
+    "white": ((-1, 0), (-1, 1), (-1, -1)),
+    "black": ((1, 0), (1, 1), (1, -1)),
+}
+
 
 class Piece:
+    """
+    Only the per-instance state lives in slots. Move tables, values and colour codes are
+    immutable and shared by every piece of a type through class attributes.
+    """
+
+    __slots__ = ("row", "column", "colour", "symbol", "has_moved", "icon_asset")
+
+    moves: Tuple = ()
+    multi_moves: bool = False
+    value: int = 0
+
     def __init__(self, row: int, column: int, colour: str, symbol: str):
         self.row: int = row
         self.column: int = column
         self.colour: str = colour
         self.symbol: str = symbol
-        self.multi_moves: bool = False
         self.has_moved: bool = False
-        self.colour_code: Tuple = PIECE_COLOUR_CODES[self.colour]
-        self.icon_asset, self.moves = None, None
+        self.icon_asset = None
+
+    @property
+    def colour_code(self) -> Tuple:
+        return PIECE_COLOUR_CODES[self.colour]
 
     def get_moves(self) -> Tuple:
         return self.moves
@@ -32,18 +51,25 @@ class Piece:
 
 
 class Pawn(Piece):
+    __slots__ = ()
+
+    value: int = 1
+
     def __init__(self, row: int, column: int, colour: str, symbol: str):
         super().__init__(row, column, colour, symbol)
         if self.colour == "black":
-            self.moves: Tuple = ((1, 0), (1, 1), (1, -1))
             if row != 1:
                 self.has_moved: bool = True
         else:
-            self.moves: Tuple = ((-1, 0), (-1, 1), (-1, -1))
             if row != 6:
                 self.has_moved: bool = True
 
-        self.value: int = 1
+    @property
+    def moves(self) -> Tuple:
+        return PAWN_MOVES[self.colour]
+
+    def get_moves(self) -> Tuple:
+        return PAWN_MOVES[self.colour]
 
     def is_being_promoted(self, dst_row: int) -> bool:
         if self.colour == "white" and dst_row == 0:
@@ -53,69 +79,47 @@ class Pawn(Piece):
 
 
 class Knight(Piece):
-    def __init__(self, row: int, column: int, colour: str, symbol: str):
-        super().__init__(row, column, colour, symbol)
-        self.moves: Tuple = (
-            (2, 1),
-            (1, 2),
-            (-2, 1),
-            (-2, -1),
-            (2, -1),
-            (-1, 2),
-            (-1, -2),
-            (1, -2),
-        )
-        self.value: int = 3
+    __slots__ = ()
+
+    moves: Tuple = ((2, 1), (1, 2), (-2, 1), (-2, -1), (2, -1), (-1, 2), (-1, -2), (1, -2))
+    value: int = 3
 
 
 class Bishop(Piece):
-    def __init__(self, row: int, column: int, colour: str, symbol: str):
-        super().__init__(row, column, colour, symbol)
-        self.moves: Tuple = ((1, 1), (-1, 1), (-1, -1), (1, -1))
-        self.multi_moves: bool = True
-        self.value: int = 3
+    __slots__ = ()
+
+    moves: Tuple = ((1, 1), (-1, 1), (-1, -1), (1, -1))
+    multi_moves: bool = True
+    value: int = 3
 
 
 class Rook(Piece):
+    __slots__ = ("starting_position",)
+
+    moves: Tuple = ((1, 0), (0, 1), (-1, 0), (0, -1))
+    multi_moves: bool = True
+    value: int = 5
+
     def __init__(self, row: int, column: int, colour: str, symbol: str):
         super().__init__(row, column, colour, symbol)
-        self.moves: Tuple = ((1, 0), (0, 1), (-1, 0), (0, -1))
-        self.multi_moves: bool = True
-        self.value: int = 5
         self.starting_position: Tuple[int, int] = (row, column)
 
 
 class Queen(Piece):
-    def __init__(self, row: int, column: int, colour: str, symbol: str):
-        super().__init__(row, column, colour, symbol)
-        self.moves = (
-            (1, 0),
-            (1, 1),
-            (0, 1),
-            (-1, 1),
-            (-1, 0),
-            (-1, -1),
-            (0, -1),
-            (1, -1),
-        )
-        self.multi_moves: bool = True
-        self.value: int = 9
+    __slots__ = ()
+
+    moves: Tuple = KING_MOVES
+    multi_moves: bool = True
+    value: int = 9
 
 
 class King(Piece):
+    __slots__ = ("in_check", "has_castled", "castling_status")
+
+    moves: Tuple = KING_MOVES
+
     def __init__(self, row: int, column: int, colour: str, symbol: str):
         super().__init__(row, column, colour, symbol)
-        self.moves: Tuple = (
-            (1, 0),
-            (1, 1),
-            (0, 1),
-            (-1, 1),
-            (-1, 0),
-            (-1, -1),
-            (0, -1),
-            (1, -1),
-        )
         self.in_check: bool = False
         self.has_castled: bool = False
-        self.value: int = 0
         self.castling_status: List = []
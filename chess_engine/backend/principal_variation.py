@@ -0,0 +1,39 @@
+from typing import List
+
+from chess_engine.backend.move import NO_MOVE
+from chess_engine.backend.move_picker import MAX_PLY
+
+
+class PVTable:
+    """
+    Triangular array of principal variations. Row ply holds the best line found from that ply,
+    it is rebuilt from the row below whenever a move raises the score inside the window
+    """
+
+    def __init__(self, max_ply: int = MAX_PLY):
+        self._moves: List[List[int]] = [[NO_MOVE] * (max_ply + 1) for _ in range(max_ply + 1)]
+        self._lengths: List[int] = [0] * (max_ply + 2)
+
+    def clear(self, ply: int) -> None:
+        self._lengths[ply] = ply
+
+    def update(self, ply: int, move: int) -> None:
+        """
+        :param ply: Distance from the root of the node the move is made from
+        :param move: New best move, the line below it is the variation last searched at ply + 1
+        """
+        row = self._moves[ply]
+        row[ply] = move
+        child_length = self._lengths[ply + 1]
+        row[ply + 1:child_length] = self._moves[ply + 1][ply + 1:child_length]
+        self._lengths[ply] = max(child_length, ply + 1)
+
+    def get_pv(self, ply: int = 0) -> List[int]:
+        return self._moves[ply][ply:self._lengths[ply]]
+
+    def set_pv(self, ply: int, moves: List[int]) -> None:
+        """
+        Replaces the line of a ply by one found outside this table, by another process
+        """
+        self._moves[ply][ply:ply + len(moves)] = moves
+        self._lengths[ply] = ply + len(moves)
@@ -1,4 +1,4 @@
-
+from typing import Tuple
 
 SQUARE_COLOUR_CODES = {
     "white": (0, 128, 128),
@@ -7,14 +7,20 @@ SQUARE_COLOUR_CODES = {
 
 
 class Square:
+    __slots__ = ("row", "column", "colour", "piece", "promotion_piece")
+
+    columns_str: str = "abcdefgh"
+
     def __init__(self, row: int, column: int, colour: str):
         self.row: int = row
         self.column: int = column
         self.colour: str = colour
-        self.columns_str: str = "abcdefgh"
-        self.colour_code = SQUARE_COLOUR_CODES[self.colour]
         self.piece, self.promotion_piece = None, None
 
+    @property
+    def colour_code(self) -> Tuple:
+        return SQUARE_COLOUR_CODES[self.colour]
+
     def __repr__(self):
         if self.piece:
             return self.piece.__repr__()
@@ -0,0 +1,98 @@
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Approximate CPython footprint of one stored entry: the tuple itself, its 64-bit key and
+# score objects and the slot pointer in the table list
+ENTRY_SIZE_BYTES: int = 160
+BUCKET_SIZE: int = 2
+
+
+class Bound(Enum):
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+
+class TranspositionEntry(NamedTuple):
+    key: int
+    depth: int
+    value: int
+    bound: Bound
+    move: Any
+    generation: int
+
+
+class TranspositionTable:
+    """
+    Buckets of two slots: the first keeps the deepest entry of the current search, the
+    second is always replaced. Entries left over from previous searches are treated as
+    free in the depth-preferred slot.
+    Scores are stored from the perspective of the side to move.
+    """
+
+    def __init__(self, size_mb: float):
+        self.bucket_count: int = max(1, int(size_mb * 1024 * 1024) // (ENTRY_SIZE_BYTES * BUCKET_SIZE))
+        self._entries: List[Optional[TranspositionEntry]] = [None] * (self.bucket_count * BUCKET_SIZE)
+        self.generation: int = 0
+        self.probes, self.hits, self.cutoffs, self.stores = 0, 0, 0, 0
+
+    def new_search(self) -> None:
+        self.generation = (self.generation + 1) & 0xFF
+        self.probes, self.hits, self.cutoffs, self.stores = 0, 0, 0, 0
+
+    def clear(self) -> None:
+        self._entries = [None] * len(self._entries)
+        self.generation = 0
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        self.probes += 1
+        index = (key % self.bucket_count) * BUCKET_SIZE
+        for entry in (self._entries[index], self._entries[index + 1]):
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+        return None
+
+    def lookup(self, key: int, depth: int, alpha: int, beta: int) -> Optional[int]:
+        return self.get_cutoff_value(entry=self.probe(key=key), depth=depth, alpha=alpha, beta=beta)
+
+    def get_cutoff_value(
+        self, entry: Optional[TranspositionEntry], depth: int, alpha: int, beta: int
+    ) -> Optional[int]:
+        if entry is None or entry.depth < depth:
+            return None
+        # Bounds only settle the node where the search itself would cut, fail-hard at beta or
+        # at alpha
+        if (
+            entry.bound == Bound.EXACT
+            or (entry.bound == Bound.LOWER and entry.value >= beta)
+            or (entry.bound == Bound.UPPER and entry.value <= alpha)
+        ):
+            self.cutoffs += 1
+            return entry.value
+        return None
+
+    def store(self, key: int, depth: int, value: int, bound: Bound, move: Any = None) -> None:
+        self.stores += 1
+        index = (key % self.bucket_count) * BUCKET_SIZE
+        entry = TranspositionEntry(key, depth, value, bound, move, self.generation)
+        depth_preferred = self._entries[index]
+        if (
+            depth_preferred is None
+            or depth_preferred.key == key
+            or depth_preferred.generation != self.generation
+            or depth >= depth_preferred.depth
+        ):
+            self._entries[index] = entry
+        else:
+            self._entries[index + 1] = entry
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "cutoffs": self.cutoffs,
+            "stores": self.stores,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "cutoff_rate": self.cutoffs / self.probes if self.probes else 0.0,
+        }
@@ -0,0 +1,41 @@
+import random
+from typing import Iterable, List, Optional, Tuple
+
+ZOBRIST_SEED: int = 2022
+
+_random = random.Random(ZOBRIST_SEED)
+
+# Indexed by piece * 64 + square, pieces ordered as in PIECE_SYMBOLS
+PIECE_KEYS: List[int] = [_random.getrandbits(64) for _ in range(12 * 64)]
+CASTLING_RIGHT_KEYS: List[int] = [_random.getrandbits(64) for _ in range(4)]
+EN_PASSANT_KEYS: List[int] = [_random.getrandbits(64) for _ in range(8)]
+SIDE_KEY: int = _random.getrandbits(64)
+
+# Indexed by the castling rights bit mask, so a change of rights is one xor of old and new entry
+CASTLING_KEYS: List[int] = [0] * 16
+for _castling_rights in range(16):
+    for _index, _key in enumerate(CASTLING_RIGHT_KEYS):
+        if _castling_rights & 1 << _index:
+            CASTLING_KEYS[_castling_rights] ^= _key
+
+
+def get_zobrist_key(
+    pieces: Iterable[Tuple[int, int]],
+    castling_rights: int,
+    en_passant_column: Optional[int],
+    is_whites_turn: bool,
+) -> int:
+    """
+    :param pieces: (piece, square) pairs for every piece on the board
+    :param castling_rights: Castling rights bit mask
+    :param en_passant_column: Column of the en passant square, None if there is none
+    :param is_whites_turn: Side to move
+    """
+    key = CASTLING_KEYS[castling_rights]
+    for piece, square in pieces:
+        key ^= PIECE_KEYS[piece * 64 + square]
+    if en_passant_column is not None:
+        key ^= EN_PASSANT_KEYS[en_passant_column]
+    if not is_whites_turn:
+        key ^= SIDE_KEY
+    return key
@@ -0,0 +1,263 @@
+"""
+UCI protocol front-end, plays through a chess GUI or tournament manager instead of the pygame GUI
+
+Usage: python -m chess_engine.frontend.uci [--backend bitboard] [--hash-mb 16] [--processes N]
+"""
+import argparse
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from chess_engine.backend.ai import (
+    AI,
+    BOARD_BACKENDS,
+    MATE_VALUE,
+    MIN_MATE_VALUE,
+    SearchInfo,
+    SearchLimits,
+    SelectiveSearch,
+    TRANSPOSITION_TABLE_MB,
+)
+from chess_engine.backend.move import NO_MOVE, move_to_uci, uci_to_move
+from chess_engine.backend.move_picker import MAX_PLY
+from chess_engine.backend.opening_book import OpeningBook
+from chess_engine.backend.parallel_search import ParallelAI
+from chess_engine.backend.perft import START_FEN, create_board
+
+ENGINE_NAME = "chess-engine"
+ENGINE_AUTHOR = "Mark Bonney"
+MAX_HASH_MB = 1024
+# Share of the remaining clock spent on a move when the GUI does not send movestogo
+MOVES_TO_GO = 30
+# Seconds kept back from the clock for the GUI and the protocol
+MOVE_OVERHEAD = 0.05
+MIN_MOVE_TIME = 0.01
+# Seconds between stop requests while waiting for the search thread
+STOP_INTERVAL = 0.01
+
+GO_PARAMETERS = ("wtime", "btime", "winc", "binc", "movestogo", "movetime", "depth", "nodes")
+
+
+def get_score(value: int) -> str:
+    """
+    Mates are valued MATE_VALUE less their distance in plies, UCI counts it in moves
+    """
+    if abs(value) < MIN_MATE_VALUE:
+        return f"cp {value}"
+    moves = (MATE_VALUE - abs(value) + 1) // 2
+    return f"mate {moves if value > 0 else -moves}"
+
+
+def get_limits(parameters: Dict[str, int], is_whites_turn: bool) -> SearchLimits:
+    """
+    :param parameters: Values of the go command, times in milliseconds
+    """
+    depth = parameters.get("depth", MAX_PLY)
+    nodes = parameters.get("nodes")
+    if "movetime" in parameters:
+        return SearchLimits(depth=depth, time=parameters["movetime"] / 1000, nodes=nodes)
+
+    clock, increment = ("wtime", "winc") if is_whites_turn else ("btime", "binc")
+    if clock not in parameters:
+        return SearchLimits(depth=depth, nodes=nodes)
+    remaining = parameters[clock] / 1000
+    moves_to_go = parameters.get("movestogo", MOVES_TO_GO)
+    move_time = remaining / moves_to_go + parameters.get(increment, 0) / 1000
+    move_time = max(MIN_MOVE_TIME, min(move_time, remaining - MOVE_OVERHEAD))
+    return SearchLimits(depth=depth, time=move_time, nodes=nodes)
+
+
+def write_line(line: str) -> None:
+    print(line, flush=True)
+
+
+class UCIEngine:
+    def __init__(self, ai: AI, output: Callable[[str], None] = write_line):
+        """
+        Commands are handled as they are read, the search runs on a thread so that stop and
+        isready are answered while it searches
+        :param ai: Searcher of the go commands
+        :param output: Writes a line to the GUI, called from the search thread too
+        """
+        self.ai = ai
+        self._output = output
+        self._output_lock = threading.Lock()
+        self.board = create_board(fen_repr=START_FEN, backend=ai.backend)
+        self._search_thread: Optional[threading.Thread] = None
+        # Set by stop, an infinite search only sends its best move once it is set
+        self._stop_event = threading.Event()
+
+    def send(self, line: str) -> None:
+        with self._output_lock:
+            self._output(line)
+
+    def handle(self, line: str) -> bool:
+        """
+        :return: False once the GUI quits
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(
+                f"option name Hash type spin default {TRANSPOSITION_TABLE_MB} min 0 "
+                f"max {MAX_HASH_MB}"
+            )
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(arguments=arguments)
+        elif command == "ucinewgame":
+            self.stop_search()
+            self.ai.clear()
+        elif command == "position":
+            self.stop_search()
+            self.set_position(arguments=arguments)
+        elif command == "go":
+            self.go(arguments=arguments)
+        elif command == "stop":
+            self.stop_search()
+        elif command == "quit":
+            self.stop_search()
+            return False
+        else:
+            self.send(f"info string Unknown command: {command}")
+        return True
+
+    def set_option(self, arguments: List[str]) -> None:
+        if "name" not in arguments or "value" not in arguments:
+            return
+        name = " ".join(arguments[arguments.index("name") + 1:arguments.index("value")])
+        value = " ".join(arguments[arguments.index("value") + 1:])
+        if name.lower() == "hash":
+            try:
+                size_mb = min(max(int(value), 0), MAX_HASH_MB)
+            except ValueError:
+                self.send(f"info string Invalid value of {name}: {value}")
+                return
+            self.stop_search()
+            self.ai.resize_transposition_table(size_mb=size_mb)
+        else:
+            self.send(f"info string Unknown option: {name}")
+
+    def set_position(self, arguments: List[str]) -> None:
+        """
+        :param arguments: "startpos" or "fen" and the six FEN fields, then the moves played from it
+        """
+        moves_index = arguments.index("moves") if "moves" in arguments else len(arguments)
+        if arguments and arguments[0] == "fen":
+            fen_repr = " ".join(arguments[1:moves_index])
+        else:
+            fen_repr = START_FEN
+        try:
+            board = create_board(fen_repr=fen_repr, backend=self.ai.backend)
+        except ValueError as error:
+            self.send(f"info string Invalid FEN: {fen_repr} ({error})")
+            return
+        for uci in arguments[moves_index + 1:]:
+            move = uci_to_move(uci=uci, moves=board.get_all_possible_moves())
+            if move is None:
+                self.send(f"info string Illegal move: {uci}")
+                break
+            board.make_move(move=move)
+        self.board = board
+
+    def go(self, arguments: List[str]) -> None:
+        parameters = {}
+        for name, value in zip(arguments, arguments[1:]):
+            if name in GO_PARAMETERS:
+                try:
+                    parameters[name] = int(value)
+                except ValueError:
+                    self.send(f"info string Invalid value of {name}: {value}")
+                    return
+        self.stop_search()
+        # A go without limits searches until stop, like go infinite
+        infinite = "infinite" in arguments or not parameters
+        limits = get_limits(parameters=parameters, is_whites_turn=self.board.is_whites_turn)
+
+        self._stop_event.clear()
+        self._search_thread = threading.Thread(
+            target=self.search, args=(self.board, limits, infinite), daemon=True
+        )
+        self._search_thread.start()
+
+    def search(self, board, limits: SearchLimits, infinite: bool) -> None:
+        move = self.ai.get_optimal_move(board=board, limits=limits, callback=self.send_info)
+        if infinite:
+            self._stop_event.wait()
+        if move == NO_MOVE:
+            self.send("bestmove 0000")
+            return
+        principal_variation = self.ai.principal_variation
+        if len(principal_variation) > 1 and principal_variation[0] == move:
+            self.send(f"bestmove {move_to_uci(move)} ponder {move_to_uci(principal_variation[1])}")
+        else:
+            self.send(f"bestmove {move_to_uci(move)}")
+
+    def send_info(self, info: SearchInfo) -> None:
+        milliseconds = int(info.time * 1000)
+        nodes_per_second = int(info.nodes / info.time) if info.time > 0 else 0
+        self.send(
+            f"info depth {info.depth} "
+            f"score {get_score(info.value)} "
+            f"nodes {info.nodes} nps {nodes_per_second} time {milliseconds} "
+            f"pv {' '.join(move_to_uci(move) for move in info.principal_variation)}"
+        )
+
+    def stop_search(self) -> None:
+        """
+        Stops the search until its thread ends, a stop sent before the search started is repeated
+        """
+        self._stop_event.set()
+        thread = self._search_thread
+        while thread is not None and thread.is_alive():
+            self.ai.stop()
+            thread.join(timeout=STOP_INTERVAL)
+        self._search_thread = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=list(BOARD_BACKENDS), default="bitboard")
+    parser.add_argument("--hash-mb", type=float, default=TRANSPOSITION_TABLE_MB)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--book", help="Polyglot opening book")
+    args = parser.parse_args()
+    # Standard output belongs to the protocol
+    logger.remove()
+
+    if args.processes > 1:
+        ai = ParallelAI(
+            processes=args.processes,
+            backend=args.backend,
+            transposition_table_mb=args.hash_mb,
+            selective_search=SelectiveSearch(),
+        )
+    else:
+        ai = AI(
+            backend=args.backend,
+            transposition_table_mb=args.hash_mb,
+            selective_search=SelectiveSearch(),
+        )
+    if args.book:
+        ai.opening_book = OpeningBook(path=args.book)
+    engine = UCIEngine(ai=ai)
+    try:
+        for line in sys.stdin:
+            if not engine.handle(line):
+                break
+    finally:
+        engine.stop_search()
+        if isinstance(ai, ParallelAI):
+            ai.close()
+
+
+if __name__ == "__main__":
+    main()
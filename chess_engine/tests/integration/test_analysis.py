@@ -0,0 +1,132 @@
+import pytest
+
+from chess_engine.backend.ai import SearchLimits
+from chess_engine.backend.analysis import analyse, parse_position, read_positions, take_tasks
+from chess_engine.backend.batch_evaluation import evaluate_fens
+
+POSITIONS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    '4k3/8/4K3/8/8/8/8/1Q6 w - - bm Qb8#; id "mate in one";',
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+]
+
+
+@pytest.mark.parametrize(
+    "line, expected_fen, expected_operations",
+    [
+        (POSITIONS[0], POSITIONS[0], {}),
+        (POSITIONS[1], "4k3/8/4K3/8/8/8/8/1Q6 w - - 0 1", {"bm": "Qb8#", "id": "mate in one"}),
+        ("8/8/8/8/8/4k3/8/4K2R b K - hmvc 3; fmvn 40;", "8/8/8/8/8/4k3/8/4K2R b K - 3 40", None),
+        ("# comment", None, None),
+        ("  ", None, None),
+    ],
+)
+def test_parse_position(line: str, expected_fen: str, expected_operations: dict):
+    position = parse_position(line)
+    if expected_fen is None:
+        assert position is None
+        return
+    assert position[0] == expected_fen
+    if expected_operations is not None:
+        assert position[1] == expected_operations
+
+
+def test_analyse_ordered():
+    """
+    Positions are analysed independently, results do not depend on the worker that analysed them
+    """
+    limits = SearchLimits(depth=2)
+    expected = list(analyse(tasks=read_positions(POSITIONS), limits=limits, backend="bitboard"))
+    assert [result["index"] for result in expected] == list(range(len(POSITIONS)))
+    assert expected[1]["best_move"] == "b1b8" and expected[1]["id"] == "mate in one"
+    # The mate is proven by the first iteration
+    assert [result["depth"] for result in expected] == [2, 1, 2, 2, 2, 2]
+    assert all(result["nodes"] > 0 for result in expected)
+
+    results = list(
+        analyse(
+            tasks=read_positions(POSITIONS),
+            limits=limits,
+            processes=2,
+            max_in_flight=3,
+            backend="bitboard",
+        )
+    )
+    for result, expected_result in zip(results, expected):
+        del result["time"], expected_result["time"]
+    assert results == expected
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_analyse_static_eval(processes: int):
+    """
+    Results carry the static evaluation computed for their batch of positions
+    """
+    results = list(
+        analyse(
+            tasks=read_positions(POSITIONS),
+            limits=SearchLimits(depth=1),
+            processes=processes,
+            max_in_flight=4,
+            backend="bitboard",
+        )
+    )
+    fens = [result["fen"] for result in results]
+    assert [result["static_eval"] for result in results] == evaluate_fens(fens).tolist()
+
+    tasks = take_tasks(tasks=read_positions(["garbage", POSITIONS[0]]), count=3)
+    assert [task.static_eval for task in tasks] == [None, 0]
+
+
+def test_analyse_unordered_in_flight():
+    """
+    Positions are only read as results are yielded
+    """
+    read = []
+
+    def get_lines():
+        for line in POSITIONS * 2:
+            read.append(line)
+            yield line
+
+    results = []
+    for result in analyse(
+        tasks=read_positions(get_lines()),
+        limits=SearchLimits(depth=1),
+        processes=2,
+        ordered=False,
+        max_in_flight=3,
+        backend="bitboard",
+    ):
+        assert len(read) - len(results) <= 3
+        results.append(result)
+    assert sorted(result["index"] for result in results) == list(range(2 * len(POSITIONS)))
+
+
+@pytest.mark.parametrize(
+    "line, error",
+    [
+        ("8/8/8 w - - 0 1", "Invalid FEN board"),
+        ("4k3/8/8/8/8/8/8/4X3 w - - 0 1", "Invalid FEN piece"),
+        ("8/8/8/8/8/8/8/4K3 w - - 0 1", "Invalid number of k kings"),
+        ("4k3/8/8/8/8/8/8/4KK2 w - - 0 1", "Invalid number of K kings"),
+        ("4k3/8/8/8/8/8/8/4QK2 w - - 0 1", "not to move is in check"),
+    ],
+)
+@pytest.mark.parametrize("backend", ["board", "bitboard"])
+def test_analyse_invalid_position(line: str, error: str, backend: str):
+    """
+    An invalid position becomes an error result and the positions after it are still analysed
+    """
+    results = list(
+        analyse(
+            tasks=read_positions([line, POSITIONS[0]]),
+            limits=SearchLimits(depth=1),
+            backend=backend,
+        )
+    )
+    assert error in results[0]["error"] and "best_move" not in results[0]
+    assert results[1]["best_move"] is not None
@@ -0,0 +1,31 @@
+import numpy as np
+
+from chess_engine.backend.batch_evaluation import evaluate_fens, evaluate_planes, get_piece_planes
+from chess_engine.backend.fen import parse_fen
+from chess_engine.backend.perft import create_board
+
+
+def test_batch_evaluation():
+    """
+    Positions scored in one batch must get the values of the incremental evaluation
+    """
+    board_obj = create_board(
+        fen_repr="r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+    )
+    fen_reprs, values = [], []
+    for move in board_obj.get_all_possible_moves():
+        board_obj.make_move(move=move)
+        for reply in board_obj.get_all_possible_moves():
+            board_obj.make_move(move=reply)
+            fen_reprs.append(board_obj.get_fen())
+            values.append(board_obj.get_evaluation(is_maximising_player=board_obj.is_whites_turn))
+            board_obj.unmake_move()
+        board_obj.unmake_move()
+
+    assert evaluate_fens(fen_reprs).tolist() == values
+    planes = get_piece_planes([parse_fen(fen_repr).mailbox for fen_repr in fen_reprs])
+    assert planes.shape == (len(fen_reprs), 12, 64)
+    assert planes.sum(axis=(1, 2)).tolist() == [
+        sum(piece != -1 for piece in parse_fen(fen_repr).mailbox) for fen_repr in fen_reprs
+    ]
+    assert np.array_equal(evaluate_planes(planes), evaluate_fens(fen_reprs))
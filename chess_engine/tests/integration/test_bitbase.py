@@ -0,0 +1,167 @@
+import random
+
+import chess
+import pytest
+
+from chess_engine.backend import bitbase
+from chess_engine.backend.ai import (
+    AI,
+    BITBASE_WIN_VALUE,
+    BOARD_BACKENDS,
+    INFINITE_VALUE,
+    SearchLimits,
+    SelectiveSearch,
+)
+from chess_engine.backend.board import BoardState
+from chess_engine.backend.bitbase import DRAW, LOSS, WIN
+from chess_engine.backend.fen import parse_fen
+from chess_engine.backend.move import move_to_uci
+from chess_engine.backend.perft import create_board
+
+
+def get_result(board: chess.Board) -> int:
+    if board.is_checkmate():
+        return LOSS
+    if board.is_stalemate() or board.is_insufficient_material():
+        return DRAW
+    return bitbase.probe(parse_fen(board.fen()))
+
+
+@pytest.mark.parametrize(
+    "board_rep, expected_result",
+    [
+        # King in front of its pawn on the sixth rank wins with either side to move
+        ("3k4/8/3K4/3P4/8/8/8/8 w - - 0 1", WIN),
+        ("3k4/8/3K4/3P4/8/8/8/8 b - - 0 1", LOSS),
+        ("k7/8/8/8/8/8/P7/K7 w - - 0 1", DRAW),
+        ("4k3/4P3/4K3/8/8/8/8/8 w - - 0 1", WIN),
+        ("4k3/4P3/4K3/8/8/8/8/8 b - - 0 1", DRAW),
+        ("8/8/8/8/8/4k3/4p3/7K b - - 0 1", WIN),
+        ("k7/8/1Q6/8/8/8/8/7K w - - 0 1", WIN),
+        ("k7/8/1Q6/8/8/8/8/7K b - - 0 1", DRAW),
+        ("8/8/8/4k3/8/8/8/R3K3 b - - 0 1", LOSS),
+        ("8/8/8/8/8/8/8/Rk5K b - - 0 1", DRAW),
+        ("8/8/8/4k3/8/8/8/4K3 w - - 0 1", DRAW),
+        ("8/8/8/4k3/8/8/8/2B1K3 w - - 0 1", None),
+    ],
+)
+def test_probe(board_rep: str, expected_result: int):
+    """
+    Stalemates, undefended pieces the lone king captures and the rook pawn draw
+    :param board_rep: FEN board representation
+    """
+    assert bitbase.probe(parse_fen(board_rep)) == expected_result
+
+
+@pytest.mark.parametrize("piece_symbol", ["P", "R", "Q", "p", "r", "q"])
+def test_results_follow_moves(piece_symbol: str):
+    """
+    The result of a position must be the best result of its moves, computed with the moves of
+    the chess package
+    :param piece_symbol: Piece next to the two kings
+    """
+    generator = random.Random(piece_symbol)
+    positions = 0
+    while positions < 300:
+        board = chess.Board(None)
+        squares = generator.sample(range(64), 3)
+        board.set_piece_at(squares[0], chess.Piece(chess.KING, chess.WHITE))
+        board.set_piece_at(squares[1], chess.Piece(chess.KING, chess.BLACK))
+        board.set_piece_at(squares[2], chess.Piece.from_symbol(piece_symbol))
+        board.turn = generator.random() < 0.5
+        if not board.is_valid() or board.is_game_over():
+            continue
+        best_result = LOSS
+        for move in board.legal_moves:
+            board.push(move)
+            best_result = max(best_result, -get_result(board))
+            board.pop()
+        assert get_result(board) == best_result, board.fen()
+        positions += 1
+
+
+def test_load(tmp_path, monkeypatch):
+    """
+    A missing bitbase is not generated by a probe, a built one is saved without temporary files
+    left behind and read back by later loads
+    """
+    monkeypatch.setattr(bitbase, "_bitbases", {})
+    assert bitbase.load(bitbase.ROOK, directory=str(tmp_path)) is None
+
+    monkeypatch.setattr(bitbase, "_bitbases", {})
+    bits = bitbase.build(bitbase.ROOK, directory=str(tmp_path))
+    assert [path.name for path in tmp_path.iterdir()] == ["krk.bin"]
+    assert (tmp_path / "krk.bin").read_bytes() == bits
+    assert len(bits) == bitbase.BITBASE_SIZES[bitbase.ROOK] // 8
+
+    monkeypatch.setattr(bitbase, "_bitbases", {})
+    assert bitbase.load(bitbase.ROOK, directory=str(tmp_path)) == bits
+
+
+def test_probe_without_bitbase(monkeypatch):
+    """
+    Without its bitbase file a position is searched, not valued by a bitbase generated mid-search
+    """
+    monkeypatch.setattr(bitbase, "_bitbases", {bitbase.QUEEN: None})
+    assert bitbase.probe(parse_fen("8/8/8/3k4/8/8/8/QK6 w - - 0 1")) is None
+    assert bitbase.probe(parse_fen("8/8/8/3k4/8/8/8/RK6 w - - 0 1")) == bitbase.WIN
+
+
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_search_probes_bitbase(backend: str):
+    """
+    Capturing the pawn leaves a won rook ending, valued by the bitbase
+    :param backend: Board representation searched on
+    """
+    board = create_board(fen_repr="4k3/8/8/8/8/8/p7/R3K3 w - - 0 1", backend=backend)
+    ai_obj = AI(backend=backend)
+    assert move_to_uci(ai_obj.get_optimal_move(board=board)) == "a1a2"
+    assert ai_obj.search_stats.bitbase_hits > 0
+
+    ai_obj.set_bitbase_probes(board=board)
+    value = ai_obj.alpha_beta(
+        board=board, depth=2, alpha=-INFINITE_VALUE, beta=INFINITE_VALUE, is_maximising_player=True
+    )
+    assert value >= BITBASE_WIN_VALUE
+
+
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_search_from_bitbase_root(backend: str):
+    """
+    Roots in a bitbase only search the moves that keep the win, the stalemating queen moves are
+    not among them
+    :param backend: Board representation searched on
+    """
+    board = create_board(fen_repr="k7/8/1K6/8/8/8/8/2Q5 w - - 0 1", backend=backend)
+    ai_obj = AI(backend=backend)
+    move = ai_obj.get_optimal_move(board=board)
+    assert "c1c7" not in ai_obj.moves_to_str(ai_obj.root_moves)
+    board.make_move(move=move)
+    assert board.board_state == BoardState.CHECKMATE
+
+
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "8/8/k7/8/8/8/5K2/3R4 w - - 0 1",
+        "1K6/8/8/2k5/5R2/8/8/8 w - - 0 1",
+        "8/6Q1/2k5/8/8/8/7K/8 w - - 0 1",
+    ],
+)
+def test_play_bitbase_ending_to_mate(backend: str, board_rep: str):
+    """
+    The strong side mates against the best defence of the same search, without repeating
+    positions or stalemating
+    :param backend: Board representation searched on
+    :param board_rep: FEN board representation of a won rook or queen ending
+    """
+    board = create_board(fen_repr=board_rep, backend=backend)
+    chess_board = chess.Board(board_rep)
+    ai_obj = AI(backend=backend, selective_search=SelectiveSearch())
+    while not chess_board.is_game_over(claim_draw=True):
+        move = ai_obj.get_optimal_move(board=board, limits=SearchLimits(depth=3))
+        chess_board.push_uci(move_to_uci(move))
+        board.make_move(move=move)
+    assert chess_board.is_checkmate() and chess_board.turn == chess.BLACK
+    assert board.board_state == BoardState.CHECKMATE
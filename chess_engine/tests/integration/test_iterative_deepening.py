@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from chess_engine.backend.ai import AI, LIMIT_CHECK_NODES, SearchLimits
+from chess_engine.backend.perft import create_board
+
+BOARD_REP = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        SearchLimits(depth=2),
+        SearchLimits(depth=64, nodes=5000),
+        SearchLimits(depth=64, time=0.3),
+    ],
+)
+def test_search_limits(limits: SearchLimits):
+    """
+    Every limit must end the search with a legal move from a completed iteration
+    :param limits: Search limits
+    """
+    board_obj = create_board(fen_repr=BOARD_REP)
+    root_fen = board_obj.get_fen()
+    ai_obj = AI(backend="bitboard")
+
+    start = time.perf_counter()
+    move = ai_obj.get_optimal_move(board=board_obj, limits=limits)
+    seconds = time.perf_counter() - start
+
+    assert move in board_obj.get_all_possible_moves()
+    assert board_obj.get_fen() == root_fen
+    assert ai_obj.completed_depth >= 1
+    if limits.nodes is None and limits.time is None:
+        assert ai_obj.completed_depth == limits.depth
+    if limits.nodes is not None:
+        assert ai_obj.search_stats.nodes < limits.nodes + LIMIT_CHECK_NODES
+    if limits.time is not None:
+        assert seconds < 2 * limits.time
+
+
+def test_stop_flag():
+    board_obj = create_board(fen_repr=BOARD_REP)
+    ai_obj = AI(backend="bitboard")
+    timer = threading.Timer(interval=0.3, function=ai_obj.stop)
+    timer.start()
+    move = ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=64))
+    timer.join()
+
+    assert ai_obj.stopped
+    assert move in board_obj.get_all_possible_moves()
+    assert ai_obj.completed_depth < 64
+
+
+@pytest.mark.parametrize("backend", ["board", "bitboard"])
+@pytest.mark.parametrize(
+    "limits", [SearchLimits(depth=64, nodes=1000), SearchLimits(depth=64, time=0.001)]
+)
+def test_limits_within_first_iteration(backend: str, limits: SearchLimits):
+    """
+    Limits reached before the first iteration completes must stop it with the best root move so far
+    :param backend: Board representation searched on
+    :param limits: Search limits
+    """
+    board_obj = create_board(
+        fen_repr="r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        backend=backend,
+    )
+    ai_obj = AI(backend=backend)
+
+    start = time.perf_counter()
+    move = ai_obj.get_optimal_move(board=board_obj, limits=limits)
+    seconds = time.perf_counter() - start
+
+    assert move in board_obj.get_all_possible_moves()
+    assert ai_obj.stopped
+    if limits.nodes is not None:
+        assert ai_obj.search_stats.nodes < limits.nodes + LIMIT_CHECK_NODES
+    else:
+        assert seconds < 0.5
@@ -0,0 +1,73 @@
+import pytest
+import chess
+
+from chess_engine.backend.ai import AI
+from chess_engine.backend.board import Board, BoardState
+from chess_engine.backend.move import move_to_uci
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "8/8/8/2k5/3Pp3/8/8/4K2R b K d3 0 1",
+        "8/8/8/K2pP2q/8/8/8/7k w - d6 0 1",
+        "4k3/8/8/8/8/8/3r4/R3K2R w KQ - 0 1",
+    ],
+)
+def test_legal_moves(board_rep: str):
+    """
+    Generated moves and check state must match the legal moves of the chess package, covering
+    pins, double checks, en passant discovered checks and castling through attacked squares
+    :param board_rep: FEN board representation
+    """
+    board_obj = Board()
+    board_obj.fen_repr = board_rep
+    board_obj.initialise_board()
+    chess_board = chess.Board(board_rep)
+
+    def walk(depth: int):
+        moves = {move_to_uci(move): move for move in AI.get_moves(board=board_obj)}
+
+        assert sorted(moves) == sorted(move.uci() for move in chess_board.legal_moves)
+        if depth == 0:
+            return
+
+        for uci, move in moves.items():
+            chess_board.push_uci(uci)
+            board_obj.make_move(move=move)
+            assert (board_obj.board_state != BoardState.NORMAL) == chess_board.is_check()
+            walk(depth=depth - 1)
+            board_obj.unmake_move()
+            chess_board.pop()
+
+    walk(depth=2)
+
+
+def test_moves_generated_once(monkeypatch):
+    """
+    Captures, quiet moves and legality checks of a position share one generation of its moves,
+    which is restored when a move is unmade
+    """
+    board_obj = Board()
+    board_obj.fen_repr = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    board_obj.initialise_board()
+    calls = []
+    get_piece_moves = Board.get_piece_moves
+
+    def count_piece_moves(board, square):
+        calls.append(square)
+        return get_piece_moves(board, square)
+
+    monkeypatch.setattr(Board, "get_piece_moves", count_piece_moves)
+
+    moves = board_obj.get_all_possible_moves()
+    generation_calls = len(calls)
+    captures, quiets = board_obj.generate_captures(), board_obj.generate_quiets()
+    assert sorted(captures + quiets) == sorted(moves)
+    assert all(board_obj.is_legal(move) for move in moves)
+    board_obj.make_move(move=captures[0])
+    board_obj.unmake_move()
+    assert board_obj.get_all_possible_moves() == moves
+    assert len(calls) == generation_calls
@@ -0,0 +1,143 @@
+import pytest
+import chess
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS
+from chess_engine.backend.board import Board
+from chess_engine.backend.evaluation import get_scores, get_tapered_value
+from chess_engine.backend.fen import EMPTY, parse_fen
+from chess_engine.backend.move import move_to_uci
+from chess_engine.backend.perft import create_board
+
+
+PIECE_VALUES = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9}
+
+
+def get_position_fen(fen: str) -> str:
+    # The chess package only writes the en passant square when a capture is legal
+    fields = fen.split(" ")
+    return " ".join(fields[:3] + fields[4:])
+
+
+def get_material_balance(chess_board: chess.Board) -> int:
+    balance = 0
+    for piece_type, value in PIECE_VALUES.items():
+        balance += value * len(chess_board.pieces(piece_type, chess_board.turn))
+        balance -= value * len(chess_board.pieces(piece_type, not chess_board.turn))
+    return balance
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - - -",
+        "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    ],
+)
+def test_make_unmake_move(board_rep: str):
+    """
+    Every move made on the board must match the chess package and be fully undone by unmake_move,
+    including the piece lists behind the material count
+    :param board_rep: FEN board representation
+    """
+    board_obj = Board()
+    board_obj.fen_repr = board_rep
+    board_obj.initialise_board()
+    chess_board = chess.Board(board_obj.get_fen())
+
+    def walk(depth: int):
+        root_fen = board_obj.get_fen()
+        for move in AI.get_moves(board=board_obj):
+            chess_board.push_uci(move_to_uci(move))
+            board_obj.make_move(move=move)
+
+            assert get_position_fen(board_obj.get_fen()) == get_position_fen(
+                chess_board.fen()
+            )
+            if not board_obj.is_terminal:
+                assert board_obj.get_board_value() == get_material_balance(chess_board)
+            if depth > 1:
+                walk(depth=depth - 1)
+
+            board_obj.unmake_move()
+            chess_board.pop()
+            assert board_obj.get_fen() == root_fen
+            assert board_obj.get_board_value() == get_material_balance(chess_board)
+
+    walk(depth=2)
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    ],
+)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_incremental_evaluation(board_rep: str, backend: str):
+    """
+    The evaluation updated by make_move and unmake_move must match the one computed from scratch,
+    through captures, promotions, castling and en passant
+    :param board_rep: FEN board representation
+    :param backend: Board representation evaluated
+    """
+    board_obj = create_board(fen_repr=board_rep, backend=backend)
+
+    def get_white_value() -> int:
+        mailbox = parse_fen(fen_str=board_obj.get_fen()).mailbox
+        pieces = [(piece, square) for square, piece in enumerate(mailbox) if piece != EMPTY]
+        return get_tapered_value(*get_scores(pieces=pieces))
+
+    def walk(depth: int):
+        for move in board_obj.get_all_possible_moves():
+            board_obj.make_move(move=move)
+            assert board_obj.get_evaluation(is_maximising_player=board_obj.is_whites_turn) == (
+                get_white_value()
+            )
+            if depth > 1:
+                walk(depth=depth - 1)
+            board_obj.unmake_move()
+
+    root_value = get_white_value()
+    walk(depth=2)
+    assert board_obj.get_evaluation(is_maximising_player=board_obj.is_whites_turn) == root_value
+    mirrored_rep = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+    assert create_board(fen_repr=mirrored_rep, backend=backend).get_evaluation() == 0
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 3 12",
+        "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b - - 17 42",
+    ],
+)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_fen_round_trip(board_rep: str, backend: str):
+    board_obj = BOARD_BACKENDS[backend]()
+    board_obj.fen_repr = board_rep
+    board_obj.initialise_board()
+
+    assert board_obj.get_fen() == board_rep
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNX w KQkq - 0 1",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN w KQkq - 0 1",
+    ],
+)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_invalid_fen(board_rep: str, backend: str):
+    """
+    Unknown piece symbols and boards of the wrong size must be rejected with a ValueError
+    """
+    board_obj = BOARD_BACKENDS[backend]()
+    board_obj.fen_repr = board_rep
+    with pytest.raises(ValueError, match="Invalid FEN"):
+        board_obj.initialise_board()
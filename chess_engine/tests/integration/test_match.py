@@ -0,0 +1,155 @@
+import math
+import sys
+
+import chess
+import pytest
+
+from chess_engine.backend.ai import SearchLimits
+from chess_engine.backend.match import (
+    SPRT,
+    Adjudication,
+    AIPlayer,
+    EngineSpec,
+    MatchStats,
+    UCIPlayer,
+    get_elo,
+    get_expected_score,
+    get_game_tasks,
+    parse_engine,
+    play_game,
+    run_match,
+)
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+SPECS = (
+    EngineSpec(name="first", options={"backend": "bitboard"}),
+    EngineSpec(name="second", options={"backend": "bitboard", "selective_search": True}),
+)
+
+
+def create_stats(wins: int, draws: int, losses: int) -> MatchStats:
+    stats = MatchStats()
+    for score, games in ((1, wins), (0.5, draws), (0, losses)):
+        for _ in range(games):
+            stats.add(score)
+    return stats
+
+
+@pytest.mark.parametrize("elo", [-400, -50, 0, 10, 200])
+def test_elo(elo: float):
+    assert get_elo(get_expected_score(elo)) == pytest.approx(elo)
+
+
+def test_match_stats():
+    stats = create_stats(wins=30, draws=40, losses=30)
+    elo, margin = stats.get_elo()
+    assert elo == 0 and 0 < margin < 100
+    more_games = create_stats(wins=300, draws=400, losses=300)
+    assert more_games.get_elo()[1] < margin
+    assert create_stats(wins=60, draws=20, losses=20).get_elo()[0] == pytest.approx(
+        get_elo(0.7)
+    )
+    assert create_stats(wins=3, draws=0, losses=0).get_elo()[0] == math.inf
+
+
+def test_sprt():
+    sprt = SPRT(elo0=0, elo1=10)
+    lower, upper = sprt.get_bounds()
+    assert lower == pytest.approx(-2.944, abs=1e-3) and upper == pytest.approx(2.944, abs=1e-3)
+
+    stronger = create_stats(wins=350, draws=400, losses=250)
+    assert sprt.get_verdict(stronger.get_llr(sprt)) == "H1"
+    weaker = create_stats(wins=250, draws=400, losses=350)
+    assert sprt.get_verdict(weaker.get_llr(sprt)) == "H0"
+    even = create_stats(wins=10, draws=10, losses=10)
+    assert sprt.get_verdict(even.get_llr(sprt)) is None
+
+
+@pytest.mark.parametrize(
+    "opening, result, reason",
+    [
+        ("4k3/7p/4K3/8/8/8/8/1Q6 w - - 0 1", "1-0", "checkmate"),
+        ("3k4/8/3K4/3P4/8/8/8/8 b - - 0 1", "1-0", "bitbase"),
+        ("k7/8/8/8/8/8/P7/K7 w - - 0 1", "1/2-1/2", "bitbase"),
+        ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", "1/2-1/2", "stalemate"),
+    ],
+)
+def test_play_game(opening: str, result: str, reason: str):
+    players = {
+        chess.WHITE: ("first", AIPlayer(options={"backend": "bitboard"})),
+        chess.BLACK: ("second", AIPlayer(options={"backend": "bitboard"})),
+    }
+    game = play_game(players=players, opening=opening, limits=SearchLimits(depth=2))
+    assert (game.result, game.reason) == (result, reason)
+    assert game.get_score("first") == {"1-0": 1, "0-1": 0, "1/2-1/2": 0.5}[result]
+
+
+def test_play_game_adjudication():
+    """
+    Black is a queen down and resigns, a short game limit draws instead
+    """
+    players = {
+        chess.WHITE: ("first", AIPlayer(options={"backend": "bitboard"})),
+        chess.BLACK: ("second", AIPlayer(options={"backend": "bitboard"})),
+    }
+    opening = "rnb1kbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 1"
+    game = play_game(players=players, opening=opening, limits=SearchLimits(depth=1))
+    assert (game.result, game.reason) == ("1-0", "resign")
+
+    game = play_game(
+        players=players,
+        opening=opening,
+        limits=SearchLimits(depth=1),
+        adjudication=Adjudication(max_plies=2, resign_score=100000),
+    )
+    assert (game.result, game.reason, len(game.moves)) == ("1/2-1/2", "max_plies", 2)
+
+
+def test_run_match():
+    """
+    Openings are played twice with alternating colours, across two processes
+    """
+    openings = [START_FEN, "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"]
+    results = list(
+        run_match(
+            specs=SPECS,
+            tasks=get_game_tasks(openings=openings, games=4),
+            limits=SearchLimits(depth=1),
+            adjudication=Adjudication(max_plies=6),
+            processes=2,
+        )
+    )
+    results.sort(key=lambda result: result.index)
+    assert [result.opening for result in results] == [openings[0]] * 2 + [openings[1]] * 2
+    assert [result.white for result in results] == ["first", "second", "first", "second"]
+    assert all(len(result.moves) <= 6 for result in results)
+
+
+def test_uci_player():
+    """
+    A UCI engine plays through the UCI front-end in a subprocess
+    """
+    spec = parse_engine("uci", f"{sys.executable} -m chess_engine.frontend.uci --hash-mb 1")
+    assert spec.command[-3:] == ["chess_engine.frontend.uci", "--hash-mb", "1"]
+    player = UCIPlayer(command=spec.command)
+    try:
+        players = {
+            chess.WHITE: ("uci", player),
+            chess.BLACK: ("ai", AIPlayer(options={"backend": "bitboard"})),
+        }
+        game = play_game(
+            players=players,
+            opening="4k3/7p/4K3/8/8/8/8/1Q6 w - - 0 1",
+            limits=SearchLimits(depth=2),
+        )
+        assert (game.result, game.reason, game.moves) == ("1-0", "checkmate", ["b1b8"])
+        game = play_game(
+            players=players,
+            opening=START_FEN,
+            limits=SearchLimits(depth=2, nodes=500),
+            adjudication=Adjudication(max_plies=4),
+        )
+        assert game.reason == "max_plies"
+    finally:
+        player.close()
+    assert player.process.returncode == 0
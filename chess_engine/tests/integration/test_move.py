@@ -0,0 +1,64 @@
+import pytest
+import chess
+
+from chess_engine.backend.ai import BOARD_BACKENDS
+from chess_engine.backend.move import (
+    DOUBLE_PAWN_PUSH,
+    EN_PASSANT,
+    KING_CASTLE,
+    QUEEN_CASTLE,
+    get_flag,
+    get_promotion_piece,
+    is_capture,
+    move_to_uci,
+    uci_to_move,
+)
+from chess_engine.backend.pieces import Knight, Queen
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    ],
+)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_move_flags(board_rep: str, backend: str):
+    """
+    Flags of every generated move must agree with the chess package and survive a UCI round trip
+    :param board_rep: FEN board representation
+    :param backend: Board representation used to generate moves
+    """
+    board_obj = BOARD_BACKENDS[backend]()
+    board_obj.fen_repr = board_rep
+    board_obj.initialise_board()
+    chess_board = chess.Board(board_rep)
+    moves = board_obj.get_all_possible_moves()
+
+    for move in moves:
+        uci = move_to_uci(move)
+        chess_move = chess.Move.from_uci(uci)
+        flag = get_flag(move)
+        assert uci_to_move(uci=uci, moves=moves) == move
+        assert is_capture(move) == chess_board.is_capture(chess_move)
+        assert (flag == EN_PASSANT) == chess_board.is_en_passant(chess_move)
+        assert (flag == KING_CASTLE) == chess_board.is_kingside_castling(chess_move)
+        assert (flag == QUEEN_CASTLE) == chess_board.is_queenside_castling(chess_move)
+        assert (flag == DOUBLE_PAWN_PUSH) == (
+            chess_board.piece_type_at(chess_move.from_square) == chess.PAWN
+            and abs(chess_move.from_square - chess_move.to_square) == 16
+        )
+        assert bool(get_promotion_piece(move)) == bool(chess_move.promotion)
+
+
+def test_uci_promotion_defaults_to_queen():
+    board_obj = BOARD_BACKENDS["board"]()
+    board_obj.fen_repr = "8/P6k/8/8/8/8/8/K7 w - - 0 1"
+    board_obj.initialise_board()
+    moves = board_obj.get_all_possible_moves()
+
+    assert get_promotion_piece(uci_to_move(uci="a7a8n", moves=moves)) == Knight
+    assert get_promotion_piece(uci_to_move(uci="a7a8", moves=moves)) == Queen
+    assert uci_to_move(uci="a7b8q", moves=moves) is None
@@ -0,0 +1,121 @@
+import pytest
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS
+from chess_engine.backend.move import NO_MOVE, is_tactical, uci_to_move
+from chess_engine.backend.move_picker import MoveOrdering, MovePicker
+from chess_engine.backend.perft import create_board
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    ],
+)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_move_picker_stages(board_rep: str, backend: str):
+    """
+    Hash and killer moves taken from other positions must only be yielded when legal, and every
+    legal move exactly once, in stage order
+    :param board_rep: FEN board representation
+    :param backend: Board representation used to generate moves
+    """
+    board_obj = create_board(fen_repr=board_rep, backend=backend)
+    legal_moves = board_obj.get_all_possible_moves()
+    foreign_moves = set()
+    for move in legal_moves:
+        board_obj.make_move(move=move)
+        foreign_moves.update(board_obj.get_all_possible_moves())
+        board_obj.unmake_move()
+
+    hash_moves = [NO_MOVE, legal_moves[-1]] + sorted(foreign_moves)[::7]
+    quiet_moves = [move for move in legal_moves if not is_tactical(move)]
+    for hash_move in hash_moves:
+        killers = (quiet_moves[0], sorted(foreign_moves)[0], hash_move)
+        picked = list(
+            MovePicker(
+                board=create_board(fen_repr=board_rep, backend=backend),
+                hash_move=hash_move,
+                killers=killers,
+            )
+        )
+        assert sorted(picked) == sorted(legal_moves)
+        if hash_move in legal_moves:
+            assert picked[0] == hash_move
+        stages = [is_tactical(move) for move in picked if move != hash_move]
+        assert stages == sorted(stages, reverse=True)
+
+
+def test_is_legal_without_generation():
+    """
+    Every move of the sibling positions is checked against a board that has not generated its moves
+    """
+    board_rep = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    board_obj = create_board(fen_repr=board_rep)
+    reply_fens, candidates = [], set()
+    for move in board_obj.get_all_possible_moves():
+        board_obj.make_move(move=move)
+        reply_fens.append(board_obj.get_fen())
+        candidates.update(board_obj.get_all_possible_moves())
+        board_obj.unmake_move()
+
+    for reply_fen in reply_fens:
+        legal_moves = set(create_board(fen_repr=reply_fen).get_all_possible_moves())
+        reply_board = create_board(fen_repr=reply_fen)
+        for candidate in candidates:
+            assert reply_board.is_legal(move=candidate) == (candidate in legal_moves)
+
+
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_move_ordering(backend: str):
+    """
+    Captures come most valuable victim first, then killers and quiet moves by history score
+    :param backend: Board representation used to generate moves
+    """
+    board_obj = create_board(fen_repr="4k3/2p5/2r2q2/1P1N4/1n6/8/8/4K3 w - - 0 1", backend=backend)
+    moves = board_obj.get_all_possible_moves()
+    move_ordering = MoveOrdering()
+    for uci, depth in (("e1d2", 1), ("d5e3", 2), ("e1e2", 1), ("e1d1", 3)):
+        move_ordering.add_cutoff(board=board_obj, move=uci_to_move(uci, moves), ply=2, depth=depth)
+    move_ordering.add_cutoff(board=board_obj, move=uci_to_move("d5f6", moves), ply=2, depth=4)
+
+    picked = board_obj.moves_to_str(
+        MovePicker(
+            board=board_obj,
+            killers=move_ordering.get_killers(ply=2),
+            history=move_ordering.history,
+        )
+    )
+    assert picked[:4] == ["d5f6", "b5c6", "d5b4", "d5c7"]
+    assert picked[4:8] == ["e1d1", "e1e2", "d5e3", "e1d2"]
+    assert sorted(picked) == sorted(board_obj.moves_to_str(moves))
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+    ],
+)
+def test_search_value_with_move_ordering(board_rep: str):
+    """
+    Move ordering must only shrink the search tree, not change its value
+    :param board_rep: FEN board representation
+    """
+    values, nodes = [], []
+    for move_ordering in (False, True):
+        ai_obj = AI(backend="bitboard", transposition_table_mb=0, move_ordering=move_ordering)
+        value = ai_obj.alpha_beta(
+            board=create_board(fen_repr=board_rep),
+            depth=3,
+            alpha=-99999,
+            beta=99999,
+            is_maximising_player=True,
+        )
+        values.append(value)
+        nodes.append(ai_obj.search_stats.nodes)
+    assert values[0] == values[1]
+    assert nodes[1] < nodes[0]
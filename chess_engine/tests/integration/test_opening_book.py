@@ -0,0 +1,90 @@
+import chess
+import chess.polyglot
+import pytest
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS
+from chess_engine.backend.fen import parse_fen
+from chess_engine.backend.move import NO_MOVE, move_to_uci
+from chess_engine.backend.opening_book import ENTRY_STRUCT, OpeningBook, get_polyglot_key
+from chess_engine.backend.perft import create_board
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+CASTLING_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+PROMOTION_FEN = "8/1P6/8/8/8/8/6k1/4K3 w - - 0 1"
+
+
+def get_book_move(uci: str, promotion: int = 0) -> int:
+    src, dst = chess.parse_square(uci[:2]), chess.parse_square(uci[2:4])
+    return promotion << 12 | src << 6 | dst
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    entries = [
+        (START_FEN, get_book_move("e2e4"), 10),
+        (START_FEN, get_book_move("d2d4"), 5),
+        (START_FEN, get_book_move("e2e5"), 100),
+        (CASTLING_FEN, get_book_move("e1h1"), 1),
+        (PROMOTION_FEN, get_book_move("b7b8", promotion=1), 1),
+    ]
+    path = tmp_path / "book.bin"
+    records = sorted(
+        (chess.polyglot.zobrist_hash(chess.Board(fen)), move, weight)
+        for fen, move, weight in entries
+    )
+    path.write_bytes(
+        b"".join(ENTRY_STRUCT.pack(key, move, weight, 0) for key, move, weight in records)
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        START_FEN,
+        CASTLING_FEN,
+        "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+        "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 2",
+        "rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b Kq d3 0 3",
+    ],
+)
+def test_polyglot_key(board_rep: str):
+    """
+    Keys computed from a position must match the reference implementation of the chess package,
+    which only hashes en passant squares a pawn can capture on
+    :param board_rep: FEN board representation
+    """
+    expected_key = chess.polyglot.zobrist_hash(chess.Board(board_rep))
+    assert get_polyglot_key(parse_fen(board_rep)) == expected_key
+
+
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_opening_book_moves(book_path: str, backend: str):
+    """
+    Illegal book moves are skipped, castling and underpromotion are translated to board moves
+    :param book_path: Polyglot book file
+    :param backend: Board representation looked up
+    """
+    def get_move(book: OpeningBook, fen_repr: str) -> str:
+        move = book.get_move(board=create_board(fen_repr=fen_repr, backend=backend))
+        return move_to_uci(move) if move != NO_MOVE else None
+
+    with OpeningBook(path=book_path, selection="best") as book:
+        assert book.entry_count == 5
+        assert get_move(book, START_FEN) == "e2e4"
+        assert get_move(book, CASTLING_FEN) == "e1g1"
+        assert get_move(book, PROMOTION_FEN) == "b7b8n"
+        assert get_move(book, PROMOTION_FEN.replace("0 1", "0 9")) is None
+        assert get_move(book, START_FEN.replace(" w ", " b ")) is None
+
+    with OpeningBook(path=book_path, seed=1) as book:
+        assert {get_move(book, START_FEN) for _ in range(50)} == {"e2e4", "d2d4"}
+
+
+def test_ai_book_move(book_path: str):
+    with OpeningBook(path=book_path, selection="best") as book:
+        ai_obj = AI(backend="bitboard", opening_book=book)
+        assert move_to_uci(ai_obj.get_optimal_move(board=create_board(START_FEN))) == "e2e4"
+        assert ai_obj.search_stats.nodes == 0
+        ai_obj.get_optimal_move(board=create_board(CASTLING_FEN.replace(" w ", " b ")))
+        assert ai_obj.search_stats.nodes > 0
@@ -0,0 +1,117 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from chess_engine.backend.ai import AI, INFINITE_VALUE, LIMIT_CHECK_NODES, SearchLimits
+from chess_engine.backend import parallel_search
+from chess_engine.backend.parallel_search import ParallelAI
+from chess_engine.backend.perft import create_board
+
+BOARD_REP = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        BOARD_REP,
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    ],
+)
+def test_parallel_search_value(board_rep: str):
+    """
+    Splitting the root moves across processes must not change the value of the search, and the
+    principal variation must be playable from the root
+    :param board_rep: FEN board representation
+    """
+    expected_value = AI(backend="bitboard").alpha_beta(
+        board=create_board(fen_repr=board_rep),
+        depth=3,
+        alpha=-INFINITE_VALUE,
+        beta=INFINITE_VALUE,
+        is_maximising_player=True,
+    )
+
+    ai_obj = ParallelAI(processes=2, backend="bitboard")
+    board_obj = create_board(fen_repr=board_rep)
+    try:
+        value = ai_obj.aspiration_search(board=board_obj, depth=3, previous_value=0)
+        move = ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=3))
+    finally:
+        ai_obj.close()
+    assert value == expected_value
+    assert ai_obj.principal_variation[0] == move
+    for pv_move in ai_obj.principal_variation:
+        assert pv_move in board_obj.get_all_possible_moves()
+        board_obj.make_move(move=pv_move)
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        SearchLimits(depth=64, nodes=20000),
+        SearchLimits(depth=64, time=1),
+    ],
+)
+def test_parallel_search_limits(limits: SearchLimits):
+    board_obj = create_board(fen_repr=BOARD_REP)
+    ai_obj = ParallelAI(processes=2, backend="bitboard")
+    try:
+        move = ai_obj.get_optimal_move(board=board_obj, limits=limits)
+    finally:
+        ai_obj.close()
+    assert move in board_obj.get_all_possible_moves()
+    assert ai_obj.completed_depth >= 1
+    if limits.nodes is not None:
+        assert ai_obj.search_stats.nodes < limits.nodes + 2 * LIMIT_CHECK_NODES * ai_obj.processes
+
+
+def test_parallel_stop_flag():
+    board_obj = create_board(fen_repr=BOARD_REP)
+    ai_obj = ParallelAI(processes=2, backend="bitboard")
+    timer = threading.Timer(interval=1, function=ai_obj.stop)
+    timer.start()
+    try:
+        move = ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=64))
+    finally:
+        timer.join()
+        ai_obj.close()
+    assert ai_obj.stopped
+    assert move in board_obj.get_all_possible_moves()
+
+
+def test_worker_new_search():
+    """
+    A worker ages its tables once per search of the main process, not once per root move
+    """
+    parallel_search._initialise_worker(
+        ai_kwargs=dict(backend="bitboard"),
+        stop_event=multiprocessing.Event(),
+        alpha=multiprocessing.Value("q", -INFINITE_VALUE),
+        nodes=multiprocessing.Value("q", 0),
+    )
+    worker_ai = parallel_search._worker_ai
+    moves = create_board(fen_repr=BOARD_REP).get_all_possible_moves()
+    generations = []
+    for search, move in ((1, moves[0]), (1, moves[1]), (2, moves[0])):
+        parallel_search._search_root_move((BOARD_REP, move, 2, search))
+        generations.append(worker_ai.transposition_table.generation)
+    assert generations[1] == generations[0]
+    assert generations[2] == generations[0] + 1
+
+
+def test_parallel_resize_transposition_table():
+    """
+    Resizing the table restarts the workers with tables of the new size
+    """
+    board_obj = create_board(fen_repr=BOARD_REP)
+    ai_obj = ParallelAI(processes=2, backend="bitboard")
+    try:
+        ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=3))
+        ai_obj.resize_transposition_table(size_mb=0)
+        assert ai_obj.transposition_table is None and ai_obj._executor is None
+        assert ai_obj._ai_kwargs["transposition_table_mb"] == 0
+        move = ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=3))
+    finally:
+        ai_obj.close()
+    assert move in board_obj.get_all_possible_moves()
@@ -0,0 +1,42 @@
+import pytest
+
+from chess_engine.backend.ai import BOARD_BACKENDS
+from chess_engine.backend.perft import create_board, divide, perft
+from chess_engine.backend.transposition_table import TranspositionTable
+
+
+@pytest.mark.parametrize(
+    "board_rep, expected_node_count",
+    [
+        ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 8902),
+        ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 97_862),
+        ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 2812),
+        ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 9467),
+        ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 62_379),
+        ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", 89_890),
+    ],
+)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_perft(board_rep: str, expected_node_count: int, backend: str):
+    """
+    Node counts obtained from: https://www.chessprogramming.org/Perft_Results
+    :param board_rep: FEN board representation
+    :param expected_node_count: Number of leaf nodes at depth 3
+    :param backend: Board representation used to generate moves
+    """
+    board_obj = create_board(fen_repr=board_rep, backend=backend)
+    root_fen = board_obj.get_fen()
+
+    assert perft(board=board_obj, depth=3) == expected_node_count
+    assert board_obj.get_fen() == root_fen
+
+
+def test_divide_options_agree():
+    board_rep = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    counts = divide(fen_repr=board_rep, depth=3)
+
+    assert sum(counts.values()) == 97_862
+    assert counts == divide(fen_repr=board_rep, depth=3, hash_mb=1)
+    assert counts == divide(fen_repr=board_rep, depth=3, processes=2, hash_mb=1)
+    board_obj = create_board(fen_repr=board_rep)
+    assert perft(board=board_obj, depth=4, hash_table=TranspositionTable(size_mb=1)) == 4_085_603
@@ -0,0 +1,193 @@
+import tracemalloc
+
+import pytest
+
+from chess_engine.backend.ai import AI, INFINITE_VALUE, MATE_VALUE, SearchLimits, SelectiveSearch
+from chess_engine.backend.move import move_to_uci
+from chess_engine.backend.perft import create_board
+
+
+@pytest.mark.parametrize("backend", ["board", "bitboard"])
+def test_quiescence_search_horizon(backend: str):
+    """
+    A depth 1 search only sees the pawn won by Qxe5+, the quiescence search sees the recapture
+    :param backend: Board representation searched on
+    """
+    board_rep = "4k3/8/3p4/4p3/8/8/4Q3/4K3 w - - 0 1"
+    moves = []
+    for quiescence in (False, True):
+        ai_obj = AI(backend=backend, quiescence=quiescence)
+        move = ai_obj.get_optimal_move(
+            board=create_board(fen_repr=board_rep, backend=backend), limits=SearchLimits(depth=1)
+        )
+        moves.append(move_to_uci(move))
+    assert moves[0] == "e2e5"
+    assert moves[1] != "e2e5"
+
+
+@pytest.mark.parametrize("backend", ["board", "bitboard"])
+def test_mate_and_stalemate_values(backend: str):
+    """
+    Stalemate is a draw, a mate is worth less the further it is from the root, so Qc8# is played
+    rather than a stalemating queen move or a longer mate
+    :param backend: Board representation searched on
+    """
+    stalemate_rep = "k7/2Q5/1K6/8/8/8/8/8 b - - 0 1"
+    ai_obj = AI(backend=backend)
+    value = ai_obj.alpha_beta(
+        board=create_board(fen_repr=stalemate_rep, backend=backend),
+        depth=2,
+        alpha=-INFINITE_VALUE,
+        beta=INFINITE_VALUE,
+        is_maximising_player=True,
+    )
+    assert value == 0
+
+    board_rep = "k7/8/1K6/8/8/8/8/2Q5 w - - 0 1"
+    for depth in (2, 4):
+        ai_obj = AI(backend=backend, selective_search=SelectiveSearch())
+        move = ai_obj.get_optimal_move(
+            board=create_board(fen_repr=board_rep, backend=backend),
+            limits=SearchLimits(depth=depth),
+        )
+        assert move_to_uci(move) == "c1c8"
+        value = ai_obj.alpha_beta(
+            board=create_board(fen_repr=board_rep, backend=backend),
+            depth=depth,
+            alpha=-INFINITE_VALUE,
+            beta=INFINITE_VALUE,
+            is_maximising_player=True,
+        )
+        assert value == MATE_VALUE - 1
+
+
+@pytest.mark.parametrize(
+    "selective_search",
+    [
+        SelectiveSearch(True, False, False, False),
+        SelectiveSearch(False, True, False, False),
+        SelectiveSearch(False, False, True, False),
+        SelectiveSearch(False, False, False, True),
+        SelectiveSearch(),
+    ],
+)
+@pytest.mark.parametrize(
+    "board_rep, best_move",
+    [
+        ("r1b1k2r/ppppqppp/2n2n2/4p3/1bB1P3/2NP1N2/PPP2PPP/R1BQK2R w KQkq - 0 1", None),
+        ("6k1/5ppp/8/8/8/8/1q3PPP/3R2K1 w - - 0 1", "d1d8"),
+    ],
+)
+def test_selective_search(selective_search: SelectiveSearch, board_rep: str, best_move: str):
+    """
+    Each pruning method must shrink the tree on its own and keep finding a back rank mate
+    :param selective_search: Pruning and reductions to use
+    :param board_rep: FEN board representation
+    :param best_move: Only winning move, None to compare tree sizes instead
+    """
+    stats = []
+    for search in (None, selective_search):
+        ai_obj = AI(backend="bitboard", selective_search=search)
+        move = ai_obj.get_optimal_move(
+            board=create_board(fen_repr=board_rep), limits=SearchLimits(depth=4)
+        )
+        stats.append(ai_obj.search_stats)
+        if best_move is not None:
+            assert move_to_uci(move) == best_move
+    if best_move is None:
+        assert stats[1].nodes < stats[0].nodes
+
+
+def test_null_move_zugzwang_guard():
+    board_rep = "8/8/1p1k4/1P6/2PK4/8/8/8 w - - 0 1"
+    ai_obj = AI(backend="bitboard", selective_search=SelectiveSearch(True, False, False, False))
+    ai_obj.get_optimal_move(board=create_board(fen_repr=board_rep), limits=SearchLimits(depth=6))
+    assert ai_obj.search_stats.null_move_cutoffs == 0
+
+
+def minimax(board, depth: int, is_maximising_player: bool, ply: int = 0) -> int:
+    values = []
+    for move in board.get_all_possible_moves():
+        board.make_move(move=move)
+        value = AI.get_node_value(
+            board=board, is_maximising_player=is_maximising_player, ply=ply + 1
+        )
+        if depth > 1 and not board.is_terminal:
+            value = minimax(
+                board=board,
+                depth=depth - 1,
+                is_maximising_player=not is_maximising_player,
+                ply=ply + 1,
+            )
+        values.append(value)
+        board.unmake_move()
+    return max(values) if is_maximising_player else min(values)
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+    ],
+)
+def test_principal_variation_search(board_rep: str):
+    """
+    Null windows and aspiration windows must find the minimax value, and the principal variation
+    must be playable from the root
+    :param board_rep: FEN board representation
+    """
+    expected_value = minimax(board=create_board(fen_repr=board_rep), depth=3, is_maximising_player=True)
+
+    ai_obj = AI(backend="bitboard", quiescence=False)
+    value = ai_obj.alpha_beta(
+        board=create_board(fen_repr=board_rep),
+        depth=3,
+        alpha=-INFINITE_VALUE,
+        beta=INFINITE_VALUE,
+        is_maximising_player=True,
+    )
+    assert value == expected_value
+
+    board_obj = create_board(fen_repr=board_rep)
+    move = ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=3))
+    assert ai_obj.principal_variation[0] == move
+    assert len(ai_obj.principal_variation) == 3
+    for pv_move in ai_obj.principal_variation:
+        assert pv_move in board_obj.get_all_possible_moves()
+        board_obj.make_move(move=pv_move)
+
+
+def test_search_trace():
+    """
+    A traced search must record the principal variation with the root value, an untraced one no tree
+    """
+    board_rep = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+    for trace in (False, True):
+        ai_obj = AI(backend="bitboard", trace=trace)
+        ai_obj.get_optimal_move(board=create_board(fen_repr=board_rep), limits=SearchLimits(depth=3))
+        assert (ai_obj.search_tree is not None) == trace
+
+    node = ai_obj.search_tree
+    for pv_move in ai_obj.principal_variation:
+        node = next(child for child in node.children if child.move == pv_move)
+        assert node.board is None
+        assert node.value == ai_obj.search_tree.value
+
+
+def test_search_memory_constant_in_depth():
+    """
+    Memory held by the search must not grow with the number of nodes searched
+    """
+    board_rep = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+    peaks, nodes = [], []
+    for depth in (2, 4):
+        board_obj = create_board(fen_repr=board_rep)
+        ai_obj = AI(backend="bitboard", transposition_table_mb=0)
+        tracemalloc.start()
+        ai_obj.get_optimal_move(board=board_obj, limits=SearchLimits(depth=depth))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        nodes.append(ai_obj.search_stats.nodes)
+    assert nodes[1] > 10 * nodes[0]
+    assert peaks[1] < 2 * peaks[0]
@@ -1,8 +1,7 @@
 import pytest
 import chess
 
-from chess_engine.backend.ai import Node, AI
-from chess_engine.backend.board import Board
+from chess_engine.backend.ai import Node, AI, BOARD_BACKENDS
 
 
 @pytest.mark.parametrize(
@@ -16,13 +15,15 @@ from chess_engine.backend.board import Board
         ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 9322),
     ],
 )
-def test_possible_game_states(board_rep: str, expected_node_count: int):
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_possible_game_states(board_rep: str, expected_node_count: int, backend: str):
     """
     Node counts obtained from: https://www.chessprogramming.org/Perft_Results#cite_note-7
     :param board_rep: FEN board representation
     :param expected_node_count: Number of game states
+    :param backend: Board representation used to generate moves
     """
-    board_obj = Board()
+    board_obj = BOARD_BACKENDS[backend]()
     board_obj.fen_repr = board_rep
     board_obj.initialise_board()
     ai_obj = AI()
@@ -58,11 +59,13 @@ def test_possible_game_states(board_rep: str, expected_node_count: int):
         "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
     ],
 )
-def test_game_state_with_chess_package(board_rep: str):
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_game_state_with_chess_package(board_rep: str, backend: str):
     """
     :param board_rep: FEN board representation
+    :param backend: Board representation used to generate moves
     """
-    board_obj = Board()
+    board_obj = BOARD_BACKENDS[backend]()
     board_obj.fen_repr = board_rep
     board_obj.initialise_board()
     ai_obj = AI()
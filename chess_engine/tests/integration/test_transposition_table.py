@@ -0,0 +1,59 @@
+import pytest
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS
+from chess_engine.backend.transposition_table import Bound, TranspositionTable
+
+
+@pytest.mark.parametrize(
+    "board_rep",
+    [
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+    ],
+)
+def test_search_value_with_transposition_table(board_rep: str):
+    """
+    Transposition table cutoffs must not change the minimax value of the search
+    :param board_rep: FEN board representation
+    """
+    values = []
+    for transposition_table_mb in (0, 1):
+        board_obj = BOARD_BACKENDS["bitboard"]()
+        board_obj.fen_repr = board_rep
+        board_obj.initialise_board()
+        ai_obj = AI(backend="bitboard", transposition_table_mb=transposition_table_mb)
+
+        value = ai_obj.alpha_beta(
+            board=board_obj,
+            depth=4,
+            alpha=-99999,
+            beta=99999,
+            is_maximising_player=True,
+        )
+        values.append(value)
+    assert values[0] == values[1]
+
+
+def test_transposition_table_replacement():
+    transposition_table = TranspositionTable(size_mb=0)
+    assert transposition_table.bucket_count == 1
+
+    transposition_table.store(key=1, depth=3, value=10, bound=Bound.EXACT)
+    transposition_table.store(key=2, depth=1, value=20, bound=Bound.EXACT)
+    transposition_table.store(key=3, depth=2, value=30, bound=Bound.EXACT)
+    assert transposition_table.probe(key=1).value == 10
+    assert transposition_table.probe(key=2) is None
+    assert transposition_table.probe(key=3).value == 30
+
+    transposition_table.new_search()
+    transposition_table.store(key=4, depth=1, value=40, bound=Bound.LOWER)
+    assert transposition_table.probe(key=1) is None
+    assert transposition_table.lookup(key=4, depth=1, alpha=0, beta=39) == 40
+    # Fail-hard: a lower bound equal to beta cuts, as on a null window
+    assert transposition_table.lookup(key=4, depth=1, alpha=39, beta=40) == 40
+    assert transposition_table.lookup(key=4, depth=1, alpha=0, beta=41) is None
+    assert transposition_table.lookup(key=4, depth=2, alpha=0, beta=39) is None
+    transposition_table.store(key=5, depth=1, value=50, bound=Bound.UPPER)
+    assert transposition_table.lookup(key=5, depth=1, alpha=50, beta=51) == 50
+    assert transposition_table.lookup(key=5, depth=1, alpha=49, beta=51) is None
+    assert transposition_table.get_stats()["cutoffs"] == 3
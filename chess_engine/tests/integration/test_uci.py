@@ -0,0 +1,158 @@
+import time
+from typing import List
+
+import chess
+import pytest
+
+from chess_engine.backend.ai import AI, MATE_VALUE, SearchLimits
+from chess_engine.frontend.uci import UCIEngine, get_limits, get_score
+
+
+def create_engine(lines: List[str], backend: str = "bitboard") -> UCIEngine:
+    return UCIEngine(ai=AI(backend=backend), output=lines.append)
+
+
+def wait_for_search(engine: UCIEngine) -> None:
+    engine._search_thread.join(timeout=60)
+    assert not engine._search_thread.is_alive()
+
+
+def test_handshake():
+    lines = []
+    engine = create_engine(lines=lines)
+    assert engine.handle("uci\n")
+    assert lines[0].startswith("id name") and lines[-1] == "uciok"
+    engine.handle("isready")
+    assert lines[-1] == "readyok"
+    assert not engine.handle("quit")
+
+
+@pytest.mark.parametrize("backend", ["board", "bitboard"])
+def test_position(backend: str):
+    lines = []
+    engine = create_engine(lines=lines, backend=backend)
+    engine.handle("position startpos moves e2e4 e7e5 g1f3")
+    board = chess.Board()
+    for uci in ("e2e4", "e7e5", "g1f3"):
+        board.push_uci(uci)
+    assert engine.board.get_fen() == board.fen()
+
+    fen_repr = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+    engine.handle(f"position fen {fen_repr} moves e1g1")
+    board = chess.Board(fen_repr)
+    board.push_uci("e1g1")
+    assert engine.board.get_fen() == board.fen()
+    assert not lines
+
+
+def test_position_invalid_fen():
+    """
+    An invalid FEN is reported and the previous position is kept
+    """
+    lines = []
+    engine = create_engine(lines=lines)
+    engine.handle("position startpos moves e2e4")
+    fen_repr = engine.board.get_fen()
+    for line in ("position fen garbage", "position fen 4k3/8/8/8/8/8/8/4X3 w - - 0 1"):
+        assert engine.handle(line)
+        assert lines[-1].startswith("info string Invalid FEN")
+        assert engine.board.get_fen() == fen_repr
+
+
+def test_go_depth():
+    lines = []
+    engine = create_engine(lines=lines)
+    engine.handle("position startpos moves e2e4")
+    engine.handle("go depth 3")
+    wait_for_search(engine)
+    info_lines = [line for line in lines if line.startswith("info depth")]
+    assert [line.split()[2] for line in info_lines] == ["1", "2", "3"]
+    assert " pv " in info_lines[-1] and " nodes " in info_lines[-1]
+    best_move = lines[-1].split()[1]
+    board = chess.Board()
+    board.push_uci("e2e4")
+    assert chess.Move.from_uci(best_move) in board.legal_moves
+
+
+def test_go_mate():
+    lines = []
+    engine = create_engine(lines=lines)
+    engine.handle("position fen 4k3/8/4K3/8/8/8/8/1Q6 w - - 0 1")
+    engine.handle("go depth 2")
+    wait_for_search(engine)
+    assert "score mate 1" in lines[-2]
+    assert lines[-1] == "bestmove b1b8"
+
+
+def test_go_mate_stops_deepening():
+    """
+    Deeper iterations after a proven mate are not searched, the stalemating queen moves are not
+    reported as mates
+    """
+    lines = []
+    engine = create_engine(lines=lines)
+    engine.handle("position fen k7/8/1K6/8/8/8/8/2Q5 w - - 0 1")
+    engine.handle("go depth 64")
+    wait_for_search(engine)
+    info_lines = [line for line in lines if line.startswith("info depth")]
+    assert len(info_lines) == 1
+    assert "score mate 1 " in info_lines[0]
+    assert lines[-1] == "bestmove c1c8"
+
+
+def test_get_score():
+    assert get_score(35) == "cp 35"
+    assert get_score(MATE_VALUE - 1) == "mate 1"
+    assert get_score(MATE_VALUE - 3) == "mate 2"
+    assert get_score(2 - MATE_VALUE) == "mate -1"
+    assert get_score(4 - MATE_VALUE) == "mate -2"
+
+
+def test_stop_infinite():
+    """
+    An infinite search only sends its best move after stop, which ends it at once
+    """
+    lines = []
+    engine = create_engine(lines=lines)
+    engine.handle("position startpos")
+    engine.handle("go infinite")
+    time.sleep(0.5)
+    assert not any(line.startswith("bestmove") for line in lines)
+    start = time.perf_counter()
+    engine.handle("stop")
+    assert time.perf_counter() - start < 1
+    assert lines[-1].startswith("bestmove")
+    assert any(line.startswith("info depth") for line in lines)
+
+
+def test_stop_before_search_starts():
+    lines = []
+    engine = create_engine(lines=lines)
+    engine.handle("go infinite")
+    engine.handle("stop")
+    assert lines[-1].startswith("bestmove")
+
+
+def test_invalid_values():
+    """
+    A command with a value that is not a number is reported and ignored
+    """
+    lines = []
+    engine = create_engine(lines=lines)
+    table = engine.ai.transposition_table
+    engine.handle("setoption name Hash value big")
+    assert lines[-1].startswith("info string") and engine.ai.transposition_table is table
+    engine.handle("go depth x")
+    assert lines[-1].startswith("info string") and engine._search_thread is None
+    assert engine.handle("isready") and lines[-1] == "readyok"
+
+
+def test_get_limits():
+    assert get_limits({"depth": 5}, is_whites_turn=True) == SearchLimits(depth=5)
+    assert get_limits({"movetime": 1500, "nodes": 100}, is_whites_turn=True).time == 1.5
+    assert get_limits({"nodes": 100}, is_whites_turn=True).nodes == 100
+    parameters = {"wtime": 60000, "btime": 30000, "winc": 1000, "movestogo": 20}
+    assert get_limits(parameters, is_whites_turn=True).time == pytest.approx(4.0)
+    assert get_limits(parameters, is_whites_turn=False).time == pytest.approx(1.5)
+    # Never more than the time left on the clock
+    assert get_limits({"wtime": 1000, "winc": 5000}, is_whites_turn=True).time < 1
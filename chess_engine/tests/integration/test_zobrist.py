@@ -0,0 +1,56 @@
+import pytest
+
+from chess_engine.backend.ai import AI, BOARD_BACKENDS
+from chess_engine.backend.board import Board
+from chess_engine.backend.move import uci_to_move
+
+BOARD_REPS = [
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - - -",
+    "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+]
+
+
+@pytest.mark.parametrize("board_rep", BOARD_REPS)
+@pytest.mark.parametrize("backend", BOARD_BACKENDS)
+def test_incremental_zobrist_key(board_rep: str, backend: str):
+    """
+    The incrementally updated key must always equal a from-scratch recomputation and agree
+    between backends for the same position
+    :param board_rep: FEN board representation
+    :param backend: Board representation used to generate moves
+    """
+    board_obj = BOARD_BACKENDS[backend]()
+    board_obj.fen_repr = board_rep
+    board_obj.initialise_board()
+
+    def walk(depth: int):
+        root_key = board_obj.zobrist_key
+        for move in AI.get_moves(board=board_obj):
+            board_obj.make_move(move=move)
+            assert board_obj.zobrist_key == board_obj.compute_zobrist_key()
+
+            reference_board = Board()
+            reference_board.fen_repr = board_obj.get_fen()
+            reference_board.initialise_board()
+            assert reference_board.zobrist_key == board_obj.zobrist_key
+
+            if depth > 1:
+                walk(depth=depth - 1)
+            board_obj.unmake_move()
+            assert board_obj.zobrist_key == root_key
+
+    walk(depth=2)
+
+
+def test_transposition_has_equal_zobrist_key():
+    board_obj = Board()
+    board_obj.fen_repr = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+    board_obj.initialise_board()
+    start_key = board_obj.zobrist_key
+
+    for uci in ("g1f3", "g8f6", "f3g1", "f6g8"):
+        board_obj.make_move(move=uci_to_move(uci=uci, moves=board_obj.get_all_possible_moves()))
+    assert board_obj.zobrist_key == start_key